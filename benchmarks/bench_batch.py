@@ -0,0 +1,273 @@
+"""
+Load-test classify_batch offline across providers, batch sizes and image sizes.
+
+Every provider is driven by the same simulated endpoint (MockServer), so
+results are comparable and need no API account:
+
+- mock: the MockClassifier provider
+- openai: OpenAIClassifier with an httpx mock transport behind the real SDK
+- gemini: GeminiClassifier with a stand-in async generate_content
+
+For each combination the benchmark reports throughput, per-image latency
+percentiles, the tracemalloc memory peak and event loop lag. Results can be
+saved with --json and compared against a saved run with --baseline, which
+exits non-zero when throughput regresses beyond --tolerance.
+
+Usage:
+    python benchmarks/bench_batch.py [--providers mock openai gemini]
+        [--batch-sizes 1 10 50] [--image-sizes 640 1920] [--images 100]
+        [--latency 0.1] [--distribution lognormal] [--error-rate 0.02]
+        [--rate-limit-rate 0.02] [--json results.json] [--baseline base.json]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import httpx
+import openai
+from google.genai import errors
+from PIL import Image
+
+from outfitai import ClassifierFactory, Settings
+from outfitai.classifier.mock_classifier import MockServer
+
+RESPONSE = json.dumps({
+    "color": "black",
+    "category": "tops",
+    "dress_code": "casual wear",
+    "season": ["spring", "fall"],
+})
+
+
+def openai_client(server: MockServer) -> openai.AsyncOpenAI:
+    """Real OpenAI SDK client whose HTTP requests are answered by the mock server."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(server.sample_latency())
+        outcome = server.sample_outcome()
+        if outcome == "rate_limit":
+            return httpx.Response(
+                429, headers={"retry-after": str(server.retry_after)},
+                json={"error": {"message": "Rate limit reached", "type": "requests"}})
+        if outcome == "error":
+            return httpx.Response(
+                503, json={"error": {"message": "Service unavailable", "type": "server_error"}})
+        return httpx.Response(200, json={
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o-mini",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": RESPONSE},
+                "finish_reason": "stop",
+            }],
+        })
+
+    return openai.AsyncOpenAI(
+        api_key="benchmark",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def gemini_client(server: MockServer) -> SimpleNamespace:
+    """Stand-in Gemini client whose generate_content is answered by the mock server."""
+    async def generate_content(**kwargs: Any) -> SimpleNamespace:
+        await asyncio.sleep(server.sample_latency())
+        outcome = server.sample_outcome()
+        if outcome == "rate_limit":
+            raise errors.ClientError(
+                429, {"error": {"code": 429, "message": "Resource exhausted"}},
+                httpx.Response(429, headers={"retry-after": str(server.retry_after)}))
+        if outcome == "error":
+            raise errors.ServerError(
+                503, {"error": {"code": 503, "message": "Service unavailable"}})
+        return SimpleNamespace(text=RESPONSE, sdk_http_response=None)
+
+    return SimpleNamespace(aio=SimpleNamespace(
+        models=SimpleNamespace(generate_content=generate_content)))
+
+
+def create_images(directory: Path, count: int, width: int) -> None:
+    """Write `count` noisy 4:3 JPEGs so resizing and encoding do real work."""
+    size = (width, width * 3 // 4)
+    noise = Image.merge("RGB", [Image.effect_noise(size, 40 + 20 * band) for band in range(3)])
+    for i in range(count):
+        noise.save(directory / f"{i:05d}.jpg", quality=90)
+
+
+async def monitor_loop_lag(samples: List[float], interval: float = 0.01) -> None:
+    """Record how late the event loop wakes up from a short sleep."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - started - interval))
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run_batch(classifier, directory: Path) -> Dict[str, Any]:
+    latencies: List[float] = []
+    classify_single = classifier.classify_single
+
+    async def timed(image_source):
+        started = time.perf_counter()
+        try:
+            return await classify_single(image_source)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    classifier.classify_single = timed
+
+    lag: List[float] = []
+    monitor = asyncio.ensure_future(monitor_loop_lag(lag))
+    started = time.perf_counter()
+    try:
+        async with classifier:
+            results = await classifier.classify_batch(str(directory))
+    finally:
+        monitor.cancel()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "images": len(results),
+        "errors": sum(1 for result in results if "error" in result),
+        "seconds": elapsed,
+        "images_per_second": len(results) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "loop_lag_p99_ms": percentile(lag, 99) * 1000,
+        "loop_lag_max_ms": max(lag, default=0.0) * 1000,
+        "retries": classifier.retry_stats.retries,
+    }
+
+
+def run(provider: str, batch_size: int, directory: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    settings = Settings(
+        OUTFITAI_PROVIDER=provider,
+        OPENAI_API_KEY="benchmark",
+        GEMINI_API_KEY="benchmark",
+        BATCH_SIZE=batch_size,
+        CACHE_ENABLED=False,
+        ADAPTIVE_CONCURRENCY=args.adaptive,
+        MAX_CONCURRENCY=max(batch_size, 1),
+        MOCK_LATENCY=args.latency,
+        MOCK_LATENCY_DISTRIBUTION=args.distribution,
+        MOCK_ERROR_RATE=args.error_rate,
+        MOCK_RATE_LIMIT_RATE=args.rate_limit_rate,
+        MOCK_RETRY_AFTER=args.retry_after,
+        MOCK_SEED=args.seed,
+    )
+    classifier = ClassifierFactory.create_classifier(settings)
+    server = MockServer.from_settings(settings)
+    if provider == "openai":
+        classifier.client = openai_client(server)
+    elif provider == "gemini":
+        classifier.client = gemini_client(server)
+
+    tracemalloc.start()
+    try:
+        stats = asyncio.run(run_batch(classifier, directory))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    stats["memory_peak_mb"] = peak / 1024 / 1024
+    return stats
+
+
+def check_baseline(rows: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> bool:
+    """Compare throughput with a saved run; return False on a regression."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (row["provider"], row["batch_size"], row["image_size"]): row
+            for row in json.load(f)
+        }
+
+    ok = True
+    for row in rows:
+        previous = baseline.get((row["provider"], row["batch_size"], row["image_size"]))
+        if previous is None:
+            continue
+        floor = previous["images_per_second"] * (1 - tolerance)
+        if row["images_per_second"] < floor:
+            ok = False
+            print(
+                f"REGRESSION {row['provider']} batch={row['batch_size']} "
+                f"size={row['image_size']}: {row['images_per_second']:.1f} images/s "
+                f"< {floor:.1f} (baseline {previous['images_per_second']:.1f})",
+                file=sys.stderr)
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", nargs="+", default=["mock", "openai", "gemini"],
+                        choices=["mock", "openai", "gemini"])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--image-sizes", type=int, nargs="+", default=[640, 1920],
+                        help="Image widths in pixels (4:3)")
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1,
+                        help="Mean simulated request latency in seconds")
+    parser.add_argument("--distribution", default="lognormal",
+                        choices=list(MockServer.DISTRIBUTIONS))
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Enable adaptive concurrency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Save results to this file")
+    parser.add_argument("--baseline", help="Fail if throughput regresses against this file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Allowed throughput drop against the baseline (fraction)")
+    args = parser.parse_args()
+
+    print(f"{'provider':>8} {'batch':>5} {'size':>5} {'images/s':>9} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'mem MB':>7} {'lag p99':>8} {'lag max':>8} "
+          f"{'retries':>7} {'errors':>6}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for image_size in args.image_sizes:
+            directory = Path(tmp) / str(image_size)
+            directory.mkdir()
+            create_images(directory, args.images, image_size)
+
+            for provider in args.providers:
+                for batch_size in args.batch_sizes:
+                    stats = run(provider, batch_size, directory, args)
+                    row = {"provider": provider, "batch_size": batch_size,
+                           "image_size": image_size, **stats}
+                    rows.append(row)
+                    print(f"{provider:>8} {batch_size:>5} {image_size:>5} "
+                          f"{stats['images_per_second']:>9.1f} {stats['p50_ms']:>8.1f} "
+                          f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+                          f"{stats['memory_peak_mb']:>7.1f} {stats['loop_lag_p99_ms']:>8.1f} "
+                          f"{stats['loop_lag_max_ms']:>8.1f} {stats['retries']:>7} "
+                          f"{stats['errors']:>6}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.baseline and not check_baseline(rows, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
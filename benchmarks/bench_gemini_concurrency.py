@@ -0,0 +1,92 @@
+"""
+Measure GeminiClassifier batch throughput as BATCH_SIZE grows.
+
+The Gemini client is replaced by a stand-in whose async generate_content
+sleeps for a fixed latency, so the benchmark runs offline and only measures
+how well classify_batch overlaps requests. With a truly asynchronous client,
+throughput should scale roughly linearly with BATCH_SIZE.
+
+Usage:
+    python benchmarks/bench_gemini_concurrency.py [--images 100] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from PIL import Image
+
+from outfitai import Settings
+from outfitai.classifier.gemini_classifier import GeminiClassifier
+
+RESPONSE = json.dumps({
+    "color": "black",
+    "category": "tops",
+    "dress_code": "casual wear",
+    "season": ["spring", "fall"],
+})
+
+
+class FakeModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def generate_content(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text=RESPONSE)
+
+
+def create_images(directory: Path, count: int) -> None:
+    for i in range(count):
+        Image.new("RGB", (640, 480), (i % 256, 64, 128)).save(
+            directory / f"{i:05d}.jpg")
+
+
+def run(directory: Path, batch_size: int, latency: float) -> float:
+    settings = Settings(
+        OUTFITAI_PROVIDER="gemini",
+        GEMINI_API_KEY="benchmark",
+        BATCH_SIZE=batch_size,
+        CACHE_ENABLED=False,
+        ADAPTIVE_CONCURRENCY=False,
+    )
+    classifier = GeminiClassifier(settings)
+    classifier.client = SimpleNamespace(
+        aio=SimpleNamespace(models=FakeModels(latency)))
+
+    started = time.perf_counter()
+    results = asyncio.run(classifier.classify_batch(str(directory)))
+    elapsed = time.perf_counter() - started
+
+    errors = [r for r in results if "error" in r]
+    if errors:
+        raise RuntimeError(f"{len(errors)} images failed: {errors[0]['error']}")
+    return len(results) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Simulated request latency in seconds")
+    parser.add_argument("--batch-sizes", type=int, nargs="+",
+                        default=[1, 2, 5, 10, 20, 50])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        create_images(directory, args.images)
+
+        print(f"{'BATCH_SIZE':>10}  {'images/s':>9}  {'speedup':>7}")
+        baseline = None
+        for batch_size in args.batch_sizes:
+            throughput = run(directory, batch_size, args.latency)
+            baseline = baseline or throughput
+            print(f"{batch_size:>10}  {throughput:>9.1f}  {throughput / baseline:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
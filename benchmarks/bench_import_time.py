@@ -0,0 +1,97 @@
+"""
+Measure cold import time of the package and CLI startup.
+
+Each target is imported in a fresh interpreter with `python -X importtime`,
+and the cumulative time of the top-level module is reported together with
+the slowest modules it pulled in. The CLI entry points must not import any
+provider SDK; this check and an optional --max-ms budget make the script
+usable as a regression gate.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 5] [--max-ms 500]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+TARGETS = ["outfitai", "outfitai.cli"]
+
+# Provider SDKs that should only load once a provider is actually used
+HEAVY_MODULES = ["openai", "google.genai", "aiohttp"]
+
+
+def import_times(module: str) -> List[Tuple[str, int]]:
+    """Return (module, cumulative microseconds) for every module imported by `module`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True)
+
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(cumulative)))
+    return times
+
+
+def loaded_heavy_modules(module: str) -> List[str]:
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return completed.stdout.split()
+
+
+def cli_help_seconds() -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "from outfitai.__main__ import main; main()", "--help"],
+        capture_output=True, check=True)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5,
+                        help="Number of slowest dependencies to list")
+    parser.add_argument("--max-ms", type=float,
+                        help="Fail if the median import time of a target exceeds this")
+    args = parser.parse_args()
+
+    failed = False
+    for target in TARGETS:
+        runs = [import_times(target) for _ in range(args.repeat)]
+        totals = [dict(run)[target] / 1000 for run in runs]
+        median = statistics.median(totals)
+        print(f"{target}: median {median:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f})")
+
+        slowest = sorted(
+            (item for item in runs[-1] if item[0] != target and "." not in item[0]),
+            key=lambda item: -item[1])[:args.top]
+        for name, cumulative in slowest:
+            print(f"  {name:<30} {cumulative / 1000:>8.1f} ms")
+
+        heavy = loaded_heavy_modules(target)
+        if heavy:
+            failed = True
+            print(f"  FAIL: imports {', '.join(heavy)} eagerly", file=sys.stderr)
+        if args.max_ms is not None and median > args.max_ms:
+            failed = True
+            print(f"  FAIL: {median:.1f} ms exceeds {args.max_ms:.1f} ms", file=sys.stderr)
+
+    help_runs = [cli_help_seconds() for _ in range(args.repeat)]
+    print(f"outfitai --help: median {statistics.median(help_runs) * 1000:.1f} ms wall time")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
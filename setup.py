@@ -14,8 +14,12 @@ setup(
         "click>=8.1.0",
         "asyncio>=3.4.0",
         "google-genai>=1.2.0",
+        "aiohttp>=3.8.0",
         "pydantic>=2.10.0",
     ],
+    extras_require={
+        "phash": ["numpy"],
+    },
     entry_points={
         'console_scripts': [
             'outfitai=outfitai.__main__:main',
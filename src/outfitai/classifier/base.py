@@ -1,17 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Union
+from typing import (
+    Dict, List, Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator,
+    Optional, Tuple, TypeVar, Union
+)
 from pathlib import Path
+from functools import partial
+from itertools import islice
 import asyncio
+import json
+import math
+import time
 
-from ..error.exceptions import ValidationError
+from ..error.exceptions import (
+    ImageProcessingError, RateLimitError, TransientAPIError, ValidationError
+)
 from ..config.settings import Settings
 from ..utils.logger import Logger
-from ..utils.image_processor import ImageProcessor, ImageSource
+from ..utils.image_processor import ImageProcessor, ImageSource, ImageSourceType
+from ..utils.cache import ResultCache
+from ..utils.scanner import iter_image_files
+from ..utils.rate_limiter import AdaptiveConcurrency, RateLimiter
+from ..utils.retry import RetryPolicy, RetryStats
+from ..utils.packer import RequestPacker
+from ..utils.metrics import Metrics
+from ..utils.singleflight import SingleFlight
+from ..utils.phash import BKTree, require_numpy
+from ..utils.preclassifier import PreclassifierIndex
+from .schema import (
+    CATEGORY_VALUES, COLOR_VALUES, DRESS_CODE_VALUES, SEASON_VALUES, Field,
+    compact_packed_prompt, compact_prompt, packed_result_schema, result_schema
+)
+
+T = TypeVar("T")
 
 
 class BaseClassifier(ABC):
     """Base class for all image classifiers."""
 
+    # Estimated input tokens for one image, used for tokens-per-minute limiting
+    IMAGE_TOKENS = 0
+    # Whether the provider can enforce the response schema itself
+    SUPPORTS_STRUCTURED_OUTPUT = False
+    # Whether _classify_packed() can send several images in one request
+    SUPPORTS_PACKING = False
+    # Unstarted paths counted after the job deadline, at most
+    NOT_STARTED_COUNT_LIMIT = 100_000
+
     def __init__(self, settings: Settings):
         """
         Initialize the base classifier.
@@ -22,35 +56,82 @@ class BaseClassifier(ABC):
         self.settings = settings
         logger_manager = Logger(self.settings)
         self.logger = logger_manager.setup_logger(__name__)
-        self.image_processor = ImageProcessor(self.settings)
+        self.metrics = Metrics()
+        self.image_processor = ImageProcessor(self.settings, self.metrics)
+        self.cache = ResultCache.from_settings(
+            self.settings) if self.settings.CACHE_ENABLED else None
+        self.rate_limiter = RateLimiter.from_settings(self.settings)
+        self.concurrency = AdaptiveConcurrency.from_settings(self.settings)
+        self.retry_policy = RetryPolicy.from_settings(self.settings)
+        self.retry_stats = RetryStats()
+        self.packer = RequestPacker(
+            self._send_pack, self.settings.PACK_SIZE, self.settings.PACK_LINGER
+        ) if self.SUPPORTS_PACKING and self.settings.PACK_SIZE > 1 else None
+        # Requests for the same image content share one provider call
+        self._inflight = SingleFlight()
+        # Colour signatures and results of classified images by perceptual
+        # hash, for reuse by re-encoded, resized or lightly cropped copies
+        self.near_duplicates: Optional[BKTree[Tuple[Tuple[float, float, float], Dict[str, Any]]]] = None
+        if self.settings.NEAR_DUPLICATE_ENABLED:
+            require_numpy()
+            self.near_duplicates = BKTree()
+        if self.settings.COLOR_CHECK != "off":
+            require_numpy()
+        # Local index answering confident cases without a provider call
+        self.preclassifier = PreclassifierIndex.load(
+            self.settings.PRECLASSIFY_INDEX) if self.settings.PRECLASSIFY_INDEX else None
         self._init_constants()
 
+    async def aclose(self) -> None:
+        """Release HTTP connections, worker pools and the result cache."""
+        await self.image_processor.aclose()
+        if self.cache is not None:
+            await self._run_cache(self.cache.close)
+
+    async def __aenter__(self) -> 'BaseClassifier':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
     def _init_constants(self):
         """Initialize constant values used in classification."""
-        self.color_values = [
-            "white", "gray", "black", "red", "orange",
-            "yellow", "green", "blue", "indigo", "purple", "other"
-        ]
-        self.category_values = [
-            "tops", "bottoms", "outerwear", "dresses",
-            "shoes", "bags", "hats", "accessories", "other"
-        ]
-        self.dress_code_values = [
-            "casual wear", "business attire", "campus style", "date night outfit",
-            "travel wear", "wedding attire", "loungewear", "resort wear", "other"
-        ]
-        self.season_values = ["spring", "summer", "fall", "winter"]
+        self.color_values = list(COLOR_VALUES)
+        self.category_values = list(CATEGORY_VALUES)
+        self.dress_code_values = list(DRESS_CODE_VALUES)
+        self.season_values = list(SEASON_VALUES)
+
+    @property
+    def structured_output(self) -> bool:
+        """Whether requests carry the response schema for the provider to enforce."""
+        return self.SUPPORTS_STRUCTURED_OUTPUT and self.settings.STRUCTURED_OUTPUT
+
+    def _result_fields(self) -> Dict[str, Field]:
+        """Return the result fields with their allowed values."""
+        return {
+            "color": (self.color_values, False),
+            "category": (self.category_values, False),
+            "dress_code": (self.dress_code_values, False),
+            "season": (self.season_values, True),
+        }
+
+    def response_schema(self, packed: bool = False) -> Dict[str, Any]:
+        """
+        Return the JSON schema of a response.
+
+        Args:
+            packed: Schema of a packed response with one result per image
+
+        Returns:
+            JSON schema dictionary
+        """
+        if packed:
+            return packed_result_schema(self._result_fields())
+        return result_schema(self._result_fields())
 
     def _create_prompt(self) -> str:
         """Create the prompt for the API."""
-        return f"""
-        Analyze the clothing item in the image and classify it according to these rules.
-        Return a JSON object with these keys:
-        - 'color': 1 value from {self.color_values}
-        - 'category': 1 value from {self.category_values}
-        - 'dress_code': 1 value from {self.dress_code_values}
-        - 'season': 1+ values from {self.season_values} (array)
-        """
+        return compact_prompt(self._result_fields(), self.structured_output)
 
     def _validate_response(self, data: Dict[str, Any]) -> None:
         """
@@ -62,6 +143,10 @@ class BaseClassifier(ABC):
         Raises:
             ValidationError: If the response format is invalid
         """
+        with self.metrics.time("validate_response"):
+            self._check_response(data)
+
+    def _check_response(self, data: Dict[str, Any]) -> None:
         required_keys = ["color", "category", "dress_code", "season"]
 
         # Check required keys
@@ -89,18 +174,531 @@ class BaseClassifier(ABC):
             if season not in self.season_values:
                 raise ValidationError(f"Invalid season: {season}")
 
+    def _create_packed_prompt(self, count: int) -> str:
+        """Create the prompt for classifying several images in one request."""
+        return compact_packed_prompt(self._result_fields(), count, self.structured_output)
+
+    @staticmethod
+    def _parse_packed_response(data: Any, count: int) -> List[Optional[Dict[str, Any]]]:
+        """
+        Split a packed response into per-image elements.
+
+        Args:
+            data: Parsed JSON response
+            count: Number of images in the request
+
+        Returns:
+            Elements in image order, with None for images missing from the response
+
+        Raises:
+            ValidationError: If the response has no 'results' array
+        """
+        if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+            raise ValidationError("Packed response must contain a 'results' array")
+
+        elements: List[Optional[Dict[str, Any]]] = [None] * count
+        for item in data["results"]:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if isinstance(index, int) and 0 <= index < count and elements[index] is None:
+                elements[index] = {
+                    key: value for key, value in item.items() if key != "index"
+                }
+        return elements
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Name of the model used for classification."""
+        pass
+
     @abstractmethod
+    async def _classify(self, image_source: ImageSource) -> Dict[str, Any]:
+        """
+        Classify a single clothing item with the provider API.
+
+        Args:
+            image_source: Image source to classify
+
+        Returns:
+            Dictionary containing classification results
+        """
+        pass
+
     async def classify_single(self, image_source: Union[str, ImageSource]) -> Dict[str, Any]:
         """
         Classify a single clothing item.
 
+        Results are served from the result cache when the same image was
+        already classified with the same provider, model, prompt and
+        response schema.
+        Concurrent calls for the same image content share one provider
+        request. With COLOR_CHECK enabled, the colour is cross-checked
+        against the local dominant colour of the image.
+
         Args:
             image_source: Path to the image file
 
         Returns:
             Dictionary containing classification results
         """
-        pass
+        image_source = self.image_processor.resolve_source(image_source)
+
+        try:
+            with self.metrics.time("cache_lookup"):
+                image_digest = await self._image_digest(image_source)
+                cache_key = self._cache_key(image_digest)
+                cached = await self._run_cache(
+                    self.cache.get, cache_key) if cache_key is not None else None
+            if cached is not None:
+                try:
+                    self._validate_response(cached)
+                except ValidationError:
+                    # Stored under allowed values that have since changed
+                    cached = None
+            if cache_key is not None:
+                self.cache.record_lookup(cached is not None)
+            if cached is not None:
+                self.metrics.inc("cache_hits")
+                result = {"image_path": str(image_source.path), **cached}
+            else:
+                if cache_key is not None:
+                    self.metrics.inc("cache_misses")
+
+                if image_digest is None:
+                    result = await self._classify_and_store(image_source, cache_key)
+                else:
+                    result, shared = await self._inflight.do(
+                        image_digest,
+                        lambda: self._classify_and_store(image_source, cache_key)
+                    )
+                    if shared:
+                        self.metrics.inc("coalesced")
+                        result = {
+                            "image_path": str(image_source.path),
+                            **{key: value for key, value in result.items() if key != "image_path"}
+                        }
+
+            result = await self._check_color(image_source, result)
+        except Exception:
+            self.metrics.inc("images_failed")
+            raise
+
+        self.metrics.inc("images")
+        return result
+
+    async def _classify_and_store(
+        self,
+        image_source: ImageSource,
+        cache_key: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Classify an image with the provider and store the result in the cache.
+
+        With near-duplicate detection enabled, the result of a previously
+        classified, visually near-identical image of the same colour is
+        reused instead. With a
+        pre-classifier index, confident local predictions are returned
+        without calling the provider; they are not cached, so a rebuilt
+        index takes effect immediately.
+        """
+        key = await self._near_duplicate_key(image_source)
+        result = None
+        if key is not None:
+            image_hash, signature = key
+            match = self.near_duplicates.nearest(
+                image_hash, self.settings.NEAR_DUPLICATE_THRESHOLD,
+                accept=lambda entry: self._same_color(signature, entry[0]))
+            if match is not None:
+                self.metrics.inc("near_duplicates")
+                result = {"image_path": str(image_source.path), **match[1]}
+
+        if result is None:
+            predicted = await self._preclassify(image_source)
+            if predicted is not None:
+                return predicted
+
+        if result is None:
+            result = await self._classify_provider(image_source)
+            if key is not None:
+                self.near_duplicates.add(image_hash, (signature, {
+                    name: value for name, value in result.items() if name != "image_path"
+                }))
+
+        if cache_key is not None:
+            await self._run_cache(self.cache.set, cache_key, {
+                key: value for key, value in result.items() if key != "image_path"
+            })
+        return result
+
+    @staticmethod
+    async def _run_cache(func: Callable[..., T], *args: Any) -> T:
+        """Run a result cache call in a thread; SQLite queries and evictions block."""
+        return await asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
+
+    async def _classify_provider(self, image_source: ImageSource) -> Dict[str, Any]:
+        """
+        Classify an image with the provider, packed together with other
+        concurrent requests when packing is enabled.
+
+        Images whose packed response element is missing or invalid, and all
+        images of a failed packed request, fall back to a single request.
+        """
+        if self.packer is not None:
+            try:
+                data = await self.packer.submit(image_source)
+            except Exception as e:
+                self.logger.warning(
+                    f"Packed request failed, classifying {image_source.path} "
+                    f"on its own: {str(e)}")
+                data = None
+
+            if isinstance(data, ImageProcessingError):
+                # The image could not be sent; alone it would fail the same way
+                raise data
+            if data is not None:
+                try:
+                    self._validate_response(data)
+                    return {"image_path": str(image_source.path), **data}
+                except ValidationError as e:
+                    self.logger.warning(
+                        f"Invalid packed result for {image_source.path}, "
+                        f"classifying it on its own: {str(e)}")
+
+        return await self._call_with_retry(
+            lambda: self._classify(image_source),
+            str(image_source.path)
+        )
+
+    async def _process_pack(
+        self,
+        image_sources: List[ImageSource]
+    ) -> Tuple[List[Any], Dict[int, Optional[ImageProcessingError]]]:
+        """
+        Process the images of a pack, so that one bad image does not fail the others.
+
+        Returns:
+            Processed images that can be sent, and by input index the
+            ImageProcessingError of each image that cannot, or None when
+            it failed otherwise and should be retried on its own
+        """
+        processed = await asyncio.gather(*[
+            self.image_processor.process_image(source) for source in image_sources
+        ], return_exceptions=True)
+
+        images, failed = [], {}
+        for index, item in enumerate(processed):
+            if isinstance(item, ImageProcessingError):
+                failed[index] = item
+            elif isinstance(item, Exception):
+                failed[index] = None
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                images.append(item)
+        return images, failed
+
+    @staticmethod
+    def _merge_pack(
+        failed: Dict[int, Optional[ImageProcessingError]],
+        elements: List[Optional[Dict[str, Any]]]
+    ) -> List[Any]:
+        """Put the response elements of the sent images back between the failed ones."""
+        sent = iter(elements)
+        return [
+            failed[index] if index in failed else next(sent)
+            for index in range(len(failed) + len(elements))
+        ]
+
+    async def _send_pack(self, image_sources: List[ImageSource]) -> List[Optional[Dict[str, Any]]]:
+        """Send one packed request for the images collected by the packer."""
+        return await self._call_with_retry(
+            lambda: self._classify_packed(image_sources),
+            f"pack of {len(image_sources)} images"
+        )
+
+    async def _start_request(self, images: int = 1) -> None:
+        """
+        Wait for the rate limits and count one provider request.
+
+        Providers call this right before sending, once the images are
+        processed, so inputs failing locally take no request or tokens.
+
+        Args:
+            images: Number of images in the request
+        """
+        await self.rate_limiter.acquire(self._estimate_tokens() * images)
+        self.metrics.inc("requests")
+
+    async def _call_with_retry(
+        self,
+        call: Callable[[], Awaitable[T]],
+        label: str
+    ) -> T:
+        """
+        Call the provider, retrying recoverable failures.
+
+        Rate limit errors wait for the advertised delay and reduce the
+        concurrency limit, transient errors back off exponentially with
+        jitter, and invalid model output is re-asked without delay. Any other
+        error, such as an unreadable image, is raised immediately.
+        """
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        validation_failures = 0
+
+        while True:
+            attempt += 1
+            attempt_started = time.monotonic()
+            try:
+                result = await call()
+            except RateLimitError as e:
+                self.concurrency.on_throttle()
+                delay = e.retry_after if e.retry_after is not None else policy.backoff(attempt)
+                # The limiter holds back every request until the delay passes
+                self.rate_limiter.pause(delay)
+                error, sleep = e, 0.0
+            except TransientAPIError as e:
+                error, delay = e, policy.backoff(attempt)
+                sleep = delay
+            except ValidationError as e:
+                validation_failures += 1
+                if validation_failures > policy.validation_retries:
+                    self._record_retry_failure(attempt, started)
+                    raise
+                error, delay, sleep = e, 0.0, 0.0
+            except Exception:
+                self._record_retry_failure(attempt, started)
+                raise
+            else:
+                self.concurrency.on_success()
+                if attempt > 1:
+                    self.retry_stats.record_recovered(attempt_started - started)
+                return result
+
+            elapsed = time.monotonic() - started
+            if attempt >= policy.max_attempts or (
+                    policy.deadline and elapsed + delay > policy.deadline):
+                self._record_retry_failure(attempt, started)
+                raise error
+
+            self.retry_stats.retries += 1
+            self.metrics.inc("retries")
+            self.logger.warning(
+                f"Retrying {label} (attempt {attempt + 1}): {str(error)}")
+            if sleep:
+                await asyncio.sleep(sleep)
+
+    def _record_retry_failure(self, attempt: int, started: float) -> None:
+        """Count an image that failed after at least one retry."""
+        if attempt > 1:
+            self.retry_stats.record_exhausted(time.monotonic() - started)
+
+    def _estimate_tokens(self) -> int:
+        """Estimate the tokens one request consumes."""
+        prompt = self._create_prompt()
+        if self.structured_output:
+            prompt += json.dumps(self.response_schema())
+        return len(prompt) // 4 + self.IMAGE_TOKENS
+
+    def _observe_headers(self, headers) -> None:
+        """Feed provider rate limit headers to the limiter and concurrency controller."""
+        if self.rate_limiter.update_from_headers(headers):
+            self.concurrency.on_throttle()
+
+    async def _near_duplicate_key(
+        self,
+        image_source: ImageSource
+    ) -> Optional[Tuple[int, Tuple[float, float, float]]]:
+        """Return the perceptual hash and colour signature of a local image, or None if detection is off."""
+        if self.near_duplicates is None or image_source.type != ImageSourceType.LOCAL:
+            return None
+        try:
+            return await self.image_processor.near_duplicate_key(image_source)
+        except ImageProcessingError:
+            return None
+
+    def _same_color(self, a: Tuple[float, float, float], b: Tuple[float, float, float]) -> bool:
+        """Whether two colour signatures are within NEAR_DUPLICATE_COLOR_DISTANCE in Lab space."""
+        tolerance = self.settings.NEAR_DUPLICATE_COLOR_DISTANCE
+        return not tolerance or math.dist(a, b) <= tolerance
+
+    async def _check_color(self, image_source: ImageSource, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cross-check the colour of a result against the local dominant colour.
+
+        With COLOR_CHECK=verify the local colour and its confidence are
+        added to the result; with COLOR_CHECK=replace a confident local
+        colour replaces the provider's. The check runs after the cache, so
+        cached results follow the current setting.
+        """
+        if self.settings.COLOR_CHECK == "off" or image_source.type != ImageSourceType.LOCAL:
+            return result
+        try:
+            color, confidence = await self.image_processor.dominant_color(image_source)
+        except ImageProcessingError:
+            return result
+
+        confident = confidence >= self.settings.COLOR_CHECK_MIN_CONFIDENCE
+        if confident and color != result.get("color"):
+            self.metrics.inc("color_mismatches")
+        if self.settings.COLOR_CHECK == "verify":
+            return {**result, "local_color": color, "local_color_confidence": round(confidence, 3)}
+        if confident:
+            return {**result, "color": color}
+        return result
+
+    async def _preclassify(self, image_source: ImageSource) -> Optional[Dict[str, Any]]:
+        """Return the pre-classifier result for a local image if it is confident enough."""
+        if self.preclassifier is None or image_source.type != ImageSourceType.LOCAL:
+            return None
+        try:
+            features = await self.image_processor.image_features(image_source)
+        except ImageProcessingError:
+            return None
+
+        with self.metrics.time("preclassify"):
+            # Brute-force lookups over large indexes would stall the event loop
+            prediction, confidence = await asyncio.get_running_loop().run_in_executor(
+                None, partial(
+                    self.preclassifier.predict, features,
+                    self.settings.PRECLASSIFY_NEIGHBORS,
+                    self.settings.PRECLASSIFY_MAX_DISTANCE))
+        if prediction is None or confidence < self.settings.PRECLASSIFY_THRESHOLD:
+            return None
+        try:
+            self._validate_response(prediction)
+        except ValidationError:
+            # Labels outside the allowed values, e.g. from older results
+            return None
+
+        self.metrics.inc("preclassified")
+        return {"image_path": str(image_source.path), **prediction}
+
+    async def _image_digest(self, image_source: ImageSource) -> Optional[str]:
+        """Return the content digest of an image, or None if it cannot be read."""
+        try:
+            return await self.image_processor.content_digest(image_source)
+        except ImageProcessingError:
+            # Unreadable sources are reported by the regular processing path
+            return None
+
+    def _cache_key(self, image_digest: Optional[str]) -> Optional[str]:
+        """Return the result cache key for an image, or None if caching is off."""
+        if self.cache is None or image_digest is None:
+            return None
+        # With structured output the allowed values live only in the schema
+        return ResultCache.make_key(
+            image_digest,
+            self.settings.OUTFITAI_PROVIDER,
+            self.model_name,
+            self._create_prompt(),
+            json.dumps(self.response_schema(), sort_keys=True),
+            self.structured_output
+        )
+
+    async def classify_stream(
+        self,
+        image_paths: Union[str, Path, Iterable[Union[str, Path]]],
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Classify multiple clothing items, yielding results as they complete.
+
+        A sliding window keeps up to `concurrency` requests in flight: a new
+        image is started as soon as any running one finishes. Without an
+        explicit limit, the window follows the adaptive concurrency
+        controller. Input paths are consumed lazily, so generators can be
+        passed for large inputs.
+
+        When the deadline passes, no further images are started and the
+        images still in flight are cancelled and yielded as errors, so
+        callers can flush everything finished so far. The remaining input
+        paths are then counted in a worker thread, up to
+        NOT_STARTED_COUNT_LIMIT, in the "not_started" metric. Closing the iterator,
+        e.g. on Ctrl-C, also cancels the images in flight and waits for them
+        to stop.
+
+        Args:
+            image_paths: Directory path or iterable of image paths
+            concurrency: Optional maximum number of concurrent requests
+            deadline: Seconds for the whole run, defaults to JOB_DEADLINE; 0 for none
+
+        Yields:
+            Tuples of (input index, classification result). Failed images
+            yield a dictionary with an "error" key.
+        """
+        def limit() -> int:
+            return concurrency or self.concurrency.value
+
+        loop = asyncio.get_running_loop()
+        deadline = self.settings.JOB_DEADLINE if deadline is None else deadline
+        expires = loop.time() + deadline if deadline else None
+
+        def remaining() -> Optional[float]:
+            return None if expires is None else max(0.0, expires - loop.time())
+
+        pending: Dict[asyncio.Future, Tuple[int, str]] = {}
+        expired = False
+
+        try:
+            paths = enumerate(self._iter_image_paths(image_paths))
+            while not expired:
+                if len(pending) < limit() and remaining() != 0.0:
+                    item = next(paths, None)
+                    if item is not None:
+                        index, path = item
+                        pending[asyncio.ensure_future(
+                            self._classify_indexed(index, path))] = (index, path)
+                        continue
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining(), return_when=asyncio.FIRST_COMPLETED)
+                expired = not done
+                for task in done:
+                    del pending[task]
+                    yield task.result()
+
+            if expired or remaining() == 0.0:
+                cancelled = dict(pending)
+                await self._cancel(pending)
+                # Count the images the deadline left unstarted, without
+                # classifying them; scanning the rest of a large directory
+                # would block the event loop
+                not_started = await loop.run_in_executor(
+                    None, self._count_paths, paths, self.NOT_STARTED_COUNT_LIMIT)
+                if cancelled or not_started:
+                    self.metrics.inc("cancelled", len(cancelled))
+                    self.metrics.inc("not_started", not_started)
+                    at_least = "at least " if not_started >= self.NOT_STARTED_COUNT_LIMIT else ""
+                    self.logger.warning(
+                        f"Job deadline of {deadline:g}s exceeded: cancelled {len(cancelled)} "
+                        f"images in flight, {at_least}{not_started} not started")
+                for task, (index, path) in sorted(cancelled.items(), key=lambda item: item[1]):
+                    if task.cancelled():
+                        yield index, {"image_path": path, "error": "Job deadline exceeded"}
+                    else:
+                        yield task.result()
+        finally:
+            await self._cancel(pending)
+
+    @staticmethod
+    def _count_paths(paths: Iterator[Any], limit: int) -> int:
+        """Consume and count up to `limit` remaining paths."""
+        return sum(1 for _ in islice(paths, limit))
+
+    @staticmethod
+    async def _cancel(tasks: Dict[asyncio.Future, Any]) -> None:
+        """Cancel tasks, wait until they have stopped and forget them."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        tasks.clear()
 
     async def classify_batch(
         self,
@@ -108,43 +706,39 @@ class BaseClassifier(ABC):
         batch_size: int = None
     ) -> List[Dict[str, Any]]:
         """
-        Classify multiple clothing items in batches.
+        Classify multiple clothing items concurrently.
 
         Args:
             image_paths: Directory path or list of image paths
-            batch_size: Optional batch size for processing
+            batch_size: Optional maximum number of concurrent requests
 
         Returns:
-            List of dictionaries containing classification results
+            List of dictionaries containing classification results, in input order
         """
-        batch_size = batch_size or self.settings.BATCH_SIZE
+        results = {}
+        async for index, result in self.classify_stream(image_paths, batch_size):
+            results[index] = result
+
+        return [results[index] for index in range(len(results))]
 
-        # Handle directory input
+    async def _classify_indexed(self, index: int, image_path: str) -> Tuple[int, Dict[str, Any]]:
+        """Classify one image, converting failures into an error result."""
+        try:
+            return index, await self.classify_single(image_path)
+        except Exception as e:
+            self.logger.error(f"Error in batch processing: {str(e)}")
+            return index, {"image_path": image_path, "error": str(e)}
+
+    @staticmethod
+    def _iter_image_paths(
+        image_paths: Union[str, Path, Iterable[Union[str, Path]]]
+    ) -> Iterator[str]:
+        """Expand a directory into image paths, or normalize an iterable of paths."""
         if isinstance(image_paths, (str, Path)):
             path = Path(image_paths)
-            if path.is_dir():
-                image_paths = [
-                    p for p in path.glob("*")
-                    if p.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp', 'gif']
-                ]
-            else:
+            if not path.is_dir():
                 raise ValueError(
                     "When providing a single path, it must be a directory")
+            return iter_image_files(path)
 
-        image_paths = [str(path) for path in image_paths]
-        results = []
-
-        for i in range(0, len(image_paths), batch_size):
-            batch = image_paths[i:i + batch_size]
-            tasks = [self.classify_single(path) for path in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    self.logger.error(
-                        f"Error in batch processing: {str(result)}")
-                    results.append({"error": str(result)})
-                else:
-                    results.append(result)
-
-        return results
+        return (str(path) for path in image_paths)
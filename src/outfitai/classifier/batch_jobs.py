@@ -0,0 +1,465 @@
+import base64
+import hashlib
+import json
+import shutil
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple, Union
+
+from ..error.exceptions import APIError, ClothingClassifierError, ValidationError
+from .base import BaseClassifier
+from .mock_classifier import deterministic_answer
+
+
+@dataclass
+class BatchJob:
+    """Local record of a submitted batch job."""
+
+    id: str
+    provider: str
+    backend: str
+    model: str
+    images: Dict[str, str] = field(default_factory=dict)  # request key -> image path
+    skipped: Dict[str, str] = field(default_factory=dict)  # image path -> error
+    created_at: float = field(default_factory=time.time)
+
+    MANIFEST = "job.json"
+    REQUESTS = "requests.jsonl"
+
+    def save(self, job_dir: Union[str, Path]) -> None:
+        with open(Path(job_dir) / self.MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, job_dir: Union[str, Path]) -> 'BatchJob':
+        manifest = Path(job_dir) / cls.MANIFEST
+        if not manifest.exists():
+            raise ClothingClassifierError(f"No batch job found in {job_dir}")
+        with open(manifest, encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+
+@dataclass
+class BatchStatus:
+    """Progress of a batch job as reported by the backend."""
+
+    state: str
+    done: bool
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+class BatchBackend(ABC):
+    """Provider-specific building, submission and retrieval of batch jobs."""
+
+    name = ""
+
+    def __init__(self, classifier: BaseClassifier):
+        """
+        Args:
+            classifier: Classifier providing the client, prompt and image processing
+        """
+        self.classifier = classifier
+
+    @abstractmethod
+    async def build_request(self, key: str, image_path: str) -> Dict[str, Any]:
+        """Build the batch input line for one image."""
+        pass
+
+    @abstractmethod
+    async def submit(self, requests_path: Path) -> str:
+        """Upload a batch input file, start the job and return its id."""
+        pass
+
+    @abstractmethod
+    async def status(self, job_id: str) -> BatchStatus:
+        """Return the progress of a job."""
+        pass
+
+    @abstractmethod
+    async def download(self, job_id: str) -> Iterable[Dict[str, Any]]:
+        """Return the output lines of a finished job."""
+        pass
+
+    @abstractmethod
+    def parse_output(self, line: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Extract one result from an output line.
+
+        Returns:
+            Tuple of (request key, response text, error message)
+        """
+        pass
+
+    @abstractmethod
+    def make_output(self, key: str, text: str) -> Dict[str, Any]:
+        """Build an output line in the provider's format, for the local stand-in."""
+        pass
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API for /v1/chat/completions."""
+
+    name = "openai"
+    ENDPOINT = "/v1/chat/completions"
+    DONE_STATES = {"completed", "failed", "expired", "cancelled"}
+
+    async def build_request(self, key: str, image_path: str) -> Dict[str, Any]:
+        classifier = self.classifier
+        image_data = await classifier.image_processor.process_image(image_path)
+        return {
+            "custom_id": key,
+            "method": "POST",
+            "url": self.ENDPOINT,
+            "body": {
+                "model": classifier.settings.OPENAI_MODEL,
+                "messages": [{
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": classifier.prompt_text},
+                        classifier._image_content(image_data)
+                    ]
+                }],
+                "max_tokens": classifier.settings.OPENAI_MAX_TOKENS,
+                "response_format": classifier._response_format()
+            }
+        }
+
+    async def submit(self, requests_path: Path) -> str:
+        client = self.classifier.client
+        with open(requests_path, 'rb') as f:
+            input_file = await client.files.create(file=f, purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self.ENDPOINT,
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def status(self, job_id: str) -> BatchStatus:
+        batch = await self.classifier.client.batches.retrieve(job_id)
+        counts = batch.request_counts
+        return BatchStatus(
+            state=batch.status,
+            done=batch.status in self.DONE_STATES,
+            total=counts.total if counts else 0,
+            completed=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0
+        )
+
+    async def download(self, job_id: str) -> Iterable[Dict[str, Any]]:
+        client = self.classifier.client
+        batch = await client.batches.retrieve(job_id)
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await client.files.content(file_id)
+                lines.extend(
+                    json.loads(line) for line in content.text.splitlines() if line.strip())
+        return lines
+
+    def parse_output(self, line: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+        key = line.get("custom_id", "")
+        if line.get("error"):
+            return key, None, str(line["error"].get("message", line["error"]))
+
+        response = line.get("response") or {}
+        if response.get("status_code") != 200:
+            body = response.get("body") or {}
+            message = (body.get("error") or {}).get("message", "request failed")
+            return key, None, f"HTTP {response.get('status_code')}: {message}"
+        try:
+            return key, response["body"]["choices"][0]["message"]["content"], None
+        except (KeyError, IndexError, TypeError):
+            return key, None, "Malformed batch output line"
+
+    def make_output(self, key: str, text: str) -> Dict[str, Any]:
+        return {
+            "custom_id": key,
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"role": "assistant", "content": text}}]}
+            },
+            "error": None
+        }
+
+
+class GeminiBatchBackend(BatchBackend):
+    """Gemini Batch Mode with a JSONL input file."""
+
+    name = "gemini"
+    DONE_STATES = {
+        "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED",
+        "JOB_STATE_EXPIRED", "JOB_STATE_PARTIALLY_SUCCEEDED"
+    }
+
+    async def build_request(self, key: str, image_path: str) -> Dict[str, Any]:
+        classifier = self.classifier
+        image_part = await classifier.image_processor.process_image(image_path)
+        return {
+            "key": key,
+            "request": {
+                "contents": [{
+                    "role": "user",
+                    "parts": [
+                        {"text": classifier.prompt_text},
+                        {"inline_data": {
+                            "mime_type": image_part.inline_data.mime_type,
+                            "data": base64.b64encode(image_part.inline_data.data).decode("utf-8")
+                        }}
+                    ]
+                }],
+                "generation_config": classifier._generation_config()
+            }
+        }
+
+    async def submit(self, requests_path: Path) -> str:
+        client = self.classifier.client
+        uploaded = await client.aio.files.upload(
+            file=str(requests_path),
+            config={"display_name": requests_path.parent.name, "mime_type": "jsonl"}
+        )
+        job = await client.aio.batches.create(
+            model=self.classifier.settings.GEMINI_MODEL,
+            src=uploaded.name,
+            config={"display_name": requests_path.parent.name}
+        )
+        return job.name
+
+    async def status(self, job_id: str) -> BatchStatus:
+        job = await self.classifier.client.aio.batches.get(name=job_id)
+        state = job.state.name if job.state else "JOB_STATE_UNSPECIFIED"
+        stats = job.completion_stats
+        completed = (stats.successful_count or 0) if stats else 0
+        failed = (stats.failed_count or 0) if stats else 0
+        return BatchStatus(
+            state=state,
+            done=state in self.DONE_STATES,
+            total=completed + failed + ((stats.incomplete_count or 0) if stats else 0),
+            completed=completed,
+            failed=failed
+        )
+
+    async def download(self, job_id: str) -> Iterable[Dict[str, Any]]:
+        client = self.classifier.client
+        job = await client.aio.batches.get(name=job_id)
+        if not job.dest or not job.dest.file_name:
+            raise APIError(f"Batch job {job_id} has no output file")
+        content = await client.aio.files.download(file=job.dest.file_name)
+        return [
+            json.loads(line)
+            for line in content.decode("utf-8").splitlines() if line.strip()
+        ]
+
+    def parse_output(self, line: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+        key = line.get("key", "")
+        if line.get("error"):
+            return key, None, str(line["error"].get("message", line["error"]))
+        try:
+            parts = line["response"]["candidates"][0]["content"]["parts"]
+            return key, "".join(part.get("text", "") for part in parts), None
+        except (KeyError, IndexError, TypeError):
+            return key, None, "Malformed batch output line"
+
+    def make_output(self, key: str, text: str) -> Dict[str, Any]:
+        return {
+            "key": key,
+            "response": {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+        }
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Offline stand-in for a provider batch endpoint.
+
+    Request files are built and results parsed in the provider's format, but
+    jobs are stored under the job directory and complete immediately with
+    deterministic answers derived from each request. Useful for testing the
+    batch workflow without an API account.
+    """
+
+    name = "local"
+
+    def __init__(self, classifier: BaseClassifier, provider_backend: BatchBackend):
+        super().__init__(classifier)
+        self.provider_backend = provider_backend
+        self._job_dir: Optional[Path] = None
+
+    def bind(self, job_dir: Union[str, Path]) -> 'LocalBatchBackend':
+        """Set the job directory where jobs are stored."""
+        self._job_dir = Path(job_dir)
+        return self
+
+    async def build_request(self, key: str, image_path: str) -> Dict[str, Any]:
+        return await self.provider_backend.build_request(key, image_path)
+
+    async def submit(self, requests_path: Path) -> str:
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        shutil.copyfile(requests_path, self._job_path(job_id))
+        return job_id
+
+    async def status(self, job_id: str) -> BatchStatus:
+        total = sum(1 for _ in self._read_requests(job_id))
+        return BatchStatus(state="completed", done=True, total=total, completed=total)
+
+    async def download(self, job_id: str) -> Iterable[Dict[str, Any]]:
+        outputs = []
+        for request in self._read_requests(job_id):
+            key = request.get("custom_id", request.get("key", ""))
+            digest = hashlib.sha256(
+                json.dumps(request, sort_keys=True).encode("utf-8")).digest()
+            outputs.append(self.provider_backend.make_output(
+                key, json.dumps(deterministic_answer(self.classifier, digest))))
+        return outputs
+
+    def parse_output(self, line: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+        return self.provider_backend.parse_output(line)
+
+    def make_output(self, key: str, text: str) -> Dict[str, Any]:
+        return self.provider_backend.make_output(key, text)
+
+    def _job_path(self, job_id: str) -> Path:
+        if self._job_dir is None:
+            raise ClothingClassifierError("Local batch backend is not bound to a job directory")
+        return self._job_dir / f"{job_id}.jsonl"
+
+    def _read_requests(self, job_id: str) -> Iterable[Dict[str, Any]]:
+        with open(self._job_path(job_id), encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+PROVIDER_BACKENDS = {
+    "openai": OpenAIBatchBackend,
+    "gemini": GeminiBatchBackend,
+}
+
+
+def create_backend(
+    classifier: BaseClassifier,
+    provider: str,
+    local: bool = False,
+    job_dir: Optional[Union[str, Path]] = None
+) -> BatchBackend:
+    """
+    Create the batch backend for a provider.
+
+    Args:
+        classifier: Classifier for the provider
+        provider: Provider name
+        local: Use the offline stand-in instead of the provider API
+        job_dir: Job directory, required for the local stand-in
+
+    Returns:
+        BatchBackend instance
+    """
+    backend_class = PROVIDER_BACKENDS.get(provider)
+    if backend_class is None:
+        raise ClothingClassifierError(
+            f"Batch jobs are not supported for provider: {provider}")
+
+    backend = backend_class(classifier)
+    if local:
+        return LocalBatchBackend(classifier, backend).bind(job_dir)
+    return backend
+
+
+async def submit_job(
+    backend: BatchBackend,
+    image_paths: Iterable[str],
+    job_dir: Union[str, Path]
+) -> BatchJob:
+    """
+    Build the batch input file for a set of images and submit it.
+
+    Images that cannot be read or encoded are left out of the job with a
+    warning and recorded in the manifest, so that collecting the results
+    reports them as errors.
+
+    Args:
+        backend: Batch backend to submit to
+        image_paths: Images to classify
+        job_dir: Directory for the request file and job manifest
+
+    Returns:
+        The submitted BatchJob, also saved to job_dir
+    """
+    job_dir = Path(job_dir)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    requests_path = job_dir / BatchJob.REQUESTS
+
+    classifier = backend.classifier
+    images, skipped = {}, {}
+    with open(requests_path, 'w', encoding='utf-8') as f:
+        for index, image_path in enumerate(image_paths):
+            key = str(index)
+            try:
+                request = await backend.build_request(key, image_path)
+            except ClothingClassifierError as e:
+                classifier.logger.warning(f"Skipping {image_path}: {str(e)}")
+                skipped[image_path] = str(e)
+                continue
+            f.write(json.dumps(request) + "\n")
+            images[key] = image_path
+
+    if not images:
+        requests_path.unlink()
+        raise ClothingClassifierError("No images to submit")
+
+    job = BatchJob(
+        id=await backend.submit(requests_path),
+        provider=classifier.settings.OUTFITAI_PROVIDER,
+        backend=backend.name,
+        model=classifier.model_name,
+        images=images,
+        skipped=skipped
+    )
+    job.save(job_dir)
+    return job
+
+
+async def collect_results(backend: BatchBackend, job: BatchJob) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Map the output of a finished batch job back to image paths.
+
+    Each response is validated like a regular classification result.
+    Images skipped at submission are reported with their error.
+
+    Yields:
+        Classification results, or dictionaries with an "error" key
+    """
+    status = await backend.status(job.id)
+    if not status.done:
+        raise ClothingClassifierError(
+            f"Batch job {job.id} is not finished (state: {status.state})")
+
+    seen = set()
+    for line in await backend.download(job.id):
+        key, text, error = backend.parse_output(line)
+        image_path = job.images.get(key)
+        if image_path is None:
+            continue
+        seen.add(key)
+
+        if error is not None:
+            yield {"image_path": image_path, "error": error}
+            continue
+        try:
+            result = json.loads(text)
+            backend.classifier._validate_response(result)
+        except (json.JSONDecodeError, ValidationError) as e:
+            yield {"image_path": image_path, "error": f"Invalid response: {str(e)}"}
+            continue
+        yield {"image_path": image_path, **result}
+
+    for key, image_path in job.images.items():
+        if key not in seen:
+            yield {"image_path": image_path, "error": "No result in batch output"}
+
+    for image_path, error in job.skipped.items():
+        yield {"image_path": image_path, "error": f"Not submitted: {error}"}
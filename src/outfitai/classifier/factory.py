@@ -1,19 +1,62 @@
+import importlib
 from typing import Union, Dict, Type
 from ..config.settings import Settings
 from .base import BaseClassifier
-from .openai_classifier import OpenAIClassifier
-from .gemini_classifier import GeminiClassifier
 from ..error.exceptions import ClothingClassifierError
 
 
 class ClassifierFactory:
     """Factory class for creating classifier instances."""
 
-    _classifiers: Dict[str, Type[BaseClassifier]] = {
-        'openai': OpenAIClassifier,
-        'gemini': GeminiClassifier
+    # Classifiers are registered as "module:Class" paths relative to this
+    # package and imported on first use, so only the SDK of the selected
+    # provider is loaded. Classes can also be registered directly.
+    _classifiers: Dict[str, Union[str, Type[BaseClassifier]]] = {
+        'openai': '.openai_classifier:OpenAIClassifier',
+        'gemini': '.gemini_classifier:GeminiClassifier',
+        'mock': '.mock_classifier:MockClassifier',
+        'router': '.router_classifier:RouterClassifier'
     }
 
+    @classmethod
+    def register(cls, provider: str, classifier: Union[str, Type[BaseClassifier]]) -> None:
+        """
+        Register a classifier class or "module:Class" path for a provider.
+
+        Args:
+            provider: Provider name used in OUTFITAI_PROVIDER
+            classifier: Classifier class, or import path loaded on first use
+        """
+        cls._classifiers[provider] = classifier
+
+    @classmethod
+    def get_classifier_class(cls, provider: str) -> Type[BaseClassifier]:
+        """
+        Return the classifier class for a provider, importing it if needed.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            Classifier class
+
+        Raises:
+            ValueError: If the provider is not registered
+        """
+        classifier_class = cls._classifiers.get(provider.lower())
+        if not classifier_class:
+            raise ValueError(
+                f"Invalid API provider: {provider}. "
+                f"Must be one of: {', '.join(cls._classifiers.keys())}"
+            )
+
+        if isinstance(classifier_class, str):
+            module_name, _, class_name = classifier_class.partition(':')
+            module = importlib.import_module(module_name, __package__)
+            classifier_class = getattr(module, class_name)
+            cls._classifiers[provider.lower()] = classifier_class
+        return classifier_class
+
     @classmethod
     def create_classifier(
         cls,
@@ -27,7 +70,7 @@ class ClassifierFactory:
                      If None, default Settings will be used
 
         Returns:
-            Instance of appropriate classifier (OpenAI or Gemini)
+            Instance of appropriate classifier (OpenAI, Gemini, mock or router)
 
         Raises:
             ClothingClassifierError: If provider is invalid or initialization fails
@@ -43,13 +86,8 @@ class ClassifierFactory:
                     "settings must be dict, Settings instance, or None")
 
             # Get the appropriate classifier class
-            classifier_class = cls._classifiers.get(
-                settings.OUTFITAI_PROVIDER.lower())
-            if not classifier_class:
-                raise ValueError(
-                    f"Invalid API provider: {settings.OUTFITAI_PROVIDER}. "
-                    f"Must be one of: {', '.join(cls._classifiers.keys())}"
-                )
+            classifier_class = cls.get_classifier_class(
+                settings.OUTFITAI_PROVIDER)
 
             # Create and return classifier instance
             return classifier_class(settings)
@@ -1,14 +1,28 @@
 from google import genai
+from google.genai import errors
+import httpx
+import aiohttp
+import asyncio
 import json
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 import re
 from ..utils.image_processor import ImageSource
-from ..error.exceptions import APIError
+from ..error.exceptions import (
+    APIError, ClothingClassifierError, RateLimitError, TransientAPIError, ValidationError
+)
+from ..utils.rate_limiter import parse_retry_after
+from ..utils.timeouts import stage_timeout
 from .base import BaseClassifier
+from .schema import gemini_response_schema
 from ..config.settings import Settings
 
 
 class GeminiClassifier(BaseClassifier):
+    # Token cost of an image up to 384px on both sides
+    IMAGE_TOKENS = 258
+    SUPPORTS_STRUCTURED_OUTPUT = True
+    SUPPORTS_PACKING = True
+
     def __init__(self, settings: Optional[Union[Settings, dict]] = None):
         """
         Initialize Gemini classifier with optional settings.
@@ -29,12 +43,16 @@ class GeminiClassifier(BaseClassifier):
         except ValueError as e:
             raise ValueError(str(e)) from e
 
-    async def classify_single(self, image_source: Union[str, ImageSource]) -> Dict[str, Any]:
+    @property
+    def model_name(self) -> str:
+        return self.settings.GEMINI_MODEL
+
+    async def _classify(self, image_source: ImageSource) -> Dict[str, Any]:
         """
         Classify a single clothing item using Gemini Vision API.
 
         Args:
-            image_source: Path to the image file
+            image_source: Image source to classify
 
         Returns:
             Dictionary containing classification results
@@ -42,25 +60,108 @@ class GeminiClassifier(BaseClassifier):
         try:
             image_part = await self.image_processor.process_image(image_source)
 
-            response = self.client.models.generate_content(
-                model=self.settings.GEMINI_MODEL,
-                contents=[
-                    self.prompt_text,
-                    image_part
-                ],
-                config={
-                    'response_mime_type': 'application/json',
-                },
-            )
-
-            result = json.loads(response.text)
+            result = await self._request([
+                self.prompt_text,
+                image_part
+            ])
             self._validate_response(result)
 
             return {
-                "image_path": str(image_source.path if isinstance(image_source, ImageSource) else image_source),
+                "image_path": str(image_source.path),
                 **result
             }
 
+        except ClothingClassifierError:
+            raise
+        except Exception as e:
+            raise APIError(f"Error classifying image with Gemini: {str(e)}")
+
+    async def _classify_packed(self, image_sources: List[ImageSource]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Classify several clothing items with one Gemini request.
+
+        Args:
+            image_sources: Image sources to classify
+
+        Returns:
+            Unvalidated response elements in input order (None if missing),
+            or the error of an image that could not be processed
+        """
+        try:
+            image_parts, failed = await self._process_pack(image_sources)
+            if not image_parts:
+                return self._merge_pack(failed, [])
+
+            contents = [self._create_packed_prompt(len(image_parts))]
+            for index, image_part in enumerate(image_parts):
+                contents.extend([f"Image {index}:", image_part])
+
+            data = await self._request(contents, packed=True, images=len(image_parts))
+            return self._merge_pack(failed, self._parse_packed_response(data, len(image_parts)))
+
+        except ClothingClassifierError:
+            raise
+        except Exception as e:
+            raise APIError(f"Error classifying images with Gemini: {str(e)}")
+
+    def _generation_config(self, packed: bool = False) -> Dict[str, Any]:
+        """Return the generation config requesting JSON that follows the result schema."""
+        config = {'response_mime_type': 'application/json'}
+        if self.structured_output:
+            config['response_schema'] = gemini_response_schema(self.response_schema(packed))
+        return config
+
+    async def _request(self, contents: List[Any], packed: bool = False, images: int = 1) -> Any:
+        """
+        Send a generate_content request and return the parsed JSON response.
+
+        Raises:
+            RateLimitError: If the request was rate limited
+            TransientAPIError: On network errors and server errors
+            ValidationError: If the response is not valid JSON
+            StageTimeoutError: If the request exceeds PROVIDER_TIMEOUT
+            APIError: On any other API error
+        """
+        await self._start_request(images)
+        try:
+            with self.metrics.time("provider"):
+                response = await stage_timeout(
+                    self.client.aio.models.generate_content(
+                        model=self.settings.GEMINI_MODEL,
+                        contents=contents,
+                        config=self._generation_config(packed),
+                    ),
+                    self.settings.PROVIDER_TIMEOUT, "Gemini request")
+
+            http_response = getattr(response, 'sdk_http_response', None)
+            self._observe_headers(getattr(http_response, 'headers', None))
+
+            with self.metrics.time("parse"):
+                usage = getattr(response, 'usage_metadata', None)
+                if usage is not None:
+                    self.metrics.record_usage(
+                        usage.prompt_token_count, usage.candidates_token_count)
+                return json.loads(response.text)
+
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON in response: {str(e)}") from e
+        except ClothingClassifierError:
+            raise
+        except errors.APIError as e:
+            if e.code == 429:
+                raise RateLimitError(
+                    f"Gemini rate limit exceeded: {str(e)}",
+                    retry_after=parse_retry_after(
+                        getattr(e.response, 'headers', None))
+                ) from e
+            if isinstance(e, errors.ServerError):
+                raise TransientAPIError(
+                    f"Error classifying image with Gemini: {str(e)}") from e
+            raise APIError(f"Error classifying image with Gemini: {str(e)}")
+        except (httpx.TransportError, aiohttp.ClientError, ConnectionError,
+                asyncio.TimeoutError) as e:
+            raise TransientAPIError(
+                f"Error classifying image with Gemini: {str(e)}") from e
         except Exception as e:
             raise APIError(f"Error classifying image with Gemini: {str(e)}")
 
@@ -0,0 +1,220 @@
+import asyncio
+import random
+from typing import Dict, Any, List, Optional, Union
+from ..utils.image_processor import ImageSource
+from ..error.exceptions import RateLimitError, TransientAPIError
+from ..utils.timeouts import stage_timeout
+from .base import BaseClassifier
+from ..config.settings import Settings
+
+
+def deterministic_answer(classifier: BaseClassifier, digest: bytes) -> Dict[str, Any]:
+    """
+    Pick a valid classification deterministically from a digest.
+
+    Args:
+        classifier: Classifier providing the allowed values
+        digest: At least 5 bytes, e.g. a sha256 digest of the image
+
+    Returns:
+        Dictionary containing classification results
+    """
+    seasons = [
+        season for i, season in enumerate(classifier.season_values)
+        if digest[4] >> i & 1
+    ] or [classifier.season_values[digest[4] % len(classifier.season_values)]]
+    return {
+        "color": classifier.color_values[digest[0] % len(classifier.color_values)],
+        "category": classifier.category_values[digest[1] % len(classifier.category_values)],
+        "dress_code": classifier.dress_code_values[digest[2] % len(classifier.dress_code_values)],
+        "season": seasons
+    }
+
+
+class MockServer:
+    """
+    Simulated provider endpoint with configurable latency and failures.
+
+    Used by MockClassifier and by the benchmarks to drive fake provider
+    clients, so all code paths see the same load profile.
+    """
+
+    DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+    def __init__(
+        self,
+        latency: float = 0.1,
+        distribution: str = "fixed",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency: Mean response latency in seconds
+            distribution: Latency distribution, one of DISTRIBUTIONS
+            error_rate: Fraction of requests failing with a server error
+            rate_limit_rate: Fraction of requests rejected with a rate limit error
+            retry_after: Delay advertised by rate limit errors, in seconds
+            seed: Random seed for reproducible runs
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(
+                f"Invalid latency distribution: {distribution}. "
+                f"Must be one of: {', '.join(self.DISTRIBUTIONS)}"
+            )
+        self.latency = latency
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'MockServer':
+        """Create a mock server from the MOCK_* settings."""
+        return cls(
+            latency=settings.MOCK_LATENCY,
+            distribution=settings.MOCK_LATENCY_DISTRIBUTION,
+            error_rate=settings.MOCK_ERROR_RATE,
+            rate_limit_rate=settings.MOCK_RATE_LIMIT_RATE,
+            retry_after=settings.MOCK_RETRY_AFTER,
+            seed=settings.MOCK_SEED
+        )
+
+    def sample_latency(self) -> float:
+        """Draw one response latency in seconds."""
+        if self.latency <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return self._random.uniform(0, 2 * self.latency)
+        if self.distribution == "exponential":
+            return self._random.expovariate(1 / self.latency)
+        if self.distribution == "lognormal":
+            # sigma 1 gives a long tail; mu keeps the mean at `latency`
+            return self._random.lognormvariate(0, 1) * self.latency / 1.6487
+        return self.latency
+
+    def sample_outcome(self) -> str:
+        """Draw the outcome of one request: "ok", "error" or "rate_limit"."""
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limit"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return "ok"
+
+    async def respond(self) -> None:
+        """
+        Wait for one simulated response.
+
+        Raises:
+            RateLimitError: For injected rate limit errors
+            TransientAPIError: For injected server errors
+        """
+        await asyncio.sleep(self.sample_latency())
+        outcome = self.sample_outcome()
+        if outcome == "rate_limit":
+            raise RateLimitError(
+                "Mock rate limit exceeded", retry_after=self.retry_after)
+        if outcome == "error":
+            raise TransientAPIError("Mock server error")
+
+
+class MockClassifier(BaseClassifier):
+    """
+    Offline classifier returning deterministic answers without any API.
+
+    Images go through the regular loading and preprocessing, then a
+    simulated request with the latency and failures configured by the
+    MOCK_* settings. The answer depends only on the image content.
+    """
+
+    SUPPORTS_PACKING = True
+
+    def __init__(self, settings: Optional[Union[Settings, dict]] = None):
+        """
+        Initialize mock classifier with optional settings.
+
+        Args:
+            settings: Optional Settings instance or dictionary of settings
+        """
+        try:
+            if isinstance(settings, dict):
+                settings = Settings.from_dict(settings)
+            elif settings is None:
+                settings = Settings(OUTFITAI_PROVIDER="mock")
+
+            super().__init__(settings)
+            self.server = MockServer.from_settings(self.settings)
+            self.prompt_text = self._create_prompt()
+
+        except ValueError as e:
+            raise ValueError(str(e)) from e
+
+    @property
+    def model_name(self) -> str:
+        return "mock"
+
+    async def _classify(self, image_source: ImageSource) -> Dict[str, Any]:
+        """
+        Classify a single clothing item.
+
+        Args:
+            image_source: Image source to classify
+
+        Returns:
+            Dictionary containing classification results
+        """
+        # Hashing first keeps the loaded bytes on the source for processing
+        result = await self._answer(image_source)
+        await self.image_processor.process_image(image_source)
+        await self._start_request()
+        with self.metrics.time("provider"):
+            await stage_timeout(
+                self.server.respond(), self.settings.PROVIDER_TIMEOUT, "Mock request")
+
+        self._validate_response(result)
+        return {"image_path": str(image_source.path), **result}
+
+    async def _classify_packed(self, image_sources: List[ImageSource]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Classify several clothing items with one simulated request.
+
+        Args:
+            image_sources: Image sources to classify
+
+        Returns:
+            Response elements in input order, or the error of an image that
+            could not be processed
+        """
+        images, failed = await self._process_pack(image_sources)
+        if not images:
+            return self._merge_pack(failed, [])
+        answers = await asyncio.gather(*[
+            self._answer(source) for index, source in enumerate(image_sources)
+            if index not in failed
+        ])
+        await self._start_request(len(images))
+        with self.metrics.time("provider"):
+            await stage_timeout(
+                self.server.respond(), self.settings.PROVIDER_TIMEOUT, "Mock request")
+        return self._merge_pack(failed, list(answers))
+
+    async def _answer(self, image_source: ImageSource) -> Dict[str, Any]:
+        digest = await self.image_processor.content_digest(image_source)
+        return deterministic_answer(self, bytes.fromhex(digest))
+
+    @classmethod
+    def create(cls, settings_dict: dict) -> 'MockClassifier':
+        """
+        Create a classifier instance from a dictionary of settings.
+
+        Args:
+            settings_dict: Dictionary containing settings
+
+        Returns:
+            MockClassifier instance
+        """
+        return cls(settings=settings_dict)
@@ -1,13 +1,24 @@
 import openai
+import asyncio
 import json
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from ..utils.image_processor import ImageSource
-from ..error.exceptions import APIError
+from ..error.exceptions import (
+    APIError, ClothingClassifierError, RateLimitError, TransientAPIError, ValidationError
+)
+from ..utils.rate_limiter import parse_retry_after
+from ..utils.timeouts import stage_timeout
 from .base import BaseClassifier
+from .schema import openai_response_format
 from ..config.settings import Settings
 
 
 class OpenAIClassifier(BaseClassifier):
+    # Token cost of a low detail image
+    IMAGE_TOKENS = 85
+    SUPPORTS_STRUCTURED_OUTPUT = True
+    SUPPORTS_PACKING = True
+
     def __init__(self, settings: Optional[Union[Settings, dict]] = None):
         """
         Initialize OpenAI classifier with optional settings.
@@ -22,19 +33,26 @@ class OpenAIClassifier(BaseClassifier):
                 settings = Settings()
 
             super().__init__(settings)
+            # Retries are handled by BaseClassifier
             self.client = openai.AsyncOpenAI(
-                api_key=self.settings.OPENAI_API_KEY)
+                api_key=self.settings.OPENAI_API_KEY,
+                base_url=self.settings.OPENAI_BASE_URL,
+                max_retries=0)
             self.prompt_text = self._create_prompt()
 
         except ValueError as e:
             raise ValueError(str(e)) from e
 
-    async def classify_single(self, image_source: Union[str, ImageSource]) -> Dict[str, Any]:
+    @property
+    def model_name(self) -> str:
+        return self.settings.OPENAI_MODEL
+
+    async def _classify(self, image_source: ImageSource) -> Dict[str, Any]:
         """
         Classify a single clothing item.
 
         Args:
-            image_source: Path to the image file
+            image_source: Image source to classify
 
         Returns:
             Dictionary containing classification results
@@ -42,36 +60,139 @@ class OpenAIClassifier(BaseClassifier):
         try:
             image_data = await self.image_processor.process_image(image_source)
 
-            response = await self.client.chat.completions.create(
-                model=self.settings.OPENAI_MODEL,
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": self.prompt_text},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": image_data,  # URL or base64 data URL
-                                "detail": "low"
-                            }
-                        }
-                    ]
-                }],
-                max_tokens=self.settings.OPENAI_MAX_TOKENS,
-                response_format={"type": "json_object"}
+            result = await self._request(
+                [
+                    {"type": "text", "text": self.prompt_text},
+                    self._image_content(image_data)
+                ],
+                max_tokens=self.settings.OPENAI_MAX_TOKENS
             )
-
-            result = json.loads(response.choices[0].message.content)
             self._validate_response(result)
 
             return {
-                "image_path": str(image_source.path if isinstance(image_source, ImageSource) else image_source),
+                "image_path": str(image_source.path),
                 **result
             }
 
+        except ClothingClassifierError:
+            raise
         except Exception as e:
             raise APIError(f"Error classifying image: {str(e)}")
 
+    async def _classify_packed(self, image_sources: List[ImageSource]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Classify several clothing items with one request.
+
+        Args:
+            image_sources: Image sources to classify
+
+        Returns:
+            Unvalidated response elements in input order (None if missing),
+            or the error of an image that could not be processed
+        """
+        try:
+            images, failed = await self._process_pack(image_sources)
+            if not images:
+                return self._merge_pack(failed, [])
+
+            content = [{
+                "type": "text",
+                "text": self._create_packed_prompt(len(images))
+            }]
+            for index, image_data in enumerate(images):
+                content.append({"type": "text", "text": f"Image {index}:"})
+                content.append(self._image_content(image_data))
+
+            data = await self._request(
+                content,
+                max_tokens=self.settings.OPENAI_MAX_TOKENS * len(images),
+                packed=True,
+                images=len(images)
+            )
+            return self._merge_pack(failed, self._parse_packed_response(data, len(images)))
+
+        except ClothingClassifierError:
+            raise
+        except Exception as e:
+            raise APIError(f"Error classifying images: {str(e)}")
+
+    @staticmethod
+    def _image_content(image_data: str) -> Dict[str, Any]:
+        return {
+            "type": "image_url",
+            "image_url": {
+                "url": image_data,  # URL or base64 data URL
+                "detail": "low"
+            }
+        }
+
+    def _response_format(self, packed: bool = False) -> Dict[str, Any]:
+        """Return the response_format enforcing the result schema, or plain JSON mode."""
+        if self.structured_output:
+            return openai_response_format(
+                self.response_schema(packed),
+                "packed_classification" if packed else "classification")
+        return {"type": "json_object"}
+
+    async def _request(
+        self,
+        content: List[Dict[str, Any]],
+        max_tokens: int,
+        packed: bool = False,
+        images: int = 1
+    ) -> Any:
+        """
+        Send a chat completion request and return the parsed JSON response.
+
+        Raises:
+            RateLimitError: If the request was rate limited
+            TransientAPIError: On network errors and server errors
+            ValidationError: If the response is not valid JSON
+            StageTimeoutError: If the request exceeds PROVIDER_TIMEOUT
+            APIError: On any other API error
+        """
+        await self._start_request(images)
+        try:
+            with self.metrics.time("provider"):
+                raw_response = await stage_timeout(
+                    self.client.chat.completions.with_raw_response.create(
+                        model=self.settings.OPENAI_MODEL,
+                        messages=[{
+                            "role": "user",
+                            "content": content
+                        }],
+                        max_tokens=max_tokens,
+                        response_format=self._response_format(packed)
+                    ),
+                    self.settings.PROVIDER_TIMEOUT, "OpenAI request")
+            self._observe_headers(raw_response.headers)
+
+            with self.metrics.time("parse"):
+                response = raw_response.parse()
+                usage = response.usage
+                if usage is not None:
+                    self.metrics.record_usage(
+                        usage.prompt_tokens, usage.completion_tokens)
+                return json.loads(response.choices[0].message.content)
+
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON in response: {str(e)}") from e
+        except ClothingClassifierError:
+            raise
+        except openai.RateLimitError as e:
+            raise RateLimitError(
+                f"OpenAI rate limit exceeded: {str(e)}",
+                retry_after=parse_retry_after(e.response.headers)
+            ) from e
+        except (openai.APIConnectionError, openai.InternalServerError) as e:
+            raise TransientAPIError(f"Error classifying image: {str(e)}") from e
+        except Exception as e:
+            raise APIError(f"Error classifying image: {str(e)}")
+
+    def _estimate_tokens(self) -> int:
+        """Estimate the tokens one request consumes, including max_tokens."""
+        return super()._estimate_tokens() + self.settings.OPENAI_MAX_TOKENS
+
     @classmethod
     def create(cls, settings_dict: dict) -> 'OpenAIClassifier':
         """
@@ -0,0 +1,262 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Dict, Any, List, Optional, Union
+from ..utils.image_processor import ImageSource
+from ..error.exceptions import ImageProcessingError, UnsupportedImageError
+from .base import BaseClassifier
+from .factory import ClassifierFactory
+from ..config.settings import Settings
+
+
+class ProviderStats:
+    """Latency and error EWMAs of one routed provider."""
+
+    def __init__(self, alpha: float = 0.2, window: int = 200):
+        """
+        Args:
+            alpha: EWMA smoothing factor; higher reacts faster
+            window: Number of recent latencies kept for quantiles
+        """
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self._latencies = deque(maxlen=window)
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        self.requests += 1
+        self.failures += failed
+        self.error_rate += self.alpha * (float(failed) - self.error_rate)
+        self.observe_latency(seconds)
+
+    def observe_latency(self, seconds: float) -> None:
+        self.latency = seconds if self.latency is None else (
+            self.latency + self.alpha * (seconds - self.latency))
+        self._latencies.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency quantile of the recent window, or None without enough samples."""
+        if len(self._latencies) < 10:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def score(self, error_penalty: float) -> float:
+        """Expected cost of a request; lower is better. Unmeasured providers score 0."""
+        return (self.latency or 0.0) * (1 + error_penalty * self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ewma": self.latency,
+            "error_rate_ewma": self.error_rate,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class RoutedConcurrency:
+    """Concurrency limit of a router, following the provider it currently prefers."""
+
+    def __init__(self, router: 'RouterClassifier'):
+        self._router = router
+
+    @property
+    def value(self) -> int:
+        """Current number of requests allowed in flight."""
+        name = self._router._ranked_providers()[0]
+        return self._router.providers[name].concurrency.value
+
+
+class RouterClassifier(BaseClassifier):
+    """
+    Classifier routing each image across several providers.
+
+    Images go to the provider with the lowest latency EWMA, weighted by its
+    error EWMA. When the chosen provider takes longer than its recent
+    ROUTER_HEDGE_QUANTILE latency, a hedged request is sent to the next
+    provider and the first answer wins. When a provider fails, the image
+    fails over to the next one. Caching, request coalescing, near-duplicate
+    reuse and pre-classification happen once in the router; rate limiting,
+    retries and packing stay with each provider. The number of images in
+    flight follows the adaptive concurrency of the preferred provider.
+    """
+
+    def __init__(self, settings: Optional[Union[Settings, dict]] = None):
+        """
+        Initialize router classifier with optional settings.
+
+        Args:
+            settings: Optional Settings instance or dictionary of settings
+        """
+        try:
+            if isinstance(settings, dict):
+                settings = Settings.from_dict(settings)
+            elif settings is None:
+                settings = Settings(OUTFITAI_PROVIDER="router")
+
+            super().__init__(settings)
+            self.providers: Dict[str, BaseClassifier] = {}
+            self.stats: Dict[str, ProviderStats] = {}
+            for name in self.settings.router_providers():
+                provider = ClassifierFactory.get_classifier_class(name)(
+                    self._provider_settings(name))
+                # Report provider stages and retries in the router's metrics
+                provider.metrics = self.metrics
+                provider.image_processor.metrics = self.metrics
+                provider.retry_stats = self.retry_stats
+                self.providers[name] = provider
+                self.stats[name] = ProviderStats(alpha=self.settings.ROUTER_EWMA_ALPHA)
+            self.concurrency = RoutedConcurrency(self)
+            self.prompt_text = self._create_prompt()
+
+        except ValueError as e:
+            raise ValueError(str(e)) from e
+
+    def _provider_settings(self, name: str) -> Settings:
+        return self.settings.model_copy(update={
+            "OUTFITAI_PROVIDER": name,
+            "CACHE_ENABLED": False,
+            "NEAR_DUPLICATE_ENABLED": False,
+            "PRECLASSIFY_INDEX": None,
+            "COLOR_CHECK": "off",
+            # Fail over quickly instead of retrying a degraded provider
+            "RETRY_MAX_ATTEMPTS": min(
+                self.settings.RETRY_MAX_ATTEMPTS, self.settings.ROUTER_RETRY_ATTEMPTS),
+        })
+
+    @property
+    def model_name(self) -> str:
+        return "router(" + ",".join(
+            f"{name}:{provider.model_name}" for name, provider in self.providers.items()
+        ) + ")"
+
+    async def aclose(self) -> None:
+        """Release the connections of the router and every provider."""
+        await asyncio.gather(*[provider.aclose() for provider in self.providers.values()])
+        await super().aclose()
+
+    def provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the routing statistics of each provider."""
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+    def _ranked_providers(self) -> List[str]:
+        penalty = self.settings.ROUTER_ERROR_PENALTY
+        return sorted(self.providers, key=lambda name: self.stats[name].score(penalty))
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        """Seconds to wait before hedging a request to `name`, or None not to hedge."""
+        if not self.settings.ROUTER_HEDGE:
+            return None
+        quantile = self.stats[name].quantile(self.settings.ROUTER_HEDGE_QUANTILE)
+        if quantile is None:
+            return None
+        return max(quantile, self.settings.ROUTER_HEDGE_MIN_DELAY)
+
+    async def _classify(self, image_source: ImageSource) -> Dict[str, Any]:
+        """
+        Classify a single clothing item with the best available provider.
+
+        Args:
+            image_source: Image source to classify
+
+        Returns:
+            Dictionary containing classification results
+        """
+        return await self._classify_provider(image_source)
+
+    async def _classify_provider(self, image_source: ImageSource) -> Dict[str, Any]:
+        """
+        Route an image across the providers with hedging and failover.
+
+        Image processing errors are raised at once, without failing over,
+        unless only the provider rejected the image format.
+        """
+        candidates = self._ranked_providers()
+        pending: Dict[asyncio.Future, str] = {}
+        last_error: Optional[BaseException] = None
+
+        def start(name: str) -> Optional[float]:
+            task = asyncio.ensure_future(
+                self._attempt(name, image_source, primary=not pending))
+            pending[task] = name
+            return self._hedge_delay(name) if candidates else None
+
+        hedge_delay = start(candidates.pop(0))
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    name = candidates.pop(0)
+                    self.metrics.inc("hedged")
+                    self.logger.info(
+                        f"Hedging {image_source.path} to {name} after {hedge_delay:.2f}s")
+                    start(name)
+                    hedge_delay = None
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    try:
+                        return task.result()
+                    except UnsupportedImageError as e:
+                        # Another provider may accept the format
+                        last_error = e
+                        self.logger.info(
+                            f"Provider {name} does not support {image_source.path}: {str(e)}")
+                        continue
+                    except ImageProcessingError:
+                        # A bad input fails with every provider
+                        raise
+                    except Exception as e:
+                        last_error = e
+                        self.logger.warning(
+                            f"Provider {name} failed for {image_source.path}: {str(e)}")
+
+                if not pending and candidates:
+                    self.metrics.inc("failovers")
+                    hedge_delay = start(candidates.pop(0))
+
+            raise last_error
+        finally:
+            # The losing request of a hedge is no longer needed
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(
+        self,
+        name: str,
+        image_source: ImageSource,
+        primary: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Classify with one provider, recording its latency and outcome.
+
+        Args:
+            name: Provider to use
+            image_source: Image source to classify
+            primary: False for a hedged request racing an earlier one
+        """
+        stats = self.stats[name]
+        started = time.monotonic()
+        try:
+            # Each provider gets its own copy; the loaded bytes are shared
+            result = await self.providers[name]._classify_provider(replace(image_source))
+        except asyncio.CancelledError:
+            # A primary request that lost the hedge took at least this long,
+            # which keeps a slow provider from staying preferred. Cancelled
+            # hedges are left out; they would bias latency toward the loser.
+            if primary:
+                stats.observe_latency(time.monotonic() - started)
+            raise
+        except ImageProcessingError:
+            # Not the provider's fault, so its error rate is left alone
+            raise
+        except Exception:
+            stats.record(time.monotonic() - started, failed=True)
+            raise
+        stats.record(time.monotonic() - started)
+        return result
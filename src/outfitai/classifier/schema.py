@@ -0,0 +1,127 @@
+from typing import Any, Dict, List, Tuple
+
+# A result field: (allowed values, whether it holds a list of values)
+Field = Tuple[List[str], bool]
+
+COLOR_VALUES = [
+    "white", "gray", "black", "red", "orange",
+    "yellow", "green", "blue", "indigo", "purple", "other"
+]
+CATEGORY_VALUES = [
+    "tops", "bottoms", "outerwear", "dresses",
+    "shoes", "bags", "hats", "accessories", "other"
+]
+DRESS_CODE_VALUES = [
+    "casual wear", "business attire", "campus style", "date night outfit",
+    "travel wear", "wedding attire", "loungewear", "resort wear", "other"
+]
+SEASON_VALUES = ["spring", "summer", "fall", "winter"]
+
+
+def result_schema(fields: Dict[str, Field]) -> Dict[str, Any]:
+    """
+    Build the JSON schema of one classification result.
+
+    Every field is required and limited to its allowed values, in the
+    subset of JSON schema accepted by OpenAI strict structured outputs.
+
+    Args:
+        fields: Result fields by name
+
+    Returns:
+        JSON schema dictionary
+    """
+    properties = {}
+    for name, (values, multiple) in fields.items():
+        value_schema = {"type": "string", "enum": list(values)}
+        properties[name] = {"type": "array", "items": value_schema} if multiple else value_schema
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(fields),
+        "additionalProperties": False,
+    }
+
+
+def packed_result_schema(fields: Dict[str, Field]) -> Dict[str, Any]:
+    """Build the JSON schema of a packed response with one result per image."""
+    item = result_schema(fields)
+    item["properties"] = {"index": {"type": "integer"}, **item["properties"]}
+    item["required"] = ["index"] + item["required"]
+    return {
+        "type": "object",
+        "properties": {"results": {"type": "array", "items": item}},
+        "required": ["results"],
+        "additionalProperties": False,
+    }
+
+
+def openai_response_format(schema: Dict[str, Any], name: str = "classification") -> Dict[str, Any]:
+    """Wrap a schema as an OpenAI `response_format` for strict structured outputs."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema},
+    }
+
+
+def gemini_response_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a schema to the OpenAPI subset Gemini accepts as `response_schema`.
+
+    Gemini has no additionalProperties, spells types in upper case and
+    needs an explicit property order to keep keys in schema order.
+    """
+    converted: Dict[str, Any] = {}
+    for key, value in schema.items():
+        if key == "additionalProperties":
+            continue
+        if key == "type":
+            value = value.upper()
+        elif key == "properties":
+            value = {name: gemini_response_schema(item) for name, item in value.items()}
+            converted["property_ordering"] = list(value)
+        elif key == "items":
+            value = gemini_response_schema(value)
+        converted[key] = value
+    return converted
+
+
+def _describe(fields: Dict[str, Field]) -> str:
+    return ", ".join(
+        f"{name} ({'array of 1+' if multiple else 'one'} of {'|'.join(values)})"
+        for name, (values, multiple) in fields.items()
+    )
+
+
+def compact_prompt(fields: Dict[str, Field], structured: bool) -> str:
+    """
+    Build the classification prompt for one image.
+
+    With structured output the allowed values are enforced by the response
+    schema, so the prompt only states the task; otherwise it lists each
+    field's values compactly.
+
+    Args:
+        fields: Result fields by name
+        structured: Whether the provider receives the response schema
+
+    Returns:
+        Prompt text
+    """
+    if structured:
+        return "Classify the clothing item in the image."
+    return f"Classify the clothing item in the image. Reply in JSON with keys {_describe(fields)}."
+
+
+def compact_packed_prompt(fields: Dict[str, Field], count: int, structured: bool) -> str:
+    """Build the classification prompt for several images sent in one request."""
+    task = (
+        f"Classify the clothing item in each of the {count} images, "
+        f"numbered from 0 in the order given."
+    )
+    if structured:
+        return f"{task} Return one result per image with its index."
+    return (
+        f"{task} Reply in JSON with a 'results' array holding one object per image "
+        f"with keys index (the image number), {_describe(fields)}."
+    )
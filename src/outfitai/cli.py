@@ -1,12 +1,30 @@
 import click
-import json
 from pathlib import Path
 import asyncio
-from typing import Optional
+import itertools
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar
 from urllib.parse import urlparse
 from .classifier.factory import ClassifierFactory
+from .classifier.batch_jobs import BatchJob, collect_results, create_backend, submit_job
 from .config.settings import Settings
 from .error.exceptions import ClothingClassifierError
+from .utils.journal import JobJournal
+from .utils.color import dominant_colors_from_files
+from .utils.preclassifier import build_index
+from .utils.scanner import iter_image_files, parse_size
+from .utils.timeouts import stage_timeout
+from .utils.writers import WRITERS, CSVWriter, ResultWriter, create_writer
+
+# Images decoded and coloured together by `outfitai color`
+COLOR_CHUNK_SIZE = 256
+# CSV columns of `outfitai color`
+COLOR_FIELDS = ["image_path", "color", "confidence", "error"]
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 def validate_image_path(ctx, param, value):
@@ -30,29 +48,116 @@ async def process_images(
     classifier_factory: ClassifierFactory,
     settings: Settings,
     image_path: str,
-    batch: bool
-) -> list:
+    batch: bool,
+    writer: ResultWriter,
+    journal: Optional[JobJournal] = None,
+    resume: bool = False,
+    show_metrics: bool = False,
+    metrics_file: Optional[str] = None,
+    scan_options: Optional[dict] = None
+) -> Tuple[int, int]:
+    """
+    Classify an image or a directory and write the results.
+
+    Returns:
+        Numbers of images cancelled and not started because of the job deadline
+    """
     try:
         classifier = classifier_factory.create_classifier(settings)
 
-        if batch:
-            if not Path(image_path).is_dir():
-                raise click.UsageError("Batch mode requires a directory path")
-            return await classifier.classify_batch(image_path)
-        else:
-            return [await classifier.classify_single(image_path)]
+        async with classifier:
+            try:
+                if batch:
+                    if not Path(image_path).is_dir():
+                        raise click.UsageError("Batch mode requires a directory path")
+                    await classify_directory(
+                        classifier, image_path, writer, journal, resume,
+                        scan_options)
+                    report_stats(classifier)
+                else:
+                    writer.write(await stage_timeout(
+                        classifier.classify_single(image_path),
+                        settings.JOB_DEADLINE, "Job"))
+            finally:
+                report_metrics(classifier, show_metrics, metrics_file)
+            counters = classifier.metrics.counters
+            return counters["cancelled"], counters["not_started"]
 
+    except click.UsageError:
+        raise
     except Exception as e:
         raise ClothingClassifierError(f"Error processing images: {str(e)}")
 
 
-def save_results(results: list, output_path: Optional[str]) -> None:
-    if output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        click.echo(f"Results saved to {output_path}")
-    else:
-        click.echo(json.dumps(results, indent=2, ensure_ascii=False))
+async def classify_directory(
+    classifier,
+    image_path: str,
+    writer: ResultWriter,
+    journal: Optional[JobJournal],
+    resume: bool,
+    scan_options: Optional[dict] = None
+) -> None:
+    """
+    Classify a directory, writing each result as soon as it completes.
+
+    Files are fed to the classifier while the directory is still being
+    scanned. Finished images are also recorded in the journal. When
+    resuming, images already completed in the journal are skipped and their
+    recorded results are written first.
+    """
+    completed = journal.load() if journal is not None and resume else {}
+    if completed:
+        click.echo(
+            f"Resuming: {len(completed)} images already classified", err=True)
+    for result in completed.values():
+        writer.write(result)
+
+    pending_paths = (
+        path for path in iter_image_files(image_path, **(scan_options or {}))
+        if path not in completed
+    )
+    if journal is not None:
+        journal.open(resume=resume)
+    try:
+        async for index, result in classifier.classify_stream(pending_paths):
+            if journal is not None:
+                journal.record(result)
+            writer.write(result, index)
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def _csv_fields(settings: Settings) -> List[str]:
+    """CSV columns of classify results, with the local colour when COLOR_CHECK=verify."""
+    if settings.COLOR_CHECK == "verify":
+        return CSVWriter.FIELDS[:-1] + ["local_color", "local_color_confidence", "error"]
+    return CSVWriter.FIELDS
+
+
+def report_stats(classifier) -> None:
+    """Print cache and retry counters of a batch run to stderr."""
+    if classifier.cache is not None:
+        stats = classifier.cache.stats()
+        click.echo(
+            f"Cache: {stats['hits']} hits, {stats['misses']} misses", err=True)
+
+    retry_stats = classifier.retry_stats
+    if retry_stats.retries:
+        click.echo(
+            f"Retries: {retry_stats.retries} retried requests, "
+            f"{retry_stats.recovered} recovered, {retry_stats.exhausted} failed, "
+            f"{retry_stats.wasted_seconds:.1f}s spent on failed attempts",
+            err=True
+        )
+
+
+def report_metrics(classifier, show: bool, metrics_file: Optional[str]) -> None:
+    """Print the stage timing summary to stderr and/or save it as OpenMetrics text."""
+    if show:
+        click.echo(classifier.metrics.format_summary(), err=True)
+    if metrics_file:
+        classifier.metrics.write_openmetrics(metrics_file)
 
 
 @click.group()
@@ -65,26 +170,346 @@ def cli():
 @click.argument('image_path', callback=validate_image_path)
 @click.option('--batch', '-b', is_flag=True, help='Process multiple images from directory')
 @click.option('--output', '-o', type=click.Path(), help='Output file path')
+@click.option('--format', '-f', 'output_format', type=click.Choice(list(WRITERS)),
+              default='json', show_default=True,
+              help='Output format; ndjson and csv are written as results complete')
+@click.option('--no-cache', is_flag=True, help='Disable the result cache')
+@click.option('--cache-dir', type=click.Path(file_okay=False), help='Result cache directory')
+@click.option('--journal', type=click.Path(dir_okay=False),
+              help='Batch progress journal (default: OUTPUT.journal)')
+@click.option('--resume', is_flag=True, help='Skip images already completed in the journal')
+@click.option('--recursive', '-r', is_flag=True, help='Include images in subdirectories')
+@click.option('--include', multiple=True,
+              help='Only classify files matching this glob (repeatable)')
+@click.option('--exclude', multiple=True,
+              help='Skip files and directories matching this glob (repeatable)')
+@click.option('--min-size', help='Skip files smaller than this size, e.g. 10KB')
+@click.option('--max-size', help='Skip files larger than this size, e.g. 20MB')
+@click.option('--metrics', 'show_metrics', is_flag=True,
+              help='Print per-stage timings and counters to stderr')
+@click.option('--metrics-file', type=click.Path(dir_okay=False),
+              help='Save metrics in OpenMetrics text format')
+@click.option('--deadline', type=float,
+              help='Stop the run after this many seconds, keeping finished results')
+@click.option('--fetch-timeout', type=float, help='Seconds allowed to download an image URL')
+@click.option('--encode-timeout', type=float, help='Seconds allowed to resize and encode an image')
+@click.option('--provider-timeout', type=float, help='Seconds allowed for one provider request')
 def classify(
     image_path: str,
     batch: bool,
     output: Optional[str],
+    output_format: str,
+    no_cache: bool,
+    cache_dir: Optional[str],
+    journal: Optional[str],
+    resume: bool,
+    recursive: bool,
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    min_size: Optional[str],
+    max_size: Optional[str],
+    show_metrics: bool,
+    metrics_file: Optional[str],
+    deadline: Optional[float],
+    fetch_timeout: Optional[float],
+    encode_timeout: Optional[float],
+    provider_timeout: Optional[float],
 ):
     """Classify clothing items in images"""
     try:
-        settings = Settings()
+        overrides = {}
+        if no_cache:
+            overrides['CACHE_ENABLED'] = False
+        if cache_dir:
+            overrides['CACHE_DIR'] = cache_dir
+        for name, value in (('JOB_DEADLINE', deadline), ('FETCH_TIMEOUT', fetch_timeout),
+                            ('ENCODE_TIMEOUT', encode_timeout),
+                            ('PROVIDER_TIMEOUT', provider_timeout)):
+            if value is not None:
+                overrides[name] = value
+        settings = Settings(**overrides)
 
-        # 이미지 처리
-        results = asyncio.run(
-            process_images(ClassifierFactory, settings, image_path, batch)
-        )
+        journal_path = journal or (f"{output}.journal" if output else None)
+        if resume and not journal_path:
+            raise click.UsageError("--resume requires --journal or --output")
+        job_journal = JobJournal(journal_path) if batch and journal_path else None
+
+        try:
+            scan_options = {
+                'recursive': recursive,
+                'include': include,
+                'exclude': exclude,
+                'min_size': parse_size(min_size) if min_size else 0,
+                'max_size': parse_size(max_size) if max_size else 0,
+            }
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+        # 이미지 처리 및 결과 저장/출력
+        try:
+            with create_writer(output_format, output, _csv_fields(settings)) as writer:
+                cancelled, not_started = asyncio.run(
+                    process_images(ClassifierFactory, settings, image_path, batch,
+                                   writer, job_journal, resume, show_metrics, metrics_file,
+                                   scan_options)
+                )
+        except KeyboardInterrupt:
+            # The writer has flushed the results finished before the interrupt
+            click.echo("Interrupted: results completed so far were saved", err=True)
+            if job_journal is not None:
+                click.echo(f"Continue with --resume (journal: {job_journal.path})", err=True)
+            raise click.Abort()
+        if output:
+            click.echo(f"Results saved to {output}")
 
-        # 결과 저장/출력
-        save_results(results, output)
+        if cancelled or not_started:
+            click.echo(
+                f"Job deadline exceeded: {cancelled} images cancelled, "
+                f"{not_started} not started", err=True)
+            if job_journal is not None:
+                click.echo(f"Continue with --resume (journal: {job_journal.path})", err=True)
+            raise click.Abort()
+        # The default journal is only needed until the results are saved
+        if job_journal is not None and not journal:
+            job_journal.remove()
 
+    except (click.Abort, click.UsageError):
+        raise
     except ClothingClassifierError as e:
         click.echo(f"Classification error: {str(e)}", err=True)
         raise click.Abort()
     except Exception as e:
         click.echo(f"Unexpected error: {str(e)}", err=True)
         raise click.Abort()
+
+
+@cli.group()
+def batch():
+    """Submit and collect offline provider batch jobs"""
+    pass
+
+
+def _batch_settings(local: bool, **overrides) -> Settings:
+    """Settings for a batch command; jobs run by the local stand-in need no API key."""
+    if not local:
+        return Settings(**overrides)
+    settings = Settings(validate_api_keys=False, **overrides)
+    # The stand-in never calls the provider, but its SDK client needs a key to be created
+    return settings.model_copy(update={
+        'OPENAI_API_KEY': settings.OPENAI_API_KEY or 'local',
+        'GEMINI_API_KEY': settings.GEMINI_API_KEY or 'local',
+    })
+
+
+def _batch_backend(settings: Settings, local: bool, job_dir: str):
+    classifier = ClassifierFactory.create_classifier(settings)
+    return classifier, create_backend(
+        classifier, settings.OUTFITAI_PROVIDER, local=local, job_dir=job_dir)
+
+
+@batch.command('submit')
+@click.argument('image_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--job-dir', '-j', type=click.Path(file_okay=False),
+              help='Directory for the job files (default: outfitai-batch-TIMESTAMP)')
+@click.option('--local', is_flag=True, help='Use the offline stand-in instead of the provider API')
+def batch_submit(image_dir: str, job_dir: Optional[str], local: bool):
+    """Build a provider batch job from a directory and submit it"""
+    job_dir = job_dir or time.strftime("outfitai-batch-%Y%m%d-%H%M%S")
+
+    async def run():
+        classifier, backend = _batch_backend(_batch_settings(local), local, job_dir)
+        async with classifier:
+            return await submit_job(backend, iter_image_files(image_dir), job_dir)
+
+    try:
+        job = asyncio.run(run())
+        click.echo(f"Submitted batch job {job.id} with {len(job.images)} images")
+        if job.skipped:
+            click.echo(f"Skipped {len(job.skipped)} unreadable images", err=True)
+        click.echo(f"Job files saved to {job_dir}")
+    except Exception as e:
+        click.echo(f"Batch submit error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@batch.command('status')
+@click.argument('job_dir', type=click.Path(exists=True, file_okay=False))
+def batch_status(job_dir: str):
+    """Show the progress of a submitted batch job"""
+    async def run():
+        job = BatchJob.load(job_dir)
+        local = job.backend == 'local'
+        classifier, backend = _batch_backend(
+            _batch_settings(local, OUTFITAI_PROVIDER=job.provider), local, job_dir)
+        async with classifier:
+            return job, await backend.status(job.id)
+
+    try:
+        job, status = asyncio.run(run())
+        click.echo(f"Job {job.id}: {status.state}")
+        click.echo(
+            f"Completed: {status.completed}, failed: {status.failed}, "
+            f"total: {status.total or len(job.images)}")
+    except Exception as e:
+        click.echo(f"Batch status error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@batch.command('collect')
+@click.argument('job_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--output', '-o', type=click.Path(), help='Output file path')
+@click.option('--format', '-f', 'output_format', type=click.Choice(list(WRITERS)),
+              default='json', show_default=True, help='Output format')
+def batch_collect(job_dir: str, output: Optional[str], output_format: str):
+    """Download the results of a finished batch job"""
+    async def run(writer: ResultWriter):
+        job = BatchJob.load(job_dir)
+        local = job.backend == 'local'
+        classifier, backend = _batch_backend(
+            _batch_settings(local, OUTFITAI_PROVIDER=job.provider), local, job_dir)
+        async with classifier:
+            async for result in collect_results(backend, job):
+                writer.write(result)
+
+    try:
+        with create_writer(output_format, output) as writer:
+            asyncio.run(run(writer))
+        if output:
+            click.echo(f"Results saved to {output}")
+    except Exception as e:
+        click.echo(f"Batch collect error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+def _map_bounded(executor: Executor, func: Callable[[T], R], items: Iterable[T], limit: int) -> Iterator[R]:
+    """
+    Like Executor.map, but keeps at most `limit` calls pending.
+
+    Executor.map submits every item up front, which would consume a lazy
+    directory scan in full before the first result is written.
+    """
+    futures: Deque[Future] = deque()
+    for item in items:
+        futures.append(executor.submit(func, item))
+        if len(futures) >= limit:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+@cli.command()
+@click.argument('image_path', type=click.Path(exists=True))
+@click.option('--output', '-o', type=click.Path(), help='Output file path')
+@click.option('--format', '-f', 'output_format', type=click.Choice(list(WRITERS)),
+              default='json', show_default=True, help='Output format')
+@click.option('--recursive', '-r', is_flag=True, help='Include images in subdirectories')
+@click.option('--include', multiple=True,
+              help='Only process files matching this glob (repeatable)')
+@click.option('--exclude', multiple=True,
+              help='Skip files and directories matching this glob (repeatable)')
+@click.option('--workers', '-w', type=int, default=1, show_default=True,
+              help='Worker processes')
+def color(
+    image_path: str,
+    output: Optional[str],
+    output_format: str,
+    recursive: bool,
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    workers: int,
+):
+    """Find the dominant colour of images locally, without a provider"""
+    if Path(image_path).is_dir():
+        paths = iter_image_files(
+            image_path, recursive=recursive, include=include, exclude=exclude)
+    else:
+        paths = iter([image_path])
+
+    def chunks():
+        while True:
+            chunk = list(itertools.islice(paths, COLOR_CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    try:
+        with create_writer(output_format, output, COLOR_FIELDS) as writer, \
+                ProcessPoolExecutor(max_workers=workers) as executor:
+            results = _map_bounded(executor, dominant_colors_from_files, chunks(), workers * 2) \
+                if workers > 1 else map(dominant_colors_from_files, chunks())
+            for chunk in results:
+                for path, name, confidence in chunk:
+                    if name is None:
+                        writer.write({"image_path": path, "error": "Unreadable image"})
+                    else:
+                        writer.write({
+                            "image_path": path,
+                            "color": name,
+                            "confidence": round(confidence, 3)
+                        })
+        if output:
+            click.echo(f"Results saved to {output}")
+    except Exception as e:
+        click.echo(f"Color error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@cli.group()
+def index():
+    """Build the local pre-classifier index"""
+    pass
+
+
+@index.command('build')
+@click.argument('results', nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help='Index file (default: PRECLASSIFY_INDEX)')
+def index_build(results: Tuple[str, ...], output: Optional[str]):
+    """Build a pre-classifier index from earlier classification results"""
+    try:
+        # Building an index needs no API key
+        output = output or Settings(OUTFITAI_PROVIDER='mock').PRECLASSIFY_INDEX
+        if not output:
+            raise click.UsageError("--output is required when PRECLASSIFY_INDEX is not set")
+
+        built, skipped = build_index(results)
+        if not len(built):
+            raise click.UsageError("No classified local images found in the results")
+        built.save(Path(output).expanduser())
+        click.echo(f"Indexed {len(built)} images to {output}")
+        if skipped:
+            click.echo(f"Skipped {skipped} unreadable images", err=True)
+    except click.UsageError:
+        raise
+    except Exception as e:
+        click.echo(f"Index build error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@cli.command()
+@click.option('--host', help='Address to listen on (default: SERVE_HOST)')
+@click.option('--port', '-p', type=int, help='Port to listen on (default: SERVE_PORT)')
+@click.option('--max-concurrency', type=int,
+              help='Images classified at once across requests (default: SERVE_MAX_CONCURRENCY)')
+@click.option('--max-queue', type=int,
+              help='Images waiting before requests are rejected with 503 (default: SERVE_MAX_QUEUE)')
+def serve(
+    host: Optional[str],
+    port: Optional[int],
+    max_concurrency: Optional[int],
+    max_queue: Optional[int],
+):
+    """Run the HTTP classification service"""
+    from .server import ClassificationServer
+
+    try:
+        overrides = {}
+        if max_concurrency:
+            overrides['SERVE_MAX_CONCURRENCY'] = max_concurrency
+        if max_queue is not None:
+            overrides['SERVE_MAX_QUEUE'] = max_queue
+        ClassificationServer(Settings(**overrides)).run(host, port)
+    except Exception as e:
+        click.echo(f"Server error: {str(e)}", err=True)
+        raise click.Abort()
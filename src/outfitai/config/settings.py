@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator, FieldValidationInfo
 
@@ -12,14 +12,106 @@ class Settings(BaseSettings):
     # OpenAI specific settings
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_MAX_TOKENS: int = 300
+    OPENAI_BASE_URL: Optional[str] = None
 
     # Gemini specific settings
     GEMINI_MODEL: str = "gemini-2.0-flash"
 
+    # Mock provider settings, for offline testing and benchmarks
+    MOCK_LATENCY: float = 0.1  # mean seconds per request
+    MOCK_LATENCY_DISTRIBUTION: str = "fixed"  # fixed, uniform, exponential or lognormal
+    MOCK_ERROR_RATE: float = 0.0  # fraction of requests failing with a server error
+    MOCK_RATE_LIMIT_RATE: float = 0.0  # fraction of requests rejected with 429
+    MOCK_RETRY_AFTER: float = 1.0  # seconds advertised by injected 429s
+    MOCK_SEED: Optional[int] = None
+
     # Common settings
     BATCH_SIZE: int = 10
     LOG_LEVEL: str = "INFO"
 
+    # Image preprocessing settings
+    IMAGE_RESIZE: bool = True
+    IMAGE_MAX_SIZE: int = 0  # longest side in pixels, 0 uses the provider default
+    IMAGE_FORMAT: str = "jpeg"  # jpeg or webp
+    IMAGE_QUALITY: int = 85
+    IMAGE_EXECUTOR: str = "thread"  # thread or process
+    IMAGE_WORKERS: int = 0  # 0 uses the executor default
+
+    # HTTP settings for image URLs
+    HTTP_POOL_SIZE: int = 100
+    HTTP_POOL_PER_HOST: int = 10
+    HTTP_DNS_TTL: int = 300  # seconds
+    HTTP_KEEPALIVE: float = 30.0  # seconds
+    URL_VALIDATION: str = "get"  # head, get or none
+
+    # Rate limit settings (0 disables the limit)
+    OPENAI_REQUESTS_PER_MINUTE: int = 0
+    OPENAI_TOKENS_PER_MINUTE: int = 0
+    GEMINI_REQUESTS_PER_MINUTE: int = 0
+    GEMINI_TOKENS_PER_MINUTE: int = 0
+
+    # Adaptive concurrency settings
+    ADAPTIVE_CONCURRENCY: bool = True
+    MAX_CONCURRENCY: int = 50
+
+    # Structured output settings
+    STRUCTURED_OUTPUT: bool = True  # providers enforce the response schema
+
+    # Request packing settings
+    PACK_SIZE: int = 1  # images per request, 1 disables packing
+    PACK_LINGER: float = 0.05  # seconds to wait for a pack to fill up
+
+    # Timeout settings (seconds, 0 disables the timeout)
+    FETCH_TIMEOUT: float = 30.0  # downloading or checking one image URL
+    ENCODE_TIMEOUT: float = 30.0  # decoding, resizing and encoding one image
+    PROVIDER_TIMEOUT: float = 60.0  # one provider request
+    JOB_DEADLINE: float = 0  # a whole classify run; unfinished images are cancelled
+
+    # Retry settings
+    RETRY_MAX_ATTEMPTS: int = 5
+    RETRY_BASE_DELAY: float = 0.5
+    RETRY_MAX_DELAY: float = 30.0
+    RETRY_DEADLINE: float = 120.0  # seconds per image, 0 disables the deadline
+    RETRY_VALIDATION_ATTEMPTS: int = 1  # re-asks after an invalid model response
+
+    # Router settings (OUTFITAI_PROVIDER=router)
+    ROUTER_PROVIDERS: str = "openai,gemini"  # comma-separated, in order of preference
+    ROUTER_EWMA_ALPHA: float = 0.2  # weight of the newest latency/error sample
+    ROUTER_ERROR_PENALTY: float = 4.0  # latency multiplier per unit of error rate
+    ROUTER_HEDGE: bool = True
+    ROUTER_HEDGE_QUANTILE: float = 0.95  # latency quantile after which a request is hedged
+    ROUTER_HEDGE_MIN_DELAY: float = 0.5  # seconds to wait at least before hedging
+    ROUTER_RETRY_ATTEMPTS: int = 2  # attempts per provider before failing over
+
+    # Near-duplicate detection settings (requires numpy)
+    NEAR_DUPLICATE_ENABLED: bool = False
+    NEAR_DUPLICATE_METHOD: str = "phash"  # phash or dhash
+    NEAR_DUPLICATE_THRESHOLD: int = 4  # maximum differing bits out of 64
+    NEAR_DUPLICATE_COLOR_DISTANCE: float = 20.0  # maximum Lab distance of mean colours, 0 ignores colour
+
+    # Local pre-classifier settings (requires numpy)
+    PRECLASSIFY_INDEX: Optional[str] = None  # index built with `outfitai index build`
+    PRECLASSIFY_THRESHOLD: float = 0.9  # minimum vote share to skip the provider
+    PRECLASSIFY_NEIGHBORS: int = 5
+    PRECLASSIFY_MAX_DISTANCE: float = 0.5  # feature distance beyond which neighbours do not vote
+
+    # Local colour check settings (requires numpy)
+    COLOR_CHECK: str = "off"  # off, verify or replace
+    COLOR_CHECK_MIN_CONFIDENCE: float = 0.5  # foreground share the local colour needs
+
+    # HTTP service settings (outfitai serve)
+    SERVE_HOST: str = "127.0.0.1"
+    SERVE_PORT: int = 8000
+    SERVE_MAX_CONCURRENCY: int = 32  # images classified at once across requests
+    SERVE_MAX_QUEUE: int = 256  # images waiting for a slot before requests get 503
+    SERVE_MAX_UPLOAD_MB: int = 50  # maximum request body size
+
+    # Result cache settings
+    CACHE_ENABLED: bool = True
+    CACHE_DIR: str = "~/.cache/outfitai"
+    CACHE_TTL: int = 30 * 24 * 60 * 60  # seconds, 0 disables expiry
+    CACHE_MAX_ENTRIES: int = 100_000  # 0 disables the limit
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -29,22 +121,89 @@ class Settings(BaseSettings):
     def validate_provider(cls, v: str, info: FieldValidationInfo) -> str:
         if v == '':
             return 'openai'
-        if v not in ['openai', 'gemini']:
+        if v not in ['openai', 'gemini', 'mock', 'router']:
+            raise ValueError(
+                'OUTFITAI_PROVIDER must be one of "openai", "gemini", "mock" or "router"')
+        return v
+
+    @field_validator('ROUTER_PROVIDERS')
+    @classmethod
+    def validate_router_providers(cls, v: str, info: FieldValidationInfo) -> str:
+        providers = [name.strip() for name in v.split(',') if name.strip()]
+        if not providers or any(name not in ['openai', 'gemini', 'mock'] for name in providers):
+            raise ValueError(
+                'ROUTER_PROVIDERS must list "openai", "gemini" or "mock", separated by commas')
+        if len(set(providers)) != len(providers):
+            raise ValueError('ROUTER_PROVIDERS must not list a provider twice')
+        return ','.join(providers)
+
+    @field_validator('MOCK_LATENCY_DISTRIBUTION')
+    @classmethod
+    def validate_mock_latency_distribution(cls, v: str, info: FieldValidationInfo) -> str:
+        if v not in ['fixed', 'uniform', 'exponential', 'lognormal']:
+            raise ValueError(
+                'MOCK_LATENCY_DISTRIBUTION must be one of "fixed", "uniform", '
+                '"exponential" or "lognormal"')
+        return v
+
+    @field_validator('NEAR_DUPLICATE_METHOD')
+    @classmethod
+    def validate_near_duplicate_method(cls, v: str, info: FieldValidationInfo) -> str:
+        if v not in ['phash', 'dhash']:
             raise ValueError(
-                'OUTFITAI_PROVIDER must be either "openai" or "gemini"')
+                'NEAR_DUPLICATE_METHOD must be either "phash" or "dhash"')
         return v
 
-    def __init__(self, **kwargs):
+    @field_validator('COLOR_CHECK')
+    @classmethod
+    def validate_color_check(cls, v: str, info: FieldValidationInfo) -> str:
+        if v not in ['off', 'verify', 'replace']:
+            raise ValueError(
+                'COLOR_CHECK must be one of "off", "verify" or "replace"')
+        return v
+
+    @field_validator('FETCH_TIMEOUT', 'ENCODE_TIMEOUT', 'PROVIDER_TIMEOUT', 'JOB_DEADLINE')
+    @classmethod
+    def validate_timeout(cls, v: float, info: FieldValidationInfo) -> float:
+        if v < 0:
+            raise ValueError(f'{info.field_name} must not be negative')
+        return v
+
+    @field_validator('IMAGE_EXECUTOR')
+    @classmethod
+    def validate_image_executor(cls, v: str, info: FieldValidationInfo) -> str:
+        if v not in ['thread', 'process']:
+            raise ValueError(
+                'IMAGE_EXECUTOR must be either "thread" or "process"')
+        return v
+
+    @field_validator('URL_VALIDATION')
+    @classmethod
+    def validate_url_validation(cls, v: str, info: FieldValidationInfo) -> str:
+        if v not in ['head', 'get', 'none']:
+            raise ValueError(
+                'URL_VALIDATION must be one of "head", "get" or "none"')
+        return v
+
+    def __init__(self, validate_api_keys: bool = True, **kwargs):
         super().__init__(**kwargs)
-        self._validate_api_keys()
+        if validate_api_keys:
+            self._validate_api_keys()
+
+    def router_providers(self) -> List[str]:
+        """Return the providers the router classifier chooses from."""
+        return self.ROUTER_PROVIDERS.split(',')
 
     def _validate_api_keys(self):
         """Validate that the appropriate API key is available."""
-        if self.OUTFITAI_PROVIDER == 'openai' and not self.OPENAI_API_KEY:
+        providers = [self.OUTFITAI_PROVIDER]
+        if self.OUTFITAI_PROVIDER == 'router':
+            providers = self.router_providers()
+        if 'openai' in providers and not self.OPENAI_API_KEY:
             raise ValueError(
                 "OPENAI_API_KEY must be provided when using OpenAI provider"
             )
-        elif self.OUTFITAI_PROVIDER == 'gemini' and not self.GEMINI_API_KEY:
+        if 'gemini' in providers and not self.GEMINI_API_KEY:
             raise ValueError(
                 "GEMINI_API_KEY must be provided when using Gemini provider"
             )
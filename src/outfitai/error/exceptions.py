@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class ClothingClassifierError(Exception):
     """Base exception for the clothing classifier."""
     pass
@@ -8,11 +11,37 @@ class ImageProcessingError(ClothingClassifierError):
     pass
 
 
+class UnsupportedImageError(ImageProcessingError):
+    """Raised when an image is valid but its format is not supported by the provider."""
+    pass
+
+
 class APIError(ClothingClassifierError):
     """Raised when there's an error with the OpenAI API."""
     pass
 
 
+class RateLimitError(APIError):
+    """Raised when the API provider rejects a request due to rate limits."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TransientAPIError(APIError):
+    """Raised for retryable API failures such as network errors, timeouts and 5xx responses."""
+    pass
+
+
+class StageTimeoutError(TransientAPIError):
+    """Raised when a processing stage such as a download or provider call times out."""
+
+    def __init__(self, message: str, stage: Optional[str] = None):
+        super().__init__(message)
+        self.stage = stage
+
+
 class ValidationError(ClothingClassifierError):
     """Raised when there's an error validating the response."""
     pass
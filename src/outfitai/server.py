@@ -0,0 +1,222 @@
+import asyncio
+import json
+import mimetypes
+from typing import Any, Dict, List, Optional, Union
+
+from aiohttp import web
+
+from .classifier.base import BaseClassifier
+from .classifier.factory import ClassifierFactory
+from .config.settings import Settings
+from .error.exceptions import ClothingClassifierError, ImageProcessingError, ValidationError
+from .utils.image_processor import ImageSource, ImageSourceType
+from .utils.logger import Logger
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class ClassificationServer:
+    """
+    HTTP API around one long-lived classifier.
+
+    The classifier, its provider client, HTTP session, worker pool and result
+    cache are created once at startup and shared by all requests. Images from
+    all requests share SERVE_MAX_CONCURRENCY classification slots; when more
+    than SERVE_MAX_QUEUE images are waiting, new requests are rejected with
+    503 so callers can back off instead of piling up.
+
+    Endpoints:
+        POST /classify          One image as a multipart file, a raw image
+                                body or JSON {"image_url": ...}
+        POST /classify/batch    Several multipart files or JSON
+                                {"image_urls": [...]}; JSON array in input order
+        POST /classify/stream   Same input as /classify/batch; NDJSON lines
+                                written as each image completes
+        GET  /metrics           OpenMetrics text of the classifier metrics
+        GET  /healthz           Liveness and load
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Args:
+            settings: Settings instance; defaults are loaded when None
+        """
+        self.settings = settings or Settings()
+        self.logger = Logger(self.settings).setup_logger(__name__)
+        self.classifier: Optional[BaseClassifier] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application(
+            client_max_size=self.settings.SERVE_MAX_UPLOAD_MB * 1024 * 1024)
+        app.router.add_post("/classify", self.handle_classify)
+        app.router.add_post("/classify/batch", self.handle_batch)
+        app.router.add_post("/classify/stream", self.handle_stream)
+        app.router.add_get("/metrics", self.handle_metrics)
+        app.router.add_get("/healthz", self.handle_health)
+        app.on_startup.append(self._startup)
+        app.on_cleanup.append(self._cleanup)
+        return app
+
+    def run(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
+        """Serve until interrupted."""
+        web.run_app(
+            self.create_app(),
+            host=host or self.settings.SERVE_HOST,
+            port=port or self.settings.SERVE_PORT,
+            print=self.logger.info
+        )
+
+    async def _startup(self, app: web.Application) -> None:
+        self._slots = asyncio.Semaphore(self.settings.SERVE_MAX_CONCURRENCY)
+        self.classifier = ClassifierFactory.create_classifier(self.settings)
+
+    async def _cleanup(self, app: web.Application) -> None:
+        if self.classifier is not None:
+            await self.classifier.aclose()
+
+    async def handle_classify(self, request: web.Request) -> web.Response:
+        sources = await self._read_sources(request)
+        if len(sources) != 1:
+            raise web.HTTPBadRequest(text="Expected exactly one image")
+        self._admit(1)
+
+        try:
+            result = await self._classify(sources[0])
+        except (ImageProcessingError, ValidationError) as e:
+            return web.json_response(
+                {"image_path": sources[0].path, "error": str(e)}, status=422)
+        except ClothingClassifierError as e:
+            return web.json_response(
+                {"image_path": sources[0].path, "error": str(e)}, status=502)
+        finally:
+            self._pending -= 1
+        return web.json_response(result)
+
+    async def handle_batch(self, request: web.Request) -> web.Response:
+        sources = await self._read_sources(request)
+        self._admit(len(sources))
+
+        try:
+            results = await asyncio.gather(*[
+                self._classify_or_error(source) for source in sources
+            ])
+        finally:
+            self._pending -= len(sources)
+        return web.json_response(results)
+
+    async def handle_stream(self, request: web.Request) -> web.StreamResponse:
+        sources = await self._read_sources(request)
+        self._admit(len(sources))
+
+        tasks = [
+            asyncio.ensure_future(self._classify_or_error(source)) for source in sources
+        ]
+        response = web.StreamResponse(
+            headers={"Content-Type": "application/x-ndjson"})
+        try:
+            await response.prepare(request)
+            for next_result in asyncio.as_completed(tasks):
+                line = json.dumps(await next_result, ensure_ascii=False) + "\n"
+                await response.write(line.encode("utf-8"))
+            await response.write_eof()
+        finally:
+            # Client disconnects cancel the images still in progress
+            for task in tasks:
+                task.cancel()
+            self._pending -= len(sources)
+        return response
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.classifier.metrics.to_openmetrics().encode("utf-8"),
+            headers={"Content-Type": OPENMETRICS_CONTENT_TYPE})
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "status": "ok",
+            "provider": self.settings.OUTFITAI_PROVIDER,
+            "pending": self._pending
+        })
+
+    def _admit(self, count: int) -> None:
+        """
+        Reserve room for a request's images; the caller releases it by
+        decrementing `_pending` once the request is done.
+
+        Raises:
+            web.HTTPBadRequest: If the request alone exceeds the capacity
+            web.HTTPServiceUnavailable: If the server is at capacity
+        """
+        limit = self.settings.SERVE_MAX_CONCURRENCY + self.settings.SERVE_MAX_QUEUE
+        if count > limit:
+            raise web.HTTPBadRequest(
+                text=f"Too many images, at most {limit} per request")
+        if self._pending + count > limit:
+            raise web.HTTPServiceUnavailable(
+                text="Server is at capacity, retry later",
+                headers={"Retry-After": "1"})
+        self._pending += count
+
+    async def _classify(self, source: ImageSource) -> Dict[str, Any]:
+        async with self._slots:
+            return await self.classifier.classify_single(source)
+
+    async def _classify_or_error(self, source: ImageSource) -> Dict[str, Any]:
+        try:
+            return await self._classify(source)
+        except Exception as e:
+            self.logger.error(f"Error classifying {source.path}: {str(e)}")
+            return {"image_path": source.path, "error": str(e)}
+
+    async def _read_sources(self, request: web.Request) -> List[ImageSource]:
+        """
+        Turn the request body into image sources.
+
+        Uploaded bytes are attached to the sources, so the classifier works
+        on them in memory without a file path.
+        """
+        content_type = request.content_type
+        try:
+            if content_type == "application/json":
+                return self._sources_from_json(await request.json())
+            if content_type == "multipart/form-data":
+                return await self._sources_from_form(request)
+            if content_type.startswith("image/"):
+                filename = request.query.get("filename") or (
+                    "upload" + (mimetypes.guess_extension(content_type) or ""))
+                return [self._upload(filename, await request.read())]
+        except web.HTTPRequestEntityTooLarge:
+            raise
+        except (ValueError, UnicodeDecodeError) as e:
+            raise web.HTTPBadRequest(text=f"Invalid request body: {str(e)}")
+
+        raise web.HTTPUnsupportedMediaType(
+            text="Send multipart/form-data files, an image body or JSON")
+
+    @staticmethod
+    def _sources_from_json(body: Any) -> List[ImageSource]:
+        if not isinstance(body, dict):
+            raise ValueError("expected a JSON object")
+        urls: Union[List[str], Any] = body.get("image_urls")
+        if urls is None and "image_url" in body:
+            urls = [body["image_url"]]
+        if not isinstance(urls, list) or not urls or not all(isinstance(u, str) for u in urls):
+            raise ValueError("expected 'image_url' or a non-empty 'image_urls' list")
+        return [ImageSource(type=ImageSourceType.URL, path=url) for url in urls]
+
+    async def _sources_from_form(self, request: web.Request) -> List[ImageSource]:
+        form = await request.post()
+        sources = [
+            self._upload(field.filename or "upload", field.file.read())
+            for field in form.values() if isinstance(field, web.FileField)
+        ]
+        if not sources:
+            raise ValueError("no files in form")
+        return sources
+
+    @staticmethod
+    def _upload(filename: str, data: bytes) -> ImageSource:
+        return ImageSource(type=ImageSourceType.LOCAL, path=filename, data=data)
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from ..config.settings import Settings
+
+
+class ResultCache:
+    """Persistent, content-addressed store for classification results."""
+
+    FILENAME = "results.sqlite3"
+    EVICT_INTERVAL = 100
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        ttl: int = 0,
+        max_entries: int = 0
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            ttl: Seconds after which an entry expires (0 disables expiry)
+            max_entries: Maximum number of stored entries (0 disables the limit)
+        """
+        self.path = Path(cache_dir).expanduser() / self.FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_created_at "
+            "ON results (created_at)"
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'ResultCache':
+        """Create a cache configured from settings."""
+        return cls(
+            settings.CACHE_DIR,
+            ttl=settings.CACHE_TTL,
+            max_entries=settings.CACHE_MAX_ENTRIES
+        )
+
+    @staticmethod
+    def make_key(
+        image_digest: str,
+        provider: str,
+        model: str,
+        prompt: str,
+        schema: str = "",
+        structured: bool = False
+    ) -> str:
+        """
+        Build a cache key from the image content and request parameters.
+
+        Args:
+            image_digest: Hex digest identifying the image content
+            provider: API provider name
+            model: Model name
+            prompt: Prompt text sent with the image
+            schema: Serialized result schema holding the allowed values
+            structured: Whether the provider enforces the schema
+
+        Returns:
+            Hex digest uniquely identifying the request
+        """
+        prompt_digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        schema_digest = hashlib.sha256(schema.encode("utf-8")).hexdigest()
+        material = (
+            f"{image_digest}:{provider}:{model}:{prompt_digest}:"
+            f"{schema_digest}:{int(structured)}"
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for key, or None on a miss.
+
+        The lookup is not counted; the caller may still reject the entry
+        and reports the outcome with record_lookup().
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, created_at = row
+            if self.ttl and time.time() - created_at > self.ttl:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+        return json.loads(value)
+
+    def record_lookup(self, hit: bool) -> None:
+        """Count a lookup as a hit or a miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result under key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_INTERVAL == 0:
+                self._evict()
+
+    def evict(self) -> None:
+        """Remove expired entries and trim the cache to max_entries."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.ttl:
+            self._conn.execute(
+                "DELETE FROM results WHERE created_at < ?",
+                (time.time() - self.ttl,)
+            )
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY created_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,248 @@
+import io
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+from ..error.exceptions import ImageProcessingError
+from .phash import require_numpy
+
+# Reference colours in sRGB for each value of the classifier's colour
+# palette; a pixel takes the name of the nearest reference in Lab space
+PALETTE: Dict[str, List[Tuple[int, int, int]]] = {
+    "white": [(245, 245, 245), (225, 222, 215)],
+    "gray": [(128, 128, 128), (180, 180, 180), (85, 85, 88)],
+    "black": [(20, 20, 20), (45, 45, 50)],
+    "red": [(200, 30, 40), (135, 25, 35), (235, 125, 145)],
+    "orange": [(240, 130, 30), (215, 95, 45)],
+    "yellow": [(240, 220, 50), (215, 185, 75)],
+    "green": [(40, 150, 60), (95, 110, 50), (125, 200, 125), (30, 125, 120)],
+    "blue": [(40, 100, 220), (30, 40, 200), (125, 170, 230), (70, 125, 175)],
+    "indigo": [(40, 50, 110), (65, 75, 140), (15, 20, 120)],
+    "purple": [(130, 50, 160), (180, 135, 200)],
+    "other": [(120, 80, 45), (210, 190, 150)],
+}
+COLOR_NAMES = list(PALETTE)
+
+_THUMBNAIL = 32
+# Lab distance from the background colour below which a pixel is background
+_BACKGROUND_DISTANCE = 18.0
+# Below this foreground fraction the garment fills the frame; use every pixel
+_MIN_FOREGROUND = 0.05
+
+_constants: Dict[str, object] = {}
+
+
+def _srgb_table():
+    """Lookup table from 8-bit sRGB values to linear light, built once."""
+    table = _constants.get("srgb")
+    if table is None:
+        np = require_numpy()
+        c = np.arange(256) / 255.0
+        table = _constants["srgb"] = np.where(
+            c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92).astype(np.float32)
+    return table
+
+
+def _lookup_tables():
+    """
+    Lab value and palette colour of every quantized RGB value, built once.
+
+    Pixels are quantized to 5 bits per channel, so per-pixel work in
+    dominant_colors() is reduced to table lookups.
+    """
+    tables = _constants.get("tables")
+    if tables is None:
+        np = require_numpy()
+        levels = (np.arange(32) << 3) + 4
+        rgb = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1)
+        lab = rgb_to_lab(rgb.reshape(-1, 3).astype(np.uint8))
+
+        anchors = rgb_to_lab(np.array(
+            [rgb for name in COLOR_NAMES for rgb in PALETTE[name]], dtype=np.uint8))
+        anchor_names = np.array(
+            [index for index, name in enumerate(COLOR_NAMES) for _ in PALETTE[name]])
+        # Squared distances up to the per-pixel constant |lab|^2
+        distances = (anchors ** 2).sum(axis=1) - 2 * lab @ anchors.T
+        # Published together, as worker threads may build them concurrently
+        tables = _constants["tables"] = (lab, anchor_names[distances.argmin(axis=1)])
+    return tables
+
+
+def rgb_to_lab(rgb):
+    """
+    Convert sRGB pixels to CIE Lab (D65).
+
+    Args:
+        rgb: uint8 array with a last dimension of 3
+
+    Returns:
+        float32 array of the same shape with L, a and b
+    """
+    np = require_numpy()
+    linear = _srgb_table()[rgb]
+    matrix = np.array([
+        [0.4124 / 0.95047, 0.3576 / 0.95047, 0.1805 / 0.95047],
+        [0.2126, 0.7152, 0.0722],
+        [0.0193 / 1.08883, 0.1192 / 1.08883, 0.9505 / 1.08883],
+    ], dtype=np.float32)
+    xyz = linear @ matrix.T
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1).astype(np.float32)
+
+
+def thumbnail(image_bytes: bytes):
+    """
+    Decode an image into a small RGB array and an opacity mask.
+
+    JPEGs are decoded directly at reduced size, which makes decoding the
+    dominant cost only for other formats.
+
+    Returns:
+        Tuple of (uint8 array of shape (32, 32, 3), bool array of shape (32, 32) or None)
+    """
+    np = require_numpy()
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.draft("RGB", (_THUMBNAIL * 2, _THUMBNAIL * 2))
+            img = ImageOps.exif_transpose(img)
+            has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+            img = img.convert("RGBA" if has_alpha else "RGB").resize(
+                (_THUMBNAIL, _THUMBNAIL), Image.BILINEAR)
+            pixels = np.asarray(img)
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to read image colours: {str(e)}") from e
+
+    if has_alpha:
+        return pixels[..., :3], pixels[..., 3] >= 128
+    return pixels, None
+
+
+def _foreground(lab, opaque_masks: Sequence[Optional[object]]):
+    """
+    Mask the foreground pixels of several images.
+
+    Transparent pixels, and pixels close to the median colour of the image
+    border, are background. An image with almost no foreground is taken to
+    be filled by the garment, so all of its pixels count.
+
+    Args:
+        lab: float array of shape (count, 32, 32, 3)
+        opaque_masks: Opacity mask or None per image
+
+    Returns:
+        bool array of shape (count, 32 * 32)
+    """
+    np = require_numpy()
+    count = len(lab)
+    border = np.concatenate([
+        lab[:, 0], lab[:, -1], lab[:, 1:-1, 0], lab[:, 1:-1, -1]], axis=1)
+    background = np.median(border, axis=1)
+    mask = np.linalg.norm(
+        lab - background[:, None, None, :], axis=-1) > _BACKGROUND_DISTANCE
+    for index, opaque in enumerate(opaque_masks):
+        if opaque is not None:
+            mask[index] = opaque
+    mask = mask.reshape(count, -1)
+    sparse = mask.mean(axis=1) < _MIN_FOREGROUND
+    mask[sparse] = True
+    return mask
+
+
+def dominant_colors(
+    thumbnails: Sequence[Tuple[object, Optional[object]]]
+) -> List[Tuple[str, float]]:
+    """
+    Find the dominant palette colour of several images at once.
+
+    Every pixel is named after its nearest palette reference in Lab
+    space. Transparent pixels, and pixels close to the median colour of
+    the image border, are treated as background and ignored. All images are
+    processed in one set of array operations.
+
+    Args:
+        thumbnails: Results of thumbnail()
+
+    Returns:
+        (colour name, share of foreground pixels with that colour) per image
+    """
+    if not thumbnails:
+        return []
+    np = require_numpy()
+    lab_table, name_table = _lookup_tables()
+
+    rgb = np.stack([pixels for pixels, _ in thumbnails]).astype(np.intp) >> 3
+    count, size = len(rgb), _THUMBNAIL * _THUMBNAIL
+    quantized = (rgb[..., 0] << 10) | (rgb[..., 1] << 5) | rgb[..., 2]
+    lab = lab_table[quantized]
+
+    mask = _foreground(lab, [opaque for _, opaque in thumbnails])
+
+    names = name_table[quantized].reshape(count, size)
+    offsets = np.arange(count)[:, None] * len(COLOR_NAMES)
+    votes = np.bincount(
+        (names + offsets).ravel(), weights=mask.ravel(),
+        minlength=count * len(COLOR_NAMES)).reshape(count, len(COLOR_NAMES))
+
+    winners = votes.argmax(axis=1)
+    shares = votes[np.arange(count), winners] / votes.sum(axis=1)
+    return [(COLOR_NAMES[w], float(s)) for w, s in zip(winners, shares)]
+
+
+def dominant_color(image_bytes: bytes) -> Tuple[str, float]:
+    """
+    Find the dominant palette colour of one image.
+
+    Args:
+        image_bytes: Encoded image
+
+    Returns:
+        Tuple of (colour name, share of foreground pixels with that colour)
+    """
+    return dominant_colors([thumbnail(image_bytes)])[0]
+
+
+def color_signature(image_bytes: bytes) -> Tuple[float, float, float]:
+    """
+    Compute the mean Lab colour of the foreground of an image.
+
+    A coarse colour fingerprint that tells colour variants of one product
+    apart, which grayscale perceptual hashes cannot.
+
+    Args:
+        image_bytes: Encoded image
+
+    Returns:
+        Tuple of (L, a, b)
+    """
+    pixels, opaque = thumbnail(image_bytes)
+    lab = rgb_to_lab(pixels)[None]
+    mask = _foreground(lab, [opaque])[0]
+    mean = lab.reshape(-1, 3)[mask].mean(axis=0)
+    return float(mean[0]), float(mean[1]), float(mean[2])
+
+
+def dominant_colors_from_files(paths: Sequence[str]) -> List[Tuple[str, Optional[str], float]]:
+    """
+    Read image files and find their dominant colours in one batch.
+
+    Returns:
+        (path, colour name or None if unreadable, share) per file, in order
+    """
+    thumbnails, readable = [], []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                thumbnails.append(thumbnail(f.read()))
+            readable.append(path)
+        except (OSError, ImageProcessingError):
+            continue
+
+    colors = dict(zip(readable, dominant_colors(thumbnails)))
+    return [
+        (path, *colors[path]) if path in colors else (path, None, 0.0)
+        for path in paths
+    ]
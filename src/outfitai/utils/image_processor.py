@@ -1,16 +1,29 @@
-from PIL import Image, UnidentifiedImageError, ImageFile
+from PIL import Image, ImageOps, UnidentifiedImageError
 from pathlib import Path
+import asyncio
 import base64
-from typing import Optional, Union
-from functools import lru_cache
+import hashlib
+import io
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, Union
+from functools import partial
 from enum import Enum
-from dataclasses import dataclass
-import aiohttp
+from dataclasses import dataclass, field, replace
 from urllib.parse import urlparse
-from google.genai import types
-from ..error.exceptions import ImageProcessingError
+from ..error.exceptions import ImageProcessingError, StageTimeoutError, UnsupportedImageError
 from ..config.settings import Settings
 from .logger import Logger
+from .metrics import Metrics
+from .color import color_signature, dominant_color
+from .phash import image_hash
+from .timeouts import stage_timeout
+from .preclassifier import image_features
+
+# aiohttp and the Gemini SDK are slow to import, so they are only loaded when
+# an image URL is fetched or an image is prepared for Gemini
+if TYPE_CHECKING:
+    import aiohttp
+    from google.genai import types
 
 
 class ImageSourceType(Enum):
@@ -22,27 +35,200 @@ class ImageSourceType(Enum):
 class ImageSource:
     type: ImageSourceType
     path: str
+    # Image bytes, read once and shared by every processing stage
+    data: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+
+def _read_file(image_path: str) -> bytes:
+    """Read local image file bytes"""
+    try:
+        with open(image_path, 'rb') as image_file:
+            return image_file.read()
+    except OSError as e:
+        raise ImageProcessingError(f"Failed to read image: {str(e)}")
+
+
+def _sha256(data: bytes) -> str:
+    """Return the SHA-256 hex digest of bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _verify_image_bytes(data: bytes, verify_data: bool = False) -> None:
+    """
+    Checks that bytes hold a supported, non-animated image.
+
+    Only the image header is parsed; pixel data is not decoded. Corrupt
+    pixel data otherwise surfaces when the image is resized, so without
+    resizing `verify_data` runs Pillow's cheaper integrity check instead.
+
+    Args:
+        data: Encoded image
+        verify_data: Also check the image data for corruption
+
+    Raises:
+        ImageProcessingError: If image validation fails
+    """
+    try:
+        if verify_data:
+            with Image.open(io.BytesIO(data)) as img:
+                img.verify()
+        with Image.open(io.BytesIO(data)) as img:
+            if img.format == "GIF" and getattr(img, "is_animated", False):
+                raise ImageProcessingError("Animated GIF not supported")
+    except ImageProcessingError:
+        raise
+    except UnidentifiedImageError:
+        raise ImageProcessingError("Failed to identify image file")
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to process image: {str(e)}")
+
+
+def _resize_image(
+    image_bytes: bytes,
+    max_size: int,
+    image_format: str,
+    quality: int
+) -> bytes:
+    """
+    Downscale and re-encode an image.
+
+    The image is shrunk so its longest side is at most max_size, rotated
+    according to its EXIF orientation and re-encoded without metadata. JPEG
+    sources are decoded at reduced scale with draft(), which avoids decoding
+    the full-resolution bitmap.
+    """
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            if img.format == "JPEG":
+                img.draft("RGB", (max_size, max_size))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_size, max_size))
+            img = _convert_mode(img, image_format)
+
+            buffer = io.BytesIO()
+            img.save(buffer, format=image_format.upper(), quality=quality)
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to resize image: {str(e)}")
+
+    return buffer.getvalue()
+
+
+def _convert_mode(img: Image.Image, image_format: str) -> Image.Image:
+    """Convert an image to a mode the target format can store."""
+    if img.mode == "P":
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+    has_alpha = img.mode in ("RGBA", "LA")
+    if has_alpha and image_format == "jpeg":
+        # JPEG has no alpha channel; flatten onto white
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    if img.mode not in ("RGB", "L", "RGBA"):
+        return img.convert("RGBA" if has_alpha else "RGB")
+    return img
+
+
+def _near_duplicate_key(image_bytes: bytes, method: str) -> Tuple[int, Tuple[float, float, float]]:
+    """Perceptual hash and colour signature of an image, computed in one worker call."""
+    return image_hash(image_bytes, method), color_signature(image_bytes)
+
+
+def _encode_image(image_bytes: bytes) -> str:
+    """Encode image bytes to base64"""
+    try:
+        return base64.b64encode(image_bytes).decode("utf-8")
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to encode image: {str(e)}")
 
 
 class ImageProcessor:
     SUPPORTED_EXTENSIONS = {".png", ".jpeg", ".jpg", ".webp", ".gif"}
+    # Longest image side each provider actually uses; larger images are
+    # downscaled by the provider anyway. OpenAI "low" detail is 512px and
+    # Gemini tiles images at 768px.
+    PROVIDER_MAX_SIZE = {"openai": 512, "gemini": 768}
+    ENCODE_FORMATS = {"jpeg", "webp"}
 
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(self, settings: Optional[Settings] = None, metrics: Optional[Metrics] = None):
         self.settings = settings or Settings()
+        self.metrics = metrics or Metrics()
         self.logger = Logger(self.settings).setup_logger(__name__)
+        self._executor: Optional[Executor] = None
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """
+        Return the shared HTTP session, creating it on first use.
 
-    async def process_image(self, image_source: Union[str, ImageSource]) -> Union[str, types.Part]:
+        The session keeps connections alive and caches DNS lookups across
+        requests. A new session is created if the event loop changed, e.g.
+        between separate asyncio.run() calls.
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.HTTP_POOL_SIZE,
+                limit_per_host=self.settings.HTTP_POOL_PER_HOST,
+                ttl_dns_cache=self.settings.HTTP_DNS_TTL,
+                keepalive_timeout=self.settings.HTTP_KEEPALIVE
+            )
+            # Bounds each URL request; a hung connection fails the image instead of the batch
+            timeout = aiohttp.ClientTimeout(total=self.settings.FETCH_TIMEOUT or None)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._session_loop = loop
+        return self._session
+
+    def _get_executor(self) -> Executor:
+        """Return the worker pool for image work, creating it on first use."""
+        if self._executor is None:
+            workers = self.settings.IMAGE_WORKERS or None
+            if self.settings.IMAGE_EXECUTOR == "process":
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="outfitai-image")
+        return self._executor
+
+    async def _run_cpu(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run CPU-bound image work in the worker pool.
+
+        func must be a module-level function so it can be sent to a process pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+
+    async def _run_io(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking file I/O in a thread."""
+        executor = self._get_executor() if self.settings.IMAGE_EXECUTOR == "thread" else None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args))
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def aclose(self) -> None:
+        """Close the HTTP session and shut down the worker pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.close()
+
+    async def process_image(self, image_source: Union[str, ImageSource]) -> Union[str, 'types.Part']:
         """
         Process image from either local path or URL.
         Returns:
         - For OpenAI: URL string or base64 encoded string
         - For Gemini: types.Part object containing image bytes
         """
-        # Convert string input to ImageSource
-        if isinstance(image_source, str):
-            source_type = ImageSourceType.URL if self._is_url(
-                image_source) else ImageSourceType.LOCAL
-            image_source = ImageSource(type=source_type, path=image_source)
+        image_source = self.resolve_source(image_source)
 
         # Validate source
         await self._validate_source(image_source)
@@ -52,38 +238,171 @@ class ImageProcessor:
         else:
             return await self._process_for_gemini(image_source)
 
+    def resolve_source(self, image_source: Union[str, ImageSource]) -> ImageSource:
+        """
+        Convert input to a new ImageSource.
+
+        ImageSource inputs are copied so that bytes loaded while processing
+        are not kept alive on the caller's object.
+        """
+        if isinstance(image_source, ImageSource):
+            return replace(image_source)
+        source_type = ImageSourceType.URL if self._is_url(
+            image_source) else ImageSourceType.LOCAL
+        return ImageSource(type=source_type, path=image_source)
+
+    async def content_digest(self, source: ImageSource) -> str:
+        """
+        Return a hex digest identifying the image content.
+
+        Local files are hashed by their bytes; URLs are identified by the URL
+        itself since hashing them would require downloading the image.
+        """
+        if source.type == ImageSourceType.LOCAL:
+            return await self._run_io(_sha256, await self.load(source))
+        return hashlib.sha256(f"url:{source.path}".encode("utf-8")).hexdigest()
+
+    async def near_duplicate_key(self, source: ImageSource) -> Tuple[int, Tuple[float, float, float]]:
+        """
+        Return the perceptual hash and colour signature of a local image.
+
+        The hash uses the NEAR_DUPLICATE_METHOD setting and is computed in
+        grayscale, so the mean Lab colour is returned alongside it to tell
+        colour variants apart. Runs in the worker pool.
+        """
+        image_bytes = await self.load(source)
+        with self.metrics.time("perceptual_hash"):
+            return await self._run_cpu(
+                _near_duplicate_key, image_bytes, self.settings.NEAR_DUPLICATE_METHOD)
+
+    async def image_features(self, source: ImageSource) -> Any:
+        """Return the pre-classifier feature vector of a local image, computed in the worker pool."""
+        image_bytes = await self.load(source)
+        with self.metrics.time("image_features"):
+            return await self._run_cpu(image_features, image_bytes)
+
+    async def dominant_color(self, source: ImageSource) -> Tuple[str, float]:
+        """Return the dominant palette colour of a local image and its share, computed in the worker pool."""
+        image_bytes = await self.load(source)
+        with self.metrics.time("color"):
+            return await self._run_cpu(dominant_color, image_bytes)
+
+    async def load(self, source: ImageSource) -> bytes:
+        """
+        Return the bytes of a local image, reading the file only once.
+
+        The bytes are kept on the source so that hashing, validation and
+        encoding all share a single read.
+        """
+        if source.data is None:
+            with self.metrics.time("load"):
+                source.data = await self._run_io(_read_file, source.path)
+        return source.data
+
     async def _process_for_openai(self, source: ImageSource) -> str:
         """Process image for OpenAI API"""
         if source.type == ImageSourceType.URL:
             return source.path
         else:
-            return f"data:image/jpeg;base64,{self._encode_image(source.path)}"
-
-    async def _process_for_gemini(self, source: ImageSource) -> types.Part:
+            image_bytes = await self.load(source)
+            with self.metrics.time("encode"):
+                data_url = await stage_timeout(
+                    self._encode_data_url(image_bytes, source.path),
+                    self.settings.ENCODE_TIMEOUT, "encode")
+            self.metrics.inc("upload_bytes", len(data_url))
+            return data_url
+
+    async def _encode_data_url(self, image_bytes: bytes, image_path: str) -> str:
+        image_bytes, mime_type = await self._prepare_image(image_bytes, image_path)
+        return f"data:{mime_type};base64,{await self._run_cpu(_encode_image, image_bytes)}"
+
+    async def _process_for_gemini(self, source: ImageSource) -> 'types.Part':
         """Process image for Gemini API"""
+        from google.genai import types
+
         if source.type == ImageSourceType.LOCAL:
-            with open(source.path, 'rb') as image_file:
-                image_bytes = image_file.read()
+            image_bytes = await self.load(source)
         else:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(source.path) as response:
-                    if response.status != 200:
-                        raise ImageProcessingError(
-                            f"Failed to fetch image from URL: {source.path}")
-                    image_bytes = await response.read()
+            image_bytes = await self._fetch_url(source.path)
+            source.data = image_bytes
+
+        with self.metrics.time("encode"):
+            image_bytes, mime_type = await stage_timeout(
+                self._prepare_image(image_bytes, source.path),
+                self.settings.ENCODE_TIMEOUT, "encode")
+        self.metrics.inc("upload_bytes", len(image_bytes))
+        return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
 
-        # Detect mime type from path
-        extension = Path(source.path).suffix.lower()
-        mime_type = f"image/{extension[1:]}" if extension != '.jpg' else "image/jpeg"
+    async def _prepare_image(self, image_bytes: bytes, image_path: str) -> Tuple[bytes, str]:
+        """
+        Downscale and re-encode an image for upload in the worker pool.
 
-        return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+        Args:
+            image_bytes: Original image bytes
+            image_path: Original image path, used for the mime type when
+                preprocessing is disabled
+
+        Returns:
+            Tuple of (image bytes, mime type)
+        """
+        if not self.settings.IMAGE_RESIZE:
+            return image_bytes, self._mime_type(image_path)
+
+        image_format = self.settings.IMAGE_FORMAT.lower()
+        if image_format not in self.ENCODE_FORMATS:
+            raise ImageProcessingError(
+                f"Unsupported IMAGE_FORMAT: {self.settings.IMAGE_FORMAT}")
+        max_size = self.settings.IMAGE_MAX_SIZE or self.PROVIDER_MAX_SIZE.get(
+            self.settings.OUTFITAI_PROVIDER, max(self.PROVIDER_MAX_SIZE.values()))
+
+        image_bytes = await self._run_cpu(
+            _resize_image, image_bytes, max_size, image_format,
+            self.settings.IMAGE_QUALITY)
+        return image_bytes, f"image/{image_format}"
+
+    @staticmethod
+    def _mime_type(image_path: str) -> str:
+        """Detect mime type from path"""
+        extension = Path(image_path).suffix.lower()
+        return f"image/{extension[1:]}" if extension != '.jpg' else "image/jpeg"
+
+    async def _fetch_url(self, url: str) -> bytes:
+        """
+        Download an image, validating the response it arrives in.
+
+        Status and content type are checked on the GET response itself, so
+        no separate HEAD request is needed for downloaded images.
+        """
+        import aiohttp
+
+        try:
+            with self.metrics.time("download"):
+                return await self._download(url)
+        except asyncio.TimeoutError as e:
+            raise StageTimeoutError(
+                f"Fetching {url} timed out after {self.settings.FETCH_TIMEOUT:g}s", "fetch") from e
+        except aiohttp.ClientError as e:
+            raise ImageProcessingError(f"Failed to fetch image: {str(e)}")
+
+    async def _download(self, url: str) -> bytes:
+        async with self._get_session().get(url) as response:
+            if response.status != 200:
+                raise ImageProcessingError(
+                    f"Failed to fetch image from URL: {url}")
+
+            content_type = response.headers.get("content-type", "")
+            if not content_type.startswith("image/"):
+                raise ImageProcessingError(
+                    f"URL does not point to an image: {url}")
+            return await response.read()
 
     async def _validate_source(self, source: ImageSource) -> None:
         """Validate image source"""
         if source.type == ImageSourceType.LOCAL:
-            self._check_image_file(source.path)
+            await self._check_image_file(source)
         else:
-            await self._validate_url(source.path)
+            with self.metrics.time("validate"):
+                await self._validate_url(source.path)
 
     async def _validate_url(self, url: str) -> None:
         """Validate URL and check if it points to a supported image"""
@@ -97,21 +416,43 @@ class ImageProcessor:
             raise ImageProcessingError(
                 f"Unsupported file extension in URL: {ext}")
 
+        if not self._needs_head_request():
+            return
+
         # Validate URL accessibility
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.head(url) as response:
-                    if response.status != 200:
-                        raise ImageProcessingError(
-                            f"Failed to access URL: {url}")
-
-                    # Verify content type
-                    content_type = response.headers.get("content-type", "")
-                    if not content_type.startswith("image/"):
-                        raise ImageProcessingError(
-                            f"URL does not point to an image: {url}")
-            except aiohttp.ClientError as e:
-                raise ImageProcessingError(f"Failed to validate URL: {str(e)}")
+        import aiohttp
+
+        try:
+            async with self._get_session().head(url) as response:
+                if response.status != 200:
+                    raise ImageProcessingError(
+                        f"Failed to access URL: {url}")
+
+                # Verify content type
+                content_type = response.headers.get("content-type", "")
+                if not content_type.startswith("image/"):
+                    raise ImageProcessingError(
+                        f"URL does not point to an image: {url}")
+        except asyncio.TimeoutError as e:
+            raise StageTimeoutError(
+                f"Checking {url} timed out after {self.settings.FETCH_TIMEOUT:g}s", "fetch") from e
+        except aiohttp.ClientError as e:
+            raise ImageProcessingError(f"Failed to validate URL: {str(e)}")
+
+    def _needs_head_request(self) -> bool:
+        """
+        Whether URLs are checked with a separate HEAD request.
+
+        In "get" mode only URLs that are passed through to OpenAI without
+        being downloaded still need one; downloaded images are validated by
+        _fetch_url.
+        """
+        mode = self.settings.URL_VALIDATION
+        if mode == "head":
+            return True
+        if mode == "get":
+            return self.settings.OUTFITAI_PROVIDER == "openai"
+        return False
 
     @staticmethod
     def _is_url(path: str) -> bool:
@@ -122,57 +463,28 @@ class ImageProcessor:
         except ValueError:
             return False
 
-    def _check_image_file(self, image_path: Union[str, Path]) -> None:
+    async def _check_image_file(self, source: ImageSource) -> None:
         """
         Validates if the image file is supported and can be processed.
 
         Args:
-            image_path: Path to the image file
+            source: Local image source
 
         Raises:
+            UnsupportedImageError: If the provider does not accept the format
             ImageProcessingError: If image validation fails
         """
-        image_path = Path(image_path)
+        image_path = Path(source.path)
         if not self._is_supported_extension(image_path):
+            if image_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
+                raise UnsupportedImageError(
+                    f"File extension not supported by {self.settings.OUTFITAI_PROVIDER}")
             raise ImageProcessingError("File extension not supported")
 
-        if self._is_animated_gif(image_path):
-            raise ImageProcessingError("Animated GIF not supported")
-
-        try:
-            self._load_image(image_path)
-        except Exception as e:
-            if isinstance(e, UnidentifiedImageError):
-                raise ImageProcessingError("Failed to identify image file")
-            raise ImageProcessingError(f"Failed to process image: {str(e)}")
-
-    def _encode_image(self, image_path: str) -> str:
-        """Encode local image file to base64"""
-        try:
-            with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode("utf-8")
-        except Exception as e:
-            raise ImageProcessingError(f"Failed to encode image: {str(e)}")
-
-    @lru_cache(maxsize=10)
-    def _load_image(self, image_path: Union[str, Path]) -> ImageFile:
-        """
-        Loads and returns a copy of the image with caching.
-
-        Args:
-            image_path: Path to the image file
-
-        Returns:
-            Copy of the loaded image
-
-        Raises:
-            ImageProcessingError: If image loading fails
-        """
-        try:
-            with Image.open(image_path) as img:
-                return img.copy()
-        except Exception as e:
-            raise ImageProcessingError(f"Failed to load image: {str(e)}")
+        image_bytes = await self.load(source)
+        with self.metrics.time("validate"):
+            await self._run_cpu(
+                _verify_image_bytes, image_bytes, not self.settings.IMAGE_RESIZE)
 
     def _is_supported_extension(self, image_path: Path) -> bool:
         """Checks if the image file extension is supported."""
@@ -180,19 +492,3 @@ class ImageProcessor:
         if extension == ".gif" and not self.settings.OUTFITAI_PROVIDER == "openai":
             return False
         return extension in self.SUPPORTED_EXTENSIONS
-
-    def _is_animated_gif(self, image_path: Path) -> bool:
-        """Checks if the GIF image is animated."""
-        if image_path.suffix.lower() != '.gif':
-            return False
-
-        try:
-            img = self._load_image(image_path)
-            try:
-                img.seek(1)
-                return True
-            except EOFError:
-                return False
-        except Exception as e:
-            raise ImageProcessingError(
-                f"Error checking GIF animation: {str(e)}")
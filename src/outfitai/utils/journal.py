@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+class JobJournal:
+    """Append-only JSONL record of the images completed by a batch job."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Journal file path
+        """
+        self.path = Path(path)
+        self._file = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read successfully classified images from the journal.
+
+        Failed images are left out so that they are retried on resume. A
+        truncated last line from an interrupted write is ignored, and
+        removed when the journal is reopened for resuming.
+
+        Returns:
+            Mapping of image path to classification result
+        """
+        completed = {}
+        if not self.path.exists():
+            return completed
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "image_path" in result and "error" not in result:
+                    completed[result["image_path"]] = result
+        return completed
+
+    def open(self, resume: bool = False) -> 'JobJournal':
+        """
+        Open the journal for writing.
+
+        Args:
+            resume: Append to an existing journal instead of starting over
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._drop_partial_line()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        return self
+
+    def _drop_partial_line(self, chunk_size: int = 4096) -> None:
+        """Cut off a truncated last line, so that appended results start on a line of their own."""
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, 2)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+            # Search backwards for the end of the last complete line
+            while end > 0:
+                start = max(0, end - chunk_size)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    f.truncate(start + newline + 1)
+                    return
+                end = start
+            f.truncate(0)
+
+    def record(self, result: Dict[str, Any]) -> None:
+        """Append a result and flush it to disk."""
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Delete the journal file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'JobJournal':
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
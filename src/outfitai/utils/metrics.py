@@ -0,0 +1,188 @@
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class StageTimer:
+    """Duration histogram of one processing stage."""
+
+    # Upper bounds in seconds, covering file reads up to slow provider calls
+    BUCKETS: Tuple[float, ...] = (
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: List[int] = [0] * (len(self.BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """
+    Per-stage timings and counters of a classifier.
+
+    Stages are timed with `time()` around the hot-path steps (image loading,
+    validation, encoding, the provider call, response parsing and
+    validation); counters track bytes uploaded, token usage, retries and
+    cache hits. Everything runs on the event loop thread, so no locking is
+    needed.
+    """
+
+    COUNTERS = {
+        "images": "Images classified",
+        "images_failed": "Images that failed classification",
+        "cancelled": "Images cancelled by the job deadline",
+        "not_started": "Images not started before the job deadline (counted up to a limit)",
+        "cache_hits": "Results served from the result cache",
+        "cache_misses": "Result cache lookups without a usable entry",
+        "coalesced": "Images that shared a provider call with a concurrent duplicate",
+        "near_duplicates": "Images that reused the result of a near-duplicate image",
+        "preclassified": "Images answered by the local pre-classifier without a provider call",
+        "color_mismatches": "Images whose local dominant colour disagreed with the provider",
+        "requests": "Provider requests sent",
+        "retries": "Provider requests retried",
+        "hedged": "Router requests hedged to a second provider",
+        "failovers": "Router requests failed over to another provider",
+        "upload_bytes": "Encoded image bytes sent to the provider",
+        "input_tokens": "Input tokens reported by the provider",
+        "output_tokens": "Output tokens reported by the provider",
+    }
+
+    def __init__(self):
+        self.stages: Dict[str, StageTimer] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(self.COUNTERS, 0)
+        self.started = time.monotonic()
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one observation of `stage`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        timer = self.stages.get(stage)
+        if timer is None:
+            timer = self.stages[stage] = StageTimer()
+        timer.observe(seconds)
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_usage(self, input_tokens: Any, output_tokens: Any) -> None:
+        """Add token usage from a provider response, ignoring missing values."""
+        if isinstance(input_tokens, int):
+            self.inc("input_tokens", input_tokens)
+        if isinstance(output_tokens, int):
+            self.inc("output_tokens", output_tokens)
+
+    def tokens_per_request(self) -> Dict[str, float]:
+        """Return the mean input and output tokens of a provider request."""
+        requests = self.counters.get("requests", 0)
+        return {
+            "input": self.counters.get("input_tokens", 0) / requests if requests else 0.0,
+            "output": self.counters.get("output_tokens", 0) / requests if requests else 0.0,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the collected metrics as plain data.
+
+        Returns:
+            Dictionary with elapsed seconds, counters, mean tokens per
+            request and per-stage count, total, mean, p95 and max seconds
+        """
+        return {
+            "elapsed_seconds": time.monotonic() - self.started,
+            "counters": dict(self.counters),
+            "tokens_per_request": self.tokens_per_request(),
+            "stages": {
+                stage: {
+                    "count": timer.count,
+                    "total_seconds": timer.total,
+                    "mean_seconds": timer.total / timer.count if timer.count else 0.0,
+                    "p95_seconds": timer.quantile(0.95),
+                    "max_seconds": timer.max,
+                }
+                for stage, timer in self.stages.items()
+            }
+        }
+
+    def format_summary(self) -> str:
+        """Render the summary as a human-readable table."""
+        lines = [f"{'stage':<18} {'count':>7} {'total s':>9} {'mean ms':>9} "
+                 f"{'p95 ms':>9} {'max ms':>9}"]
+        for stage, timer in sorted(self.stages.items(), key=lambda item: -item[1].total):
+            mean = timer.total / timer.count if timer.count else 0.0
+            lines.append(
+                f"{stage:<18} {timer.count:>7} {timer.total:>9.2f} {mean * 1000:>9.1f} "
+                f"{timer.quantile(0.95) * 1000:>9.1f} {timer.max * 1000:>9.1f}")
+        lines.append(", ".join(
+            f"{name}={value}" for name, value in self.counters.items()))
+        if self.counters.get("input_tokens") or self.counters.get("output_tokens"):
+            tokens = self.tokens_per_request()
+            lines.append(
+                f"tokens per request: {tokens['input']:.1f} input, {tokens['output']:.1f} output")
+        return "\n".join(lines)
+
+    def to_openmetrics(self, prefix: str = "outfitai") -> str:
+        """
+        Render the metrics in the OpenMetrics text format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Exposition text ending with "# EOF"
+        """
+        lines = []
+        for name, help_text in self.COUNTERS.items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"# HELP {metric} {help_text}.")
+            lines.append(f"{metric}_total {self.counters.get(name, 0)}")
+
+        metric = f"{prefix}_stage_duration_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        lines.append(f"# UNIT {metric} seconds")
+        lines.append(f"# HELP {metric} Time spent in each processing stage.")
+        for stage, timer in sorted(self.stages.items()):
+            cumulative = 0
+            for bound, count in zip(StageTimer.BUCKETS + (float("inf"),), timer.buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {timer.count}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {timer.total}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path: str, prefix: str = "outfitai") -> None:
+        """Write the OpenMetrics text to a file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_openmetrics(prefix))
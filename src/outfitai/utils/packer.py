@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestPacker(Generic[T]):
+    """
+    Collects concurrent single-item requests into packed requests.
+
+    Items submitted while a pack is open are sent together once the pack
+    holds `size` items or `linger` seconds have passed since its first item.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[T]], Awaitable[List[Any]]],
+        size: int,
+        linger: float = 0.05
+    ):
+        """
+        Args:
+            send: Coroutine function sending a pack and returning one element
+                per item, in order
+            size: Maximum number of items per pack
+            linger: Seconds to wait for a pack to fill up
+        """
+        self.send = send
+        self.size = size
+        self.linger = linger
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: T) -> Any:
+        """
+        Add an item to the open pack and wait for its element of the response.
+
+        Returns:
+            The response element for the item, or None if the item ended up
+            alone in its pack and should be sent on its own
+
+        Raises:
+            Exception: Whatever the packed request raised
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.linger, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pack, self._pending = self._pending, []
+        if len(pack) == 1:
+            _, future = pack[0]
+            if not future.done():
+                future.set_result(None)
+        elif pack:
+            asyncio.ensure_future(self._send_pack(pack))
+
+    async def _send_pack(self, pack: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            elements = await self.send([item for item, _ in pack])
+        except Exception as e:
+            for _, future in pack:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, (_, future) in enumerate(pack):
+            if not future.done():
+                future.set_result(
+                    elements[index] if index < len(elements) else None)
@@ -0,0 +1,190 @@
+import io
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from PIL import Image, ImageOps
+
+from ..error.exceptions import ImageProcessingError
+
+T = TypeVar("T")
+
+HASH_METHODS = ("phash", "dhash")
+
+_dct_matrices: Dict[int, Any] = {}
+
+
+def require_numpy():
+    """Import numpy, raising a helpful ImportError when it is not installed."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Near-duplicate detection, pre-classification and colour checks "
+            "require numpy: pip install 'outfitai[phash]'"
+        ) from e
+    return numpy
+
+
+def _grayscale(image_bytes: bytes, size: Tuple[int, int]):
+    """Decode an image into a small grayscale array of the given (width, height)."""
+    np = require_numpy()
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # JPEGs can be decoded directly at a fraction of their size
+            img.draft("L", (size[0] * 4, size[1] * 4))
+            img = ImageOps.exif_transpose(img).convert("L")
+            img = img.resize(size, Image.LANCZOS)
+            return np.asarray(img, dtype=np.float64)
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to hash image: {str(e)}") from e
+
+
+def _to_int(bits) -> int:
+    np = require_numpy()
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def _dct_matrix(n: int):
+    """Orthonormal DCT-II matrix, so that dct(x) == matrix @ x."""
+    matrix = _dct_matrices.get(n)
+    if matrix is None:
+        np = require_numpy()
+        k = np.arange(n)[:, None]
+        x = np.arange(n)[None, :]
+        matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+        matrix[0] /= np.sqrt(2)
+        _dct_matrices[n] = matrix
+    return matrix
+
+
+def phash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """
+    Compute a DCT-based perceptual hash.
+
+    The image is reduced to 4*hash_size square grayscale pixels, transformed
+    with a 2D DCT, and the lowest hash_size x hash_size frequencies are
+    compared with their median. Robust to re-encoding, resizing and small
+    colour changes.
+
+    Args:
+        image_bytes: Encoded image
+        hash_size: Side of the frequency block; the hash has hash_size**2 bits
+
+    Returns:
+        Hash as an integer
+    """
+    np = require_numpy()
+    size = hash_size * 4
+    pixels = _grayscale(image_bytes, (size, size))
+    matrix = _dct_matrix(size)
+    low = (matrix @ pixels @ matrix.T)[:hash_size, :hash_size]
+    return _to_int(low > np.median(low))
+
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """
+    Compute a difference hash from horizontal brightness gradients.
+
+    Cheaper than phash, but less tolerant of crops.
+
+    Args:
+        image_bytes: Encoded image
+        hash_size: The hash has hash_size**2 bits
+
+    Returns:
+        Hash as an integer
+    """
+    pixels = _grayscale(image_bytes, (hash_size + 1, hash_size))
+    return _to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def image_hash(image_bytes: bytes, method: str = "phash") -> int:
+    """Compute the perceptual hash of an image with one of HASH_METHODS."""
+    if method == "dhash":
+        return dhash(image_bytes)
+    return phash(image_bytes)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class BKTree(Generic[T]):
+    """
+    Burkhard-Keller tree over hashes with the Hamming distance.
+
+    Lookups of all hashes within a small distance only visit the subtrees
+    whose edge distance can satisfy the triangle inequality, instead of
+    comparing against every stored hash.
+    """
+
+    def __init__(self):
+        # Node: [hash, [values], {distance: child node}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, hash_value: int, value: T) -> None:
+        """Store a value under a hash; values with an identical hash are all kept."""
+        self._size += 1
+        node = [hash_value, [value], {}]
+        if self._root is None:
+            self._root = node
+            return
+
+        current = self._root
+        while True:
+            distance = hamming(hash_value, current[0])
+            if distance == 0:
+                current[1].append(value)
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, hash_value: int, max_distance: int) -> List[Tuple[int, T]]:
+        """
+        Find stored values within a Hamming distance.
+
+        Returns:
+            List of (distance, value), nearest first
+        """
+        if self._root is None:
+            return []
+
+        matches = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(hash_value, node[0])
+            if distance <= max_distance:
+                matches.extend((distance, value) for value in node[1])
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def nearest(
+        self,
+        hash_value: int,
+        max_distance: int,
+        accept: Optional[Callable[[T], bool]] = None
+    ) -> Optional[T]:
+        """
+        Return the value of the nearest stored hash within max_distance, if any.
+
+        Args:
+            hash_value: Hash to look up
+            max_distance: Maximum Hamming distance
+            accept: Optional predicate that a value must also satisfy
+        """
+        for _, value in self.search(hash_value, max_distance):
+            if accept is None or accept(value):
+                return value
+        return None
@@ -0,0 +1,249 @@
+import csv
+import io
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image, ImageOps
+
+from ..error.exceptions import ImageProcessingError
+from .phash import require_numpy
+
+# Fields predicted from the nearest neighbours; together they form a full
+# classification result
+FIELDS = ("color", "category", "dress_code", "season")
+
+_THUMBNAIL = 32
+_HUE_BINS, _SATURATION_BINS, _VALUE_BINS = 12, 3, 3
+_SHAPE_SIZE = 8
+# Relative weight of the grayscale layout against the colour histogram
+_SHAPE_WEIGHT = 0.5
+
+
+def image_features(image_bytes: bytes):
+    """
+    Compute a compact feature vector for nearest-neighbour lookups.
+
+    The vector joins a centre-weighted HSV colour histogram, which mostly
+    decides the colour, with a tiny grayscale layout of the image, which
+    separates coarse shapes such as shoes, bags and tops. Both parts are
+    unit-normalized, so distances between vectors range from 0 to 2.
+
+    Args:
+        image_bytes: Encoded image
+
+    Returns:
+        1D float32 numpy array
+    """
+    np = require_numpy()
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            img.draft("RGB", (_THUMBNAIL * 4, _THUMBNAIL * 4))
+            img = ImageOps.exif_transpose(img).convert("RGB")
+            img = img.resize((_THUMBNAIL, _THUMBNAIL), Image.BILINEAR)
+    except Exception as e:
+        raise ImageProcessingError(f"Failed to read image features: {str(e)}") from e
+
+    hsv = np.asarray(img.convert("HSV"), dtype=np.int64)
+    bins = (
+        hsv[..., 0] * _HUE_BINS // 256 * _SATURATION_BINS * _VALUE_BINS
+        + hsv[..., 1] * _SATURATION_BINS // 256 * _VALUE_BINS
+        + hsv[..., 2] * _VALUE_BINS // 256
+    )
+    # Garments are usually centred, backgrounds fill the border
+    axis = np.linspace(-1, 1, _THUMBNAIL)
+    weights = np.exp(-(axis[:, None] ** 2 + axis[None, :] ** 2))
+    histogram = np.bincount(
+        bins.ravel(), weights=weights.ravel(),
+        minlength=_HUE_BINS * _SATURATION_BINS * _VALUE_BINS)
+    # Square roots of a normalized histogram have unit length (Hellinger)
+    histogram = np.sqrt(histogram / histogram.sum())
+
+    shape = np.asarray(
+        img.convert("L").resize((_SHAPE_SIZE, _SHAPE_SIZE), Image.BILINEAR),
+        dtype=np.float64).ravel()
+    shape -= shape.mean()
+    norm = np.linalg.norm(shape)
+    if norm:
+        shape /= norm
+
+    features = np.concatenate([histogram, _SHAPE_WEIGHT * shape])
+    return (features / np.sqrt(1 + _SHAPE_WEIGHT ** 2)).astype(np.float32)
+
+
+def read_results(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read classification results written by `outfitai classify`.
+
+    Supports JSON arrays, NDJSON (including batch journals) and CSV output.
+    Failed images and incomplete results are skipped.
+
+    Args:
+        path: Result file
+
+    Yields:
+        Classification results with an image_path
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            rows = csv.DictReader(f)
+            results = (
+                {**row, "season": [s for s in (row.get("season") or "").split(";") if s]}
+                for row in rows
+            )
+        else:
+            text = f.read()
+            if text.lstrip().startswith("["):
+                results = iter(json.loads(text))
+            else:
+                results = (json.loads(line) for line in text.splitlines() if line.strip())
+
+        for result in results:
+            if not isinstance(result, dict) or result.get("error"):
+                continue
+            if result.get("image_path") and all(result.get(key) for key in FIELDS):
+                yield result
+
+
+class PreclassifierIndex:
+    """
+    Nearest-neighbour index over features of previously classified images.
+
+    Predicts every result field by a distance-weighted vote among the
+    nearest labelled images. The confidence of a prediction is the smallest
+    winning vote share over all fields, with neighbours farther than the
+    maximum distance counted as disagreeing. Lookups are brute force, which
+    stays in the low milliseconds for catalogs of tens of thousands of
+    images.
+    """
+
+    def __init__(self, features=None, labels: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            features: 2D array with one feature vector per labelled image
+            labels: Classification results, without image_path, in the same order
+        """
+        self._np = require_numpy()
+        self.labels = labels or []
+        if features is None:
+            features = self._np.empty((0, 0), dtype=self._np.float32)
+        self.features = features
+        self._pending: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def add(self, features, result: Dict[str, Any]) -> None:
+        """Add the features of a classified image with its result."""
+        self._pending.append(features)
+        self.labels.append({key: result[key] for key in FIELDS})
+
+    def _matrix(self):
+        if self._pending:
+            parts = [self.features] if len(self.features) else []
+            self.features = self._np.vstack(parts + [self._np.stack(self._pending)])
+            self._pending = []
+        return self.features
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the index as a compressed numpy archive."""
+        with open(path, "wb") as f:
+            self._np.savez_compressed(
+                f, features=self._matrix(), labels=self._np.array(json.dumps(self.labels)))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'PreclassifierIndex':
+        """Load an index saved with save()."""
+        np = require_numpy()
+        with np.load(Path(path).expanduser()) as archive:
+            return cls(archive["features"], json.loads(str(archive["labels"])))
+
+    def predict(
+        self,
+        features,
+        neighbors: int = 5,
+        max_distance: float = 0.5
+    ) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Predict a classification result from the nearest labelled images.
+
+        Args:
+            features: Feature vector from image_features()
+            neighbors: Number of nearest images that vote
+            max_distance: Neighbours farther than this do not vote
+
+        Returns:
+            Tuple of (predicted result or None, confidence from 0 to 1)
+        """
+        np = self._np
+        matrix = self._matrix()
+        if not len(matrix):
+            return None, 0.0
+
+        distances = np.linalg.norm(matrix - features, axis=1)
+        k = min(neighbors, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        weights = 1.0 / (distances[nearest] + 1e-6)
+        total = weights.sum()
+        voters = [
+            (self.labels[i], weight)
+            for i, weight in zip(nearest, weights) if distances[i] <= max_distance
+        ]
+        if not voters:
+            return None, 0.0
+
+        result: Dict[str, Any] = {}
+        confidence = 1.0
+        for key in FIELDS:
+            votes: Dict[Any, float] = {}
+            for label, weight in voters:
+                value = label[key]
+                value = tuple(sorted(value)) if isinstance(value, list) else value
+                votes[value] = votes.get(value, 0.0) + weight
+            value, weight = max(votes.items(), key=lambda item: item[1])
+            result[key] = list(value) if isinstance(value, tuple) else value
+            confidence = min(confidence, float(weight / total))
+        return result, confidence
+
+
+def _labelled_features(result: Dict[str, Any]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+    try:
+        with open(result["image_path"], "rb") as f:
+            return image_features(f.read()), result
+    except (OSError, ImageProcessingError):
+        return None
+
+
+def build_index(
+    result_files: Iterable[Union[str, Path]],
+    workers: Optional[int] = None
+) -> Tuple[PreclassifierIndex, int]:
+    """
+    Build an index from result files of earlier classification runs.
+
+    Each classified local image is read again to compute its features. When
+    an image appears in several files, the last result wins.
+
+    Args:
+        result_files: Files written by `outfitai classify`
+        workers: Number of threads computing features
+
+    Returns:
+        Tuple of (index, number of results skipped because the image is unreadable)
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for path in result_files:
+        for result in read_results(path):
+            results[result["image_path"]] = result
+
+    index = PreclassifierIndex()
+    skipped = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in executor.map(_labelled_features, results.values()):
+            if item is None:
+                skipped += 1
+            else:
+                index.add(*item)
+    return index, skipped
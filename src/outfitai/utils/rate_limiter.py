@@ -0,0 +1,236 @@
+import asyncio
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from ..config.settings import Settings
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse a rate limit reset duration such as "1s", "6m0s" or "20ms".
+
+    Returns:
+        Duration in seconds, or None if the value cannot be parsed
+    """
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Extract the retry delay advertised by a provider response.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds to wait before retrying, or None if not advertised
+    """
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10):
+        """
+        Args:
+            per_minute: Tokens added per minute
+            burst_seconds: Seconds worth of tokens that may be spent at once
+        """
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, going into debt if necessary.
+
+        Returns:
+            Seconds the caller must wait before the reservation is honoured
+        """
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        self.tokens -= min(amount, self.capacity)
+        return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    """Client-side limiter for requests and tokens per minute."""
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Args:
+            requests_per_minute: Request limit (0 disables it)
+            tokens_per_minute: Token limit (0 disables it)
+        """
+        self.requests = TokenBucket(
+            requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(
+            tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'RateLimiter':
+        """Create a limiter using the limits of the configured provider."""
+        prefix = settings.OUTFITAI_PROVIDER.upper()
+        return cls(
+            requests_per_minute=getattr(
+                settings, f"{prefix}_REQUESTS_PER_MINUTE", 0),
+            tokens_per_minute=getattr(
+                settings, f"{prefix}_TOKENS_PER_MINUTE", 0)
+        )
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until a request using the given number of tokens may be sent.
+
+        Args:
+            tokens: Estimated tokens consumed by the request
+        """
+        wait = self._paused_until - time.monotonic()
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds."""
+        self._paused_until = max(
+            self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> bool:
+        """
+        Apply x-ratelimit-* headers from a provider response.
+
+        When the provider reports an exhausted request or token budget, all
+        requests are paused until the advertised reset time.
+
+        Returns:
+            True if the headers signalled that a limit was exhausted
+        """
+        if not headers:
+            return False
+
+        exhausted = False
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                if float(remaining) > 0:
+                    continue
+            except ValueError:
+                continue
+
+            exhausted = True
+            reset = parse_duration(
+                headers.get(f"x-ratelimit-reset-{kind}", "") or "")
+            if reset:
+                self.pause(reset)
+        return exhausted
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller for the number of requests kept in flight.
+
+    The limit grows by roughly one for every window of successful requests
+    and is cut multiplicatively when the provider throttles.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            initial: Starting concurrency limit
+            minimum: Lowest allowed limit
+            maximum: Highest allowed limit (defaults to initial)
+            decrease_factor: Multiplier applied on throttling
+            cooldown: Seconds during which further throttles are ignored
+            enabled: If False, the limit stays fixed at initial
+        """
+        self.minimum = minimum
+        self.maximum = max(initial, maximum or initial)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.limit = float(initial)
+        self._last_decrease = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'AdaptiveConcurrency':
+        """Create a controller starting at BATCH_SIZE."""
+        return cls(
+            initial=settings.BATCH_SIZE,
+            maximum=settings.MAX_CONCURRENCY,
+            enabled=settings.ADAPTIVE_CONCURRENCY
+        )
+
+    @property
+    def value(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.minimum, int(self.limit))
+
+    def on_success(self) -> None:
+        """Additively increase the limit after a successful request."""
+        if self.enabled:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_throttle(self) -> None:
+        """Multiplicatively decrease the limit after a throttled request."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        # Requests that were already in flight hit the same limit; only
+        # react once per cooldown period.
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
@@ -0,0 +1,60 @@
+import random
+from dataclasses import dataclass, asdict
+from typing import Dict, Union
+from ..config.settings import Settings
+
+
+@dataclass
+class RetryPolicy:
+    """Limits and backoff parameters for retrying failed classifications."""
+
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    deadline: float = 120.0
+    validation_retries: int = 1
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'RetryPolicy':
+        """Create a retry policy from settings."""
+        return cls(
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            base_delay=settings.RETRY_BASE_DELAY,
+            max_delay=settings.RETRY_MAX_DELAY,
+            deadline=settings.RETRY_DEADLINE,
+            validation_retries=settings.RETRY_VALIDATION_ATTEMPTS
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay before the next attempt, using exponential backoff
+        with full jitter.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+@dataclass
+class RetryStats:
+    """Counters describing how much work retries caused."""
+
+    retries: int = 0
+    recovered: int = 0
+    exhausted: int = 0
+    wasted_seconds: float = 0.0
+
+    def record_recovered(self, wasted_seconds: float) -> None:
+        """Record an image that succeeded after failed attempts."""
+        self.recovered += 1
+        self.wasted_seconds += wasted_seconds
+
+    def record_exhausted(self, wasted_seconds: float) -> None:
+        """Record an image that still failed after retrying."""
+        self.exhausted += 1
+        self.wasted_seconds += wasted_seconds
+
+    def as_dict(self) -> Dict[str, Union[int, float]]:
+        return asdict(self)
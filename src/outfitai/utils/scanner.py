@@ -0,0 +1,109 @@
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Union
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp', '.gif']
+
+_SIZE_UNITS = {
+    "": 1, "B": 1,
+    "K": 1024, "KB": 1024,
+    "M": 1024 ** 2, "MB": 1024 ** 2,
+    "G": 1024 ** 3, "GB": 1024 ** 3,
+}
+
+
+def parse_size(value: Union[str, int]) -> int:
+    """
+    Parse a file size such as "500", "200KB", "5MB" or "5M" into bytes.
+
+    Raises:
+        ValueError: If the value is not a valid size
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", value.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def _matches(relative_path: str, patterns: Sequence[str]) -> bool:
+    """Match a path relative to the scan root, or its file name, against glob patterns."""
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(
+        fnmatch.fnmatchcase(relative_path, pattern) or fnmatch.fnmatchcase(name, pattern)
+        for pattern in patterns
+    )
+
+
+def iter_image_files(
+    directory: Union[str, Path],
+    recursive: bool = False,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    min_size: int = 0,
+    max_size: int = 0
+) -> Iterator[str]:
+    """
+    Yield paths of the image files in a directory as they are found.
+
+    Directories are read with os.scandir and never listed up front, so
+    classification can start on the first files of a huge tree while the
+    rest is still being scanned. Patterns are shell globs matched against
+    the path relative to `directory` (with "/" separators) or the file name.
+
+    Args:
+        directory: Directory to scan
+        recursive: Also scan subdirectories; symlinked directories are not followed
+        include: Only yield files matching one of these patterns
+        exclude: Skip files and subdirectories matching one of these patterns
+        min_size: Skip files smaller than this many bytes
+        max_size: Skip files larger than this many bytes, 0 for no limit
+
+    Yields:
+        Image file paths as strings
+    """
+    check_size = min_size > 0 or max_size > 0
+    pending = [(str(Path(directory)), "")]
+
+    while pending:
+        path, prefix = pending.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            if not prefix:
+                raise
+            # Unreadable subdirectories are skipped
+            continue
+
+        with entries:
+            subdirectories = []
+            for entry in entries:
+                relative_path = prefix + entry.name
+                if exclude and _matches(relative_path, exclude):
+                    continue
+
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            subdirectories.append((entry.path, relative_path + "/"))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                        continue
+                    if include and not _matches(relative_path, include):
+                        continue
+                    if check_size:
+                        size = entry.stat().st_size
+                        if size < min_size or (max_size and size > max_size):
+                            continue
+                except OSError:
+                    continue
+
+                yield entry.path
+
+        # Visit subdirectories depth-first in the order they were listed
+        pending.extend(reversed(subdirectories))
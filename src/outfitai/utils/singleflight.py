@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs wait for the same task instead of starting their own. The
+    task is cancelled only when every caller waiting for it was cancelled.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `call` for `key`, or join the call already running for it.
+
+        Args:
+            key: Identity of the work
+            call: Coroutine function doing the work
+
+        Returns:
+            Tuple of (result, whether the result was shared with an earlier caller)
+
+        Raises:
+            Exception: Whatever the call raised, for every caller sharing it
+        """
+        entry = self._calls.get(key)
+        shared = entry is not None
+        if entry is None:
+            entry = _Call(asyncio.ensure_future(call()))
+            self._calls[key] = entry
+            entry.task.add_done_callback(lambda _: self._forget(key, entry))
+
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task), shared
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                entry.task.cancel()
+
+    def _forget(self, key: Hashable, entry: _Call) -> None:
+        if self._calls.get(key) is entry:
+            del self._calls[key]
@@ -0,0 +1,32 @@
+import asyncio
+from typing import Awaitable, TypeVar
+
+from ..error.exceptions import StageTimeoutError
+
+T = TypeVar("T")
+
+
+async def stage_timeout(awaitable: Awaitable[T], seconds: float, stage: str) -> T:
+    """
+    Await one processing stage, cancelling it when it takes too long.
+
+    Work handed to a worker pool keeps running in its worker after a
+    timeout, but the caller is released.
+
+    Args:
+        awaitable: Stage to await
+        seconds: Timeout in seconds, 0 for none
+        stage: Stage name used in the error message
+
+    Returns:
+        Result of the awaitable
+
+    Raises:
+        StageTimeoutError: If the stage did not finish in time
+    """
+    if not seconds:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, seconds)
+    except asyncio.TimeoutError as e:
+        raise StageTimeoutError(f"{stage} timed out after {seconds:g}s", stage) from e
@@ -0,0 +1,174 @@
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple, Union
+
+
+class ResultWriter(ABC):
+    """
+    Base class for classification result sinks.
+
+    A stream can be given as a function that opens it, so that an output
+    file is only created, or overwritten, once there is something to write.
+    """
+
+    def __init__(self, stream: Union[TextIO, Callable[[], TextIO]], close_stream: bool = False):
+        """
+        Args:
+            stream: Text stream to write to, or a function opening it on first use
+            close_stream: Whether close() should also close the stream
+        """
+        self._stream: Optional[TextIO] = None if callable(stream) else stream
+        self._open = stream if callable(stream) else None
+        self.close_stream = close_stream
+
+    @property
+    def stream(self) -> TextIO:
+        if self._stream is None:
+            self._stream = self._open()
+        return self._stream
+
+    @abstractmethod
+    def write(self, result: Dict[str, Any], index: Optional[int] = None) -> None:
+        """
+        Write one classification result.
+
+        Args:
+            result: Classification result
+            index: Optional input index of the image
+        """
+        pass
+
+    def close(self, failed: bool = False) -> None:
+        """
+        Flush pending output and release the stream.
+
+        Args:
+            failed: Whether the run failed; a stream that was never
+                written to is then left unopened
+        """
+        if failed and self._stream is None:
+            return
+        self.stream.flush()
+        if self.close_stream:
+            self.stream.close()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        self.close(failed=exc_type is not None)
+
+
+class JSONWriter(ResultWriter):
+    """Writes all results as one indented JSON array when closed."""
+
+    def __init__(self, stream: Union[TextIO, Callable[[], TextIO]], close_stream: bool = False):
+        super().__init__(stream, close_stream)
+        self._results: List[Tuple[bool, int, Dict[str, Any]]] = []
+
+    def write(self, result: Dict[str, Any], index: Optional[int] = None) -> None:
+        self._results.append((index is not None, index or 0, result))
+
+    def close(self, failed: bool = False) -> None:
+        # A failed run still saves its partial results, but not an empty array
+        if not failed or self._results:
+            # Results without an index keep their arrival order ahead of the rest
+            self._results.sort(key=lambda item: (item[0], item[1]))
+            json.dump([result for _, _, result in self._results],
+                      self.stream, indent=2, ensure_ascii=False)
+            self.stream.write("\n")
+        super().close(failed)
+
+
+class NDJSONWriter(ResultWriter):
+    """Writes one JSON object per line as soon as each result arrives."""
+
+    def write(self, result: Dict[str, Any], index: Optional[int] = None) -> None:
+        self.stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class CSVWriter(ResultWriter):
+    """Writes one CSV row per result as soon as it arrives."""
+
+    FIELDS = ["image_path", "color", "category", "dress_code", "season", "error"]
+
+    def __init__(
+        self,
+        stream: Union[TextIO, Callable[[], TextIO]],
+        close_stream: bool = False,
+        fields: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            stream: Text stream to write to, or a function opening it on first use
+            close_stream: Whether close() should also close the stream
+            fields: Columns to write, defaults to FIELDS; other keys are dropped
+        """
+        super().__init__(stream, close_stream)
+        self.fields = list(fields or self.FIELDS)
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, result: Dict[str, Any], index: Optional[int] = None) -> None:
+        row = dict(result)
+        if isinstance(row.get("season"), list):
+            row["season"] = ";".join(row["season"])
+        self._csv_writer().writerow(row)
+        self.stream.flush()
+
+    def close(self, failed: bool = False) -> None:
+        if not failed:
+            self._csv_writer()
+        super().close(failed)
+
+    def _csv_writer(self) -> csv.DictWriter:
+        """Return the CSV writer, writing the header row on first use."""
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self.stream, fieldnames=self.fields, extrasaction="ignore")
+            self._writer.writeheader()
+        return self._writer
+
+
+WRITERS = {
+    "json": JSONWriter,
+    "ndjson": NDJSONWriter,
+    "csv": CSVWriter,
+}
+
+
+def create_writer(
+    output_format: str,
+    output_path: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> ResultWriter:
+    """
+    Create a result writer for the given format.
+
+    Args:
+        output_format: One of the keys of WRITERS
+        output_path: Output file path, or None for stdout
+        fields: CSV columns, defaults to CSVWriter.FIELDS; ignored by the
+            JSON formats, which keep every key
+
+    Returns:
+        ResultWriter instance
+    """
+    writer_class = WRITERS.get(output_format)
+    if writer_class is None:
+        raise ValueError(
+            f"Invalid output format: {output_format}. "
+            f"Must be one of: {', '.join(WRITERS.keys())}"
+        )
+
+    options = {"fields": fields} if writer_class is CSVWriter else {}
+    if output_path is None:
+        return writer_class(sys.stdout, **options)
+    newline = "" if writer_class is CSVWriter else None
+    # The file is opened on first write, so a failed run keeps an existing file
+    return writer_class(
+        partial(open, output_path, 'w', encoding='utf-8', newline=newline),
+        close_stream=True, **options)
@@ -0,0 +1,15 @@
+from pathlib import Path
+
+import pytest
+
+from helpers import COLORS, make_image
+
+
+@pytest.fixture
+def image_dir(tmp_path: Path) -> Path:
+    """Directory with one distinct image per colour in COLORS."""
+    directory = tmp_path / "images"
+    directory.mkdir()
+    for index, color in enumerate(COLORS):
+        make_image(directory / f"{index}.jpg", color)
+    return directory
@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Any, Tuple
+
+from PIL import Image
+
+from outfitai.classifier.mock_classifier import MockClassifier
+
+COLORS = ["red", "blue", "green", "yellow", "purple", "orange", "white", "black"]
+
+
+def make_image(path: Path, color: Any = "red", size: Tuple[int, int] = (64, 64)) -> str:
+    """Save a solid-colour image and return its path."""
+    Image.new("RGB", size, color).save(path)
+    return str(path)
+
+
+def mock_classifier(**overrides: Any) -> MockClassifier:
+    """Create a mock classifier answering instantly, without the result cache."""
+    settings = {
+        "OUTFITAI_PROVIDER": "mock",
+        "CACHE_ENABLED": False,
+        "MOCK_LATENCY": 0.0,
+        "MOCK_SEED": 0,
+        "RETRY_BASE_DELAY": 0.0,
+        "LOG_LEVEL": "CRITICAL",
+    }
+    settings.update(overrides)
+    return MockClassifier(settings)
@@ -0,0 +1,31 @@
+import json
+
+from click.testing import CliRunner
+
+from outfitai.cli import cli
+
+
+def test_local_batch_round_trip(image_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTFITAI_PROVIDER", "openai")
+    job_dir = tmp_path / "job"
+    output = tmp_path / "results.ndjson"
+    runner = CliRunner()
+
+    submitted = runner.invoke(cli, ["batch", "submit", str(image_dir), "-j", str(job_dir), "--local"])
+    status = runner.invoke(cli, ["batch", "status", str(job_dir)])
+    collected = runner.invoke(cli, ["batch", "collect", str(job_dir), "-f", "ndjson", "-o", str(output)])
+
+    assert submitted.exit_code == 0, submitted.output
+    assert "with 8 images" in submitted.output
+    assert "Completed: 8, failed: 0" in status.output
+    assert collected.exit_code == 0, collected.output
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(results) == 8
+    assert all("error" not in result and result["color"] for result in results)
+
+
+def test_collect_requires_a_job_file(tmp_path):
+    result = CliRunner().invoke(cli, ["batch", "collect", str(tmp_path)])
+
+    assert result.exit_code != 0
+    assert "Batch collect error" in result.output
@@ -0,0 +1,109 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from outfitai.utils.cache import ResultCache
+
+from helpers import make_image, mock_classifier
+
+RESULT = {"color": "red", "category": "tops", "dress_code": "casual wear", "season": ["summer"]}
+
+
+def test_get_returns_stored_result(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.set("key", RESULT)
+
+    assert cache.get("key") == RESULT
+    assert cache.get("other") is None
+    cache.close()
+
+
+def test_expired_entry_is_a_miss(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, ttl=10)
+    cache.set("key", RESULT)
+
+    now = time.time()
+    monkeypatch.setattr("outfitai.utils.cache.time.time", lambda: now + 11)
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_max_entries_evicts_oldest(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_entries=2)
+    now = time.time()
+    for index in range(3):
+        monkeypatch.setattr("outfitai.utils.cache.time.time", lambda: now + index)
+        cache.set(f"key{index}", RESULT)
+    cache.evict()
+
+    assert cache.get("key0") is None
+    assert cache.get("key2") == RESULT
+    cache.close()
+
+
+def test_key_depends_on_model_and_prompt():
+    key = ResultCache.make_key("digest", "openai", "gpt-4o-mini", "prompt")
+
+    assert key == ResultCache.make_key("digest", "openai", "gpt-4o-mini", "prompt")
+    assert key != ResultCache.make_key("digest", "openai", "gpt-4o", "prompt")
+    assert key != ResultCache.make_key("digest", "openai", "gpt-4o-mini", "other prompt")
+    assert key != ResultCache.make_key("other", "openai", "gpt-4o-mini", "prompt")
+
+
+def test_classifier_serves_repeated_image_from_cache(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+
+    async def run():
+        async with mock_classifier(CACHE_ENABLED=True, CACHE_DIR=str(tmp_path / "cache")) as classifier:
+            first = await classifier.classify_single(image)
+            second = await classifier.classify_single(image)
+            return classifier, first, second
+
+    classifier, first, second = asyncio.run(run())
+
+    assert first == second
+    assert classifier.metrics.counters["requests"] == 1
+    assert classifier.cache.hits == 1
+    assert classifier.cache.misses == 1
+
+
+def test_aclose_closes_cache(tmp_path):
+    async def run():
+        async with mock_classifier(CACHE_ENABLED=True, CACHE_DIR=str(tmp_path)) as classifier:
+            pass
+        return classifier
+
+    classifier = asyncio.run(run())
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        classifier.cache.get("key")
+
+
+def test_invalid_cached_result_counts_as_miss(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+
+    async def run():
+        async with mock_classifier(CACHE_ENABLED=True, CACHE_DIR=str(tmp_path / "cache")) as classifier:
+            await classifier.classify_single(image)
+            # An entry stored under allowed values that have since changed
+            classifier.cache._conn.execute(
+                "UPDATE results SET value = ?", ('{"color": "mauve"}',))
+            result = await classifier.classify_single(image)
+            return classifier, result
+
+    classifier, result = asyncio.run(run())
+
+    assert result["color"] in classifier.color_values
+    assert classifier.cache.hits == 0
+    assert classifier.cache.misses == 2
+    assert classifier.metrics.counters["requests"] == 2
+
+
+def test_key_depends_on_schema():
+    key = ResultCache.make_key("digest", "openai", "model", "prompt", schema="a", structured=True)
+
+    assert key != ResultCache.make_key("digest", "openai", "model", "prompt", schema="b", structured=True)
+    assert key != ResultCache.make_key("digest", "openai", "model", "prompt", schema="a", structured=False)
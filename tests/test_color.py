@@ -0,0 +1,60 @@
+import asyncio
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from outfitai.utils.color import dominant_color, dominant_colors_from_files
+
+from helpers import make_image, mock_classifier
+
+
+def encoded(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("rgb, name", [
+    ((220, 20, 30), "red"), ((20, 40, 200), "blue"), ((20, 160, 40), "green"),
+])
+def test_solid_colours(rgb, name):
+    color, share = dominant_color(encoded(Image.new("RGB", (64, 64), rgb)))
+
+    assert color == name
+    assert share > 0.9
+
+
+def test_background_is_ignored():
+    image = Image.new("RGB", (128, 128), "white")
+    ImageDraw.Draw(image).rectangle([40, 40, 88, 88], fill=(20, 40, 200))
+
+    assert dominant_color(encoded(image))[0] == "blue"
+
+
+def test_unreadable_files_have_no_colour(tmp_path):
+    red = make_image(tmp_path / "red.png", (220, 20, 30))
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+
+    results = dominant_colors_from_files([red, str(broken)])
+
+    assert [(path, name) for path, name, _ in results] == [(red, "red"), (str(broken), None)]
+
+
+@pytest.mark.parametrize("mode", ["verify", "replace"])
+def test_color_check(tmp_path, mode):
+    image = make_image(tmp_path / "red.png", (220, 20, 30))
+
+    async def run():
+        async with mock_classifier(COLOR_CHECK=mode) as classifier:
+            return await classifier.classify_single(image)
+
+    result = asyncio.run(run())
+
+    if mode == "verify":
+        assert result["local_color"] == "red"
+        assert result["local_color_confidence"] > 0.9
+    else:
+        assert result["color"] == "red"
+        assert "local_color" not in result
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from outfitai.classifier.base import BaseClassifier
+from outfitai.error.exceptions import StageTimeoutError
+from outfitai.utils.timeouts import stage_timeout
+
+from helpers import COLORS, mock_classifier
+
+
+async def _collect(classifier, image_paths, **options):
+    return [item async for item in classifier.classify_stream(image_paths, **options)]
+
+
+def test_deadline_cancels_in_flight_and_counts_unstarted(image_dir):
+    async def run():
+        async with mock_classifier(MOCK_LATENCY=0.3, ADAPTIVE_CONCURRENCY=False) as classifier:
+            results = await _collect(classifier, str(image_dir), concurrency=2, deadline=0.1)
+            return classifier, results
+
+    classifier, results = asyncio.run(run())
+    counters = classifier.metrics.counters
+
+    assert counters["cancelled"] == 2
+    assert counters["not_started"] == len(COLORS) - 2
+    assert [result["error"] for _, result in results] == ["Job deadline exceeded"] * 2
+
+
+def test_results_finished_before_deadline_are_kept(image_dir):
+    async def run():
+        async with mock_classifier(MOCK_LATENCY=0.1, ADAPTIVE_CONCURRENCY=False) as classifier:
+            results = await _collect(classifier, str(image_dir), concurrency=2, deadline=0.35)
+            return classifier, results
+
+    classifier, results = asyncio.run(run())
+    counters = classifier.metrics.counters
+    finished = [result for _, result in results if "error" not in result]
+
+    assert finished
+    assert len(results) + counters["not_started"] == len(COLORS)
+
+
+def test_no_deadline_classifies_everything(image_dir):
+    async def run():
+        async with mock_classifier() as classifier:
+            return classifier, await _collect(classifier, str(image_dir), deadline=0)
+
+    classifier, results = asyncio.run(run())
+
+    assert sorted(index for index, _ in results) == list(range(len(COLORS)))
+    assert classifier.metrics.counters["cancelled"] == 0
+
+
+def test_unstarted_count_is_capped():
+    assert BaseClassifier._count_paths(iter(range(10)), 4) == 4
+    assert BaseClassifier._count_paths(iter(range(3)), 4) == 3
+
+
+def test_provider_timeout_is_retried_then_raised(image_dir):
+    async def run():
+        async with mock_classifier(
+                MOCK_LATENCY=0.2, PROVIDER_TIMEOUT=0.01, RETRY_MAX_ATTEMPTS=2) as classifier:
+            with pytest.raises(StageTimeoutError):
+                await classifier.classify_single(str(image_dir / "0.jpg"))
+            return classifier
+
+    classifier = asyncio.run(run())
+
+    assert classifier.metrics.counters["requests"] == 2
+    assert classifier.retry_stats.exhausted == 1
+
+
+def test_stage_timeout_without_limit_waits():
+    async def run():
+        return await stage_timeout(asyncio.sleep(0.01, "done"), 0, "Sleep")
+
+    assert asyncio.run(run()) == "done"
@@ -0,0 +1,93 @@
+import asyncio
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from outfitai.config.settings import Settings
+from outfitai.error.exceptions import ImageProcessingError, UnsupportedImageError
+from outfitai.utils.image_processor import ImageProcessor
+
+from helpers import make_image
+
+
+def processor(**overrides):
+    settings = {"OUTFITAI_PROVIDER": "openai", "OPENAI_API_KEY": "test", "LOG_LEVEL": "CRITICAL"}
+    settings.update(overrides)
+    return ImageProcessor(Settings(**settings))
+
+
+def decode_data_url(data_url):
+    header, payload = data_url.split(",", 1)
+    return header, Image.open(io.BytesIO(base64.b64decode(payload)))
+
+
+async def _process(image_processor, source):
+    try:
+        return await image_processor.process_image(source)
+    finally:
+        await image_processor.aclose()
+
+
+def test_large_image_is_downscaled_and_reencoded(tmp_path):
+    image = make_image(tmp_path / "large.png", "blue", size=(2000, 1000))
+
+    data_url = asyncio.run(_process(processor(), image))
+
+    header, decoded = decode_data_url(data_url)
+    assert header == "data:image/jpeg;base64"
+    assert decoded.size == (512, 256)
+
+
+def test_resize_can_be_disabled(tmp_path):
+    image = make_image(tmp_path / "large.png", "blue", size=(600, 300))
+
+    data_url = asyncio.run(_process(processor(IMAGE_RESIZE=False), image))
+
+    header, decoded = decode_data_url(data_url)
+    assert header == "data:image/png;base64"
+    assert decoded.size == (600, 300)
+
+
+def test_file_is_read_once(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+    image_processor = processor()
+
+    async def run():
+        source = image_processor.resolve_source(image)
+        await image_processor.content_digest(source)
+        await image_processor._validate_source(source)
+        await image_processor._process_for_openai(source)
+        await image_processor.aclose()
+
+    asyncio.run(run())
+
+    assert image_processor.metrics.stages["load"].count == 1
+
+
+def test_truncated_image_is_rejected_without_resizing(tmp_path):
+    image = tmp_path / "truncated.png"
+    make_image(image, "red", size=(256, 256))
+    image.write_bytes(image.read_bytes()[:-200])
+
+    with pytest.raises(ImageProcessingError):
+        asyncio.run(_process(processor(IMAGE_RESIZE=False), str(image)))
+
+
+def test_gif_is_unsupported_by_gemini_only(tmp_path):
+    image = make_image(tmp_path / "shirt.gif")
+
+    assert asyncio.run(_process(processor(), image)).startswith("data:image/jpeg")
+    with pytest.raises(UnsupportedImageError):
+        asyncio.run(_process(
+            processor(OUTFITAI_PROVIDER="gemini", GEMINI_API_KEY="test"), image))
+
+
+def test_unknown_extension_is_rejected_for_every_provider(tmp_path):
+    image = tmp_path / "shirt.bmp"
+    Image.new("RGB", (8, 8)).save(image)
+
+    with pytest.raises(ImageProcessingError) as error:
+        asyncio.run(_process(processor(), str(image)))
+    assert not isinstance(error.value, UnsupportedImageError)
@@ -0,0 +1,82 @@
+import json
+
+from click.testing import CliRunner
+
+from outfitai.cli import cli
+from outfitai.utils.journal import JobJournal
+
+
+def test_load_skips_failed_images(tmp_path):
+    journal = JobJournal(tmp_path / "run.journal").open()
+    journal.record({"image_path": "a.jpg", "color": "red"})
+    journal.record({"image_path": "b.jpg", "error": "Failed to identify image file"})
+    journal.close()
+
+    assert list(journal.load()) == ["a.jpg"]
+
+
+def test_resume_appends_and_restart_truncates(tmp_path):
+    journal = JobJournal(tmp_path / "run.journal").open()
+    journal.record({"image_path": "a.jpg"})
+    journal.close()
+
+    journal.open(resume=True).record({"image_path": "b.jpg"})
+    journal.close()
+    assert list(journal.load()) == ["a.jpg", "b.jpg"]
+
+    journal.open().close()
+    assert journal.load() == {}
+
+
+def test_resume_drops_truncated_last_line(tmp_path):
+    path = tmp_path / "run.journal"
+    path.write_text(json.dumps({"image_path": "a.jpg"}) + '\n{"image_path": "b.j')
+
+    journal = JobJournal(path).open(resume=True)
+    journal.record({"image_path": "c.jpg"})
+    journal.close()
+
+    assert list(journal.load()) == ["a.jpg", "c.jpg"]
+    assert path.read_text().count("\n") == 2
+
+
+def test_resume_without_complete_line_starts_over(tmp_path):
+    path = tmp_path / "run.journal"
+    path.write_text('{"image_path": "a.j')
+
+    journal = JobJournal(path).open(resume=True)
+    journal.record({"image_path": "b.jpg"})
+    journal.close()
+
+    assert list(journal.load()) == ["b.jpg"]
+
+
+def test_resume_skips_completed_images(image_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTFITAI_PROVIDER", "mock")
+    monkeypatch.setenv("MOCK_LATENCY", "0")
+    output = tmp_path / "results.ndjson"
+    journal = tmp_path / "run.journal"
+    first = sorted(str(path) for path in image_dir.iterdir())[:3]
+    with JobJournal(journal).open() as job:
+        for image_path in first:
+            job.record({"image_path": image_path, "color": "red"})
+
+    result = CliRunner().invoke(cli, [
+        "classify", "-b", str(image_dir), "--no-cache", "-f", "ndjson",
+        "-o", str(output), "--journal", str(journal), "--resume"])
+
+    assert result.exit_code == 0, result.output
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(results) == len(list(image_dir.iterdir()))
+    # Journaled results are written as recorded instead of being classified again
+    assert {r["image_path"] for r in results if "category" not in r} == set(first)
+
+
+def test_resume_requires_journal_or_output(image_dir, monkeypatch):
+    monkeypatch.setenv("OUTFITAI_PROVIDER", "mock")
+
+    result = CliRunner().invoke(cli, ["classify", "-b", str(image_dir), "--resume"])
+
+    assert result.exit_code == 2
+    assert "--resume requires --journal or --output" in result.output
+    assert "Unexpected error" not in result.output
@@ -0,0 +1,49 @@
+import asyncio
+
+from outfitai.utils.metrics import Metrics, StageTimer
+
+from helpers import mock_classifier
+
+
+def test_quantile_is_the_upper_bound_of_its_bucket():
+    timer = StageTimer()
+    for seconds in [0.002] * 90 + [0.3] * 10:
+        timer.observe(seconds)
+
+    assert timer.quantile(0.5) == 0.0025
+    assert timer.quantile(0.95) == 0.3
+    assert timer.max == 0.3
+
+
+def test_openmetrics_exposition():
+    metrics = Metrics()
+    metrics.inc("requests", 3)
+    metrics.observe("provider", 0.2)
+
+    text = metrics.to_openmetrics()
+
+    assert "outfitai_requests_total 3" in text
+    assert 'outfitai_stage_duration_seconds_bucket{stage="provider",le="0.25"} 1' in text
+    assert 'outfitai_stage_duration_seconds_count{stage="provider"} 1' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_tokens_per_request():
+    metrics = Metrics()
+    metrics.inc("requests", 2)
+    metrics.record_usage(300, 40)
+    metrics.record_usage(None, 20)
+
+    assert metrics.tokens_per_request() == {"input": 150.0, "output": 30.0}
+
+
+def test_classifier_times_its_stages(image_dir):
+    async def run():
+        async with mock_classifier() as classifier:
+            await classifier.classify_batch(str(image_dir))
+            return classifier.metrics.summary()
+
+    summary = asyncio.run(run())
+
+    assert {"load", "encode", "provider"} <= set(summary["stages"])
+    assert summary["counters"]["images"] == summary["stages"]["provider"]["count"]
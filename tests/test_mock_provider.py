@@ -0,0 +1,58 @@
+import asyncio
+import statistics
+
+import pytest
+
+from outfitai.classifier.mock_classifier import MockServer
+from outfitai.error.exceptions import RateLimitError, TransientAPIError
+
+from helpers import mock_classifier
+
+
+def test_answers_depend_only_on_image_content(image_dir, tmp_path):
+    copy = tmp_path / "copy.jpg"
+    copy.write_bytes((image_dir / "0.jpg").read_bytes())
+
+    async def classify(image_path):
+        async with mock_classifier() as classifier:
+            result = await classifier.classify_single(image_path)
+        return {key: value for key, value in result.items() if key != "image_path"}
+
+    first = asyncio.run(classify(str(image_dir / "0.jpg")))
+
+    assert asyncio.run(classify(str(copy))) == first
+    assert asyncio.run(classify(str(image_dir / "1.jpg"))) != first
+
+
+@pytest.mark.parametrize("distribution", MockServer.DISTRIBUTIONS)
+def test_latency_distributions_keep_the_mean(distribution):
+    server = MockServer(latency=0.1, distribution=distribution, seed=1)
+
+    samples = [server.sample_latency() for _ in range(20_000)]
+
+    assert statistics.mean(samples) == pytest.approx(0.1, rel=0.1)
+
+
+def test_injected_failures():
+    async def respond(server):
+        await server.respond()
+
+    with pytest.raises(RateLimitError) as error:
+        asyncio.run(respond(MockServer(latency=0, rate_limit_rate=1.0, retry_after=2.0)))
+    assert error.value.retry_after == 2.0
+    with pytest.raises(TransientAPIError):
+        asyncio.run(respond(MockServer(latency=0, error_rate=1.0)))
+
+
+def test_same_seed_gives_same_outcomes():
+    def outcomes(seed):
+        server = MockServer(error_rate=0.3, rate_limit_rate=0.2, seed=seed)
+        return [server.sample_outcome() for _ in range(100)]
+
+    assert outcomes(7) == outcomes(7)
+    assert set(outcomes(7)) == {"ok", "error", "rate_limit"}
+
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        MockServer(distribution="pareto")
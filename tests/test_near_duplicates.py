@@ -0,0 +1,73 @@
+import asyncio
+import io
+
+from PIL import Image, ImageDraw
+
+from outfitai.utils.phash import BKTree, hamming, phash
+
+from helpers import mock_classifier
+
+
+def garment(path, color):
+    """Save an image with enough structure for a meaningful perceptual hash."""
+    image = Image.new("RGB", (256, 256), "white")
+    draw = ImageDraw.Draw(image)
+    draw.ellipse([40, 30, 200, 230], fill=color)
+    draw.rectangle([120, 0, 250, 90], fill="gray")
+    image.save(path)
+    return str(path)
+
+
+def test_bk_tree_finds_hashes_within_distance():
+    tree = BKTree()
+    for value in (0b0000, 0b0001, 0b0111, 0b1111):
+        tree.add(value, value)
+
+    assert [value for _, value in tree.search(0b0000, 1)] == [0b0000, 0b0001]
+    assert tree.nearest(0b0110, 1) == 0b0111
+    assert tree.nearest(0b0000, 4, accept=lambda value: value > 1) == 0b0111
+    assert len(tree) == 4
+
+
+def test_phash_survives_resizing(tmp_path):
+    original = garment(tmp_path / "a.png", "black")
+    with Image.open(original) as image:
+        buffer = io.BytesIO()
+        image.resize((128, 128)).save(buffer, format="JPEG", quality=70)
+
+    with open(original, "rb") as f:
+        assert hamming(phash(f.read()), phash(buffer.getvalue())) <= 4
+
+
+def test_resized_copy_reuses_result(tmp_path):
+    original = garment(tmp_path / "a.png", "navy")
+    with Image.open(original) as image:
+        image.resize((200, 200)).save(tmp_path / "b.jpg", quality=80)
+
+    async def run():
+        async with mock_classifier(NEAR_DUPLICATE_ENABLED=True) as classifier:
+            first = await classifier.classify_single(original)
+            second = await classifier.classify_single(str(tmp_path / "b.jpg"))
+            return classifier, first, second
+
+    classifier, first, second = asyncio.run(run())
+
+    assert second == {**first, "image_path": str(tmp_path / "b.jpg")}
+    assert classifier.metrics.counters["near_duplicates"] == 1
+    assert classifier.metrics.counters["requests"] == 1
+
+
+def test_colour_variant_is_classified_separately(tmp_path):
+    red = garment(tmp_path / "red.png", "red")
+    blue = garment(tmp_path / "blue.png", "blue")
+
+    async def run():
+        async with mock_classifier(NEAR_DUPLICATE_ENABLED=True) as classifier:
+            await classifier.classify_single(red)
+            await classifier.classify_single(blue)
+            return classifier
+
+    classifier = asyncio.run(run())
+
+    assert classifier.metrics.counters["near_duplicates"] == 0
+    assert classifier.metrics.counters["requests"] == 2
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from outfitai.utils.packer import RequestPacker
+
+from helpers import COLORS, mock_classifier
+
+
+def test_full_pack_is_sent_at_once():
+    packs = []
+
+    async def send(items):
+        packs.append(items)
+        return [item * 2 for item in items]
+
+    async def run():
+        packer = RequestPacker(send, size=3, linger=10)
+        return await asyncio.gather(*[packer.submit(item) for item in range(3)])
+
+    assert asyncio.run(run()) == [0, 2, 4]
+    assert packs == [[0, 1, 2]]
+
+
+def test_partial_pack_is_sent_after_linger():
+    packs = []
+
+    async def send(items):
+        packs.append(items)
+        return items[:1]
+
+    async def run():
+        packer = RequestPacker(send, size=4, linger=0.01)
+        return await asyncio.gather(packer.submit("a"), packer.submit("b"))
+
+    # Elements missing from the response come back as None
+    assert asyncio.run(run()) == ["a", None]
+    assert packs == [["a", "b"]]
+
+
+def test_lone_item_is_left_to_a_single_request():
+    async def send(items):
+        raise AssertionError("a single item is not packed")
+
+    async def run():
+        return await RequestPacker(send, size=4, linger=0.01).submit("a")
+
+    assert asyncio.run(run()) is None
+
+
+def test_failed_pack_raises_for_every_item():
+    async def send(items):
+        raise ValueError("boom")
+
+    async def run():
+        packer = RequestPacker(send, size=2, linger=10)
+        return await asyncio.gather(
+            packer.submit("a"), packer.submit("b"), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(run()))
+
+
+def test_classifier_packs_concurrent_images(image_dir):
+    async def run():
+        async with mock_classifier(PACK_SIZE=4, PACK_LINGER=0.05, BATCH_SIZE=8) as classifier:
+            results = await classifier.classify_batch(str(image_dir))
+            return classifier, results
+
+    classifier, results = asyncio.run(run())
+
+    assert len(results) == len(COLORS)
+    assert not any("error" in result for result in results)
+    assert classifier.metrics.counters["requests"] == 2
+
+
+def test_bad_image_fails_alone_within_a_pack(image_dir):
+    (image_dir / "broken.jpg").write_bytes(b"not an image")
+
+    async def run():
+        async with mock_classifier(PACK_SIZE=3, PACK_LINGER=0.05, BATCH_SIZE=3) as classifier:
+            results = await classifier.classify_batch([
+                str(image_dir / "0.jpg"), str(image_dir / "broken.jpg"), str(image_dir / "1.jpg")
+            ])
+            return classifier, results
+
+    classifier, results = asyncio.run(run())
+
+    assert "error" not in results[0] and "error" not in results[2]
+    assert "error" in results[1]
+    # The two good images still went out together
+    assert classifier.metrics.counters["requests"] == 1
+
+
+@pytest.mark.parametrize("size", [1, 4])
+def test_packed_and_single_answers_match(image_dir, size):
+    async def run():
+        async with mock_classifier(PACK_SIZE=size, BATCH_SIZE=8) as classifier:
+            return await classifier.classify_batch(str(image_dir))
+
+    results = asyncio.run(run())
+
+    single = asyncio.run(_classify_one_by_one(image_dir))
+    assert sorted(results, key=lambda result: result["image_path"]) == single
+
+
+async def _classify_one_by_one(image_dir):
+    async with mock_classifier() as classifier:
+        return [
+            await classifier.classify_single(str(path))
+            for path in sorted(image_dir.iterdir(), key=str)
+        ]
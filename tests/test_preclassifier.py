@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import numpy as np
+
+from outfitai.utils.preclassifier import PreclassifierIndex, build_index
+
+from helpers import make_image, mock_classifier
+
+SHIRT = {"color": "red", "category": "tops", "dress_code": "casual wear", "season": ["summer"]}
+COAT = {"color": "black", "category": "outerwear", "dress_code": "business attire",
+        "season": ["fall", "winter"]}
+
+
+def test_nearest_neighbours_vote():
+    index = PreclassifierIndex()
+    for _ in range(3):
+        index.add(np.array([0.0, 0.0], dtype=np.float32), SHIRT)
+    index.add(np.array([1.0, 1.0], dtype=np.float32), COAT)
+
+    result, confidence = index.predict(np.array([0.05, 0.0], dtype=np.float32), neighbors=3)
+    assert result == SHIRT
+    assert confidence == 1.0
+
+    result, confidence = index.predict(np.array([5.0, 5.0], dtype=np.float32))
+    assert result is None and confidence == 0.0
+
+
+def test_index_round_trips_through_a_file(tmp_path):
+    index = PreclassifierIndex()
+    index.add(np.array([0.0, 1.0], dtype=np.float32), SHIRT)
+    index.save(tmp_path / "index.npz")
+
+    loaded = PreclassifierIndex.load(tmp_path / "index.npz")
+
+    assert len(loaded) == 1
+    assert loaded.predict(np.array([0.0, 1.0], dtype=np.float32))[0] == SHIRT
+
+
+def test_confident_image_skips_the_provider(tmp_path):
+    labelled = [make_image(tmp_path / f"red{i}.png", (200 + i, 0, 0)) for i in range(3)]
+    results = tmp_path / "results.ndjson"
+    results.write_text("".join(
+        json.dumps({"image_path": path, **SHIRT}) + "\n" for path in labelled))
+    index, skipped = build_index([results])
+    index.save(tmp_path / "index.npz")
+    new_image = make_image(tmp_path / "new.png", (210, 0, 0))
+
+    async def run():
+        async with mock_classifier(PRECLASSIFY_INDEX=str(tmp_path / "index.npz")) as classifier:
+            return classifier, await classifier.classify_single(new_image)
+
+    classifier, result = asyncio.run(run())
+
+    assert skipped == 0
+    assert result == {"image_path": new_image, **SHIRT}
+    assert classifier.metrics.counters["preclassified"] == 1
+    assert classifier.metrics.counters["requests"] == 0
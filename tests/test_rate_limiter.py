@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from outfitai.error.exceptions import ImageProcessingError, RateLimitError
+from outfitai.utils.rate_limiter import (
+    AdaptiveConcurrency, RateLimiter, TokenBucket, parse_duration, parse_retry_after
+)
+
+from helpers import make_image, mock_classifier
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1.5", 1.5), ("soon", None),
+])
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == expected
+
+
+def test_parse_retry_after_prefers_milliseconds():
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({}) is None
+
+
+def test_token_bucket_waits_once_empty():
+    bucket = TokenBucket(per_minute=60, burst_seconds=2)
+
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_exhausted_headers_pause_requests():
+    limiter = RateLimiter()
+
+    assert limiter.update_from_headers({
+        "x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+    assert not limiter.update_from_headers({"x-ratelimit-remaining-requests": "5"})
+    assert limiter._paused_until > 0
+
+
+def test_concurrency_backs_off_once_per_cooldown():
+    concurrency = AdaptiveConcurrency(initial=8, maximum=16, cooldown=60)
+
+    concurrency.on_throttle()
+    concurrency.on_throttle()
+    assert concurrency.value == 4
+
+    for _ in range(8):
+        concurrency.on_success()
+    assert concurrency.value == 5
+
+
+def test_disabled_concurrency_stays_fixed():
+    concurrency = AdaptiveConcurrency(initial=8, enabled=False)
+
+    concurrency.on_throttle()
+    assert concurrency.value == 8
+
+
+def test_throttled_requests_lower_concurrency(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+
+    async def run():
+        async with mock_classifier(
+                MOCK_RATE_LIMIT_RATE=1.0, MOCK_RETRY_AFTER=0.0, RETRY_MAX_ATTEMPTS=2) as classifier:
+            with pytest.raises(RateLimitError):
+                await classifier.classify_single(image)
+            return classifier
+
+    classifier = asyncio.run(run())
+
+    assert classifier.concurrency.value < classifier.settings.BATCH_SIZE
+    assert classifier.metrics.counters["requests"] == 2
+    assert classifier.metrics.counters["retries"] == 1
+
+
+def test_invalid_image_takes_no_request_or_tokens(tmp_path):
+    image = tmp_path / "broken.jpg"
+    image.write_bytes(b"not an image")
+
+    async def run():
+        async with mock_classifier() as classifier:
+            classifier.rate_limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=60_000)
+            with pytest.raises(ImageProcessingError):
+                await classifier.classify_single(str(image))
+            return classifier
+
+    classifier = asyncio.run(run())
+
+    assert classifier.metrics.counters["requests"] == 0
+    assert classifier.rate_limiter.requests.tokens == classifier.rate_limiter.requests.capacity
+    assert classifier.rate_limiter.tokens.tokens == classifier.rate_limiter.tokens.capacity
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from outfitai.error.exceptions import APIError, TransientAPIError, ValidationError
+from outfitai.utils.retry import RetryPolicy
+
+from helpers import mock_classifier
+
+
+def test_backoff_is_capped_with_full_jitter():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+
+    for attempt in range(1, 8):
+        assert 0 <= policy.backoff(attempt) <= min(4.0, 2 ** (attempt - 1))
+
+
+def call_sequence(*outcomes):
+    """Provider call failing with the given exceptions, then succeeding."""
+    remaining = list(outcomes)
+
+    async def call():
+        if remaining:
+            raise remaining.pop(0)
+        return "ok"
+    return call
+
+
+def test_transient_errors_are_retried():
+    classifier = mock_classifier()
+
+    result = asyncio.run(classifier._call_with_retry(
+        call_sequence(TransientAPIError("503"), TransientAPIError("503")), "image"))
+
+    assert result == "ok"
+    assert classifier.retry_stats.retries == 2
+    assert classifier.retry_stats.recovered == 1
+
+
+def test_gives_up_after_max_attempts():
+    classifier = mock_classifier(RETRY_MAX_ATTEMPTS=2)
+
+    with pytest.raises(TransientAPIError):
+        asyncio.run(classifier._call_with_retry(
+            call_sequence(*[TransientAPIError("503")] * 3), "image"))
+
+    assert classifier.retry_stats.exhausted == 1
+
+
+def test_invalid_responses_are_re_asked_a_limited_number_of_times():
+    classifier = mock_classifier(RETRY_VALIDATION_ATTEMPTS=1)
+
+    assert asyncio.run(classifier._call_with_retry(
+        call_sequence(ValidationError("bad")), "image")) == "ok"
+    with pytest.raises(ValidationError):
+        asyncio.run(classifier._call_with_retry(
+            call_sequence(ValidationError("bad"), ValidationError("bad")), "image"))
+
+
+def test_other_errors_are_not_retried():
+    classifier = mock_classifier()
+
+    with pytest.raises(APIError):
+        asyncio.run(classifier._call_with_retry(
+            call_sequence(APIError("invalid api key")), "image"))
+
+    assert classifier.retry_stats.retries == 0
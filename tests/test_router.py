@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from outfitai.classifier.router_classifier import ProviderStats, RouterClassifier
+from outfitai.error.exceptions import ImageProcessingError
+
+from helpers import make_image, mock_classifier
+
+
+def router(**providers):
+    """Create a router over the given mock providers, in order of preference."""
+    classifier = RouterClassifier({
+        "OUTFITAI_PROVIDER": "router",
+        "ROUTER_PROVIDERS": "mock",
+        "CACHE_ENABLED": False,
+        "ROUTER_HEDGE_MIN_DELAY": 0.01,
+        "LOG_LEVEL": "CRITICAL",
+    })
+    classifier.providers = providers
+    classifier.stats = {name: ProviderStats() for name in providers}
+    for provider in providers.values():
+        provider.metrics = classifier.metrics
+        provider.image_processor.metrics = classifier.metrics
+        provider.retry_stats = classifier.retry_stats
+    return classifier
+
+
+def openai_like(**overrides):
+    """Mock provider processing images like OpenAI, which accepts GIFs."""
+    return mock_classifier(OUTFITAI_PROVIDER="openai", OPENAI_API_KEY="test", **overrides)
+
+
+def test_fails_over_to_next_provider(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+    classifier = router(
+        broken=mock_classifier(MOCK_ERROR_RATE=1.0, RETRY_MAX_ATTEMPTS=1),
+        healthy=mock_classifier())
+
+    result = asyncio.run(classifier.classify_single(image))
+
+    assert "error" not in result
+    assert classifier.metrics.counters["failovers"] == 1
+    assert classifier.stats["broken"].failures == 1
+    assert classifier.stats["healthy"].requests == 1
+
+
+def test_unsupported_format_fails_over(tmp_path):
+    image = make_image(tmp_path / "shirt.gif")
+    classifier = router(gemini_like=mock_classifier(), openai=openai_like())
+
+    result = asyncio.run(classifier.classify_single(image))
+
+    assert result["image_path"] == image
+    assert classifier.metrics.counters["failovers"] == 1
+    # Rejecting a format is not counted against the provider
+    assert classifier.stats["gemini_like"].requests == 0
+
+
+def test_unreadable_image_fails_without_failover(tmp_path):
+    image = tmp_path / "broken.jpg"
+    image.write_bytes(b"not an image")
+    classifier = router(first=mock_classifier(), second=mock_classifier())
+
+    with pytest.raises(ImageProcessingError):
+        asyncio.run(classifier.classify_single(str(image)))
+
+    assert classifier.metrics.counters["failovers"] == 0
+    assert classifier.metrics.counters["requests"] == 0
+
+
+def test_slow_provider_is_hedged(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+    classifier = router(slow=mock_classifier(MOCK_LATENCY=0.5), fast=mock_classifier())
+    for _ in range(10):
+        classifier.stats["slow"].observe_latency(0.01)
+    classifier.stats["fast"].observe_latency(1.0)
+
+    asyncio.run(classifier.classify_single(image))
+
+    assert classifier.metrics.counters["hedged"] == 1
+    assert classifier.stats["fast"].requests == 1
+    # The cancelled primary records a lower bound of its latency
+    assert classifier.stats["slow"].latency > 0.01
+
+
+def test_cancelled_hedge_records_no_latency(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+    classifier = router(primary=mock_classifier(MOCK_LATENCY=0.1),
+                        hedge=mock_classifier(MOCK_LATENCY=1.0))
+    for _ in range(10):
+        classifier.stats["primary"].observe_latency(0.01)
+    classifier.stats["hedge"].observe_latency(5.0)
+
+    asyncio.run(classifier.classify_single(image))
+
+    assert classifier.metrics.counters["hedged"] == 1
+    assert classifier.stats["primary"].requests == 1
+    assert classifier.stats["hedge"].latency == 5.0
+
+
+def test_concurrency_and_retries_follow_providers(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+    classifier = router(flaky=mock_classifier(MOCK_ERROR_RATE=1.0, RETRY_MAX_ATTEMPTS=2),
+                        healthy=mock_classifier(BATCH_SIZE=3))
+    classifier.providers["flaky"].concurrency.limit = 7
+
+    assert classifier.concurrency.value == 7
+    asyncio.run(classifier.classify_single(image))
+
+    # The failures move the preference, and the window, to the healthy provider
+    assert classifier.concurrency.value == 3
+    assert classifier.retry_stats.retries == 1
+    assert classifier.retry_stats.exhausted == 1
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from outfitai.utils.scanner import iter_image_files, parse_size
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for relative_path, size in [
+        ("a.jpg", 10), ("b.PNG", 2000), ("notes.txt", 10),
+        ("sub/c.webp", 10), ("sub/skip.jpg", 10), ("sub/deep/d.gif", 10),
+    ]:
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    return tmp_path
+
+
+def scan(tree, **options):
+    return sorted(
+        Path(path).relative_to(tree).as_posix() for path in iter_image_files(tree, **options))
+
+
+def test_top_level_only_by_default(tree):
+    assert scan(tree) == ["a.jpg", "b.PNG"]
+
+
+def test_recursive(tree):
+    assert scan(tree, recursive=True) == [
+        "a.jpg", "b.PNG", "sub/c.webp", "sub/deep/d.gif", "sub/skip.jpg"]
+
+
+def test_include_and_exclude(tree):
+    assert scan(tree, recursive=True, include=["*.jpg", "*.gif"], exclude=["skip.*"]) == [
+        "a.jpg", "sub/deep/d.gif"]
+    # Excluding a directory skips everything below it
+    assert scan(tree, recursive=True, exclude=["sub/deep"]) == [
+        "a.jpg", "b.PNG", "sub/c.webp", "sub/skip.jpg"]
+
+
+def test_size_limits(tree):
+    assert scan(tree, min_size=100) == ["b.PNG"]
+    assert scan(tree, max_size=100) == ["a.jpg"]
+
+
+def test_paths_are_yielded_lazily(tree):
+    paths = iter_image_files(tree, recursive=True)
+
+    assert next(paths).startswith(str(tree))
+
+
+def test_missing_directory_raises(tmp_path):
+    with pytest.raises(OSError):
+        list(iter_image_files(tmp_path / "missing"))
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("500", 500), ("2KB", 2048), ("1.5M", 1536 * 1024), ("1gb", 1024 ** 3), (7, 7),
+])
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+def test_parse_size_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_size("lots")
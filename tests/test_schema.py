@@ -0,0 +1,54 @@
+import pytest
+
+from outfitai.classifier.base import BaseClassifier
+from outfitai.classifier.schema import compact_prompt, gemini_response_schema
+from outfitai.error.exceptions import ValidationError
+
+from helpers import mock_classifier
+
+
+def test_schema_limits_fields_to_allowed_values():
+    schema = mock_classifier().response_schema()
+
+    assert schema["required"] == ["color", "category", "dress_code", "season"]
+    assert schema["additionalProperties"] is False
+    assert "red" in schema["properties"]["color"]["enum"]
+    assert schema["properties"]["season"]["type"] == "array"
+
+
+def test_gemini_schema_conversion():
+    schema = gemini_response_schema(mock_classifier().response_schema(packed=True))
+
+    assert schema["type"] == "OBJECT"
+    assert "additionalProperties" not in schema
+    item = schema["properties"]["results"]["items"]
+    assert item["property_ordering"][0] == "index"
+    assert item["properties"]["season"]["items"]["type"] == "STRING"
+
+
+def test_prompt_lists_values_only_without_structured_output():
+    fields = mock_classifier()._result_fields()
+
+    assert "red" not in compact_prompt(fields, structured=True)
+    assert "red" in compact_prompt(fields, structured=False)
+    assert not mock_classifier().structured_output
+
+
+def test_packed_response_elements_follow_the_index():
+    data = {"results": [{"index": 1, "color": "red"}, {"index": 0, "color": "blue"}, {"index": 9}]}
+
+    assert BaseClassifier._parse_packed_response(data, 3) == [
+        {"color": "blue"}, {"color": "red"}, None]
+    with pytest.raises(ValidationError):
+        BaseClassifier._parse_packed_response({"result": []}, 3)
+
+
+def test_response_values_are_validated():
+    classifier = mock_classifier()
+    valid = {"color": "red", "category": "tops", "dress_code": "casual wear", "season": ["fall"]}
+
+    classifier._validate_response(valid)
+    with pytest.raises(ValidationError):
+        classifier._validate_response({**valid, "season": "fall"})
+    with pytest.raises(ValidationError):
+        classifier._validate_response({**valid, "category": "socks"})
@@ -0,0 +1,86 @@
+import asyncio
+import shutil
+
+import pytest
+
+from outfitai.utils.singleflight import SingleFlight
+
+from helpers import make_image, mock_classifier
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(3)])
+        return flight, results
+
+    flight, results = asyncio.run(run())
+
+    assert calls == 1
+    assert results == [("result", False), ("result", True), ("result", True)]
+    assert len(flight) == 0
+
+
+def test_error_is_raised_for_every_caller():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_call_survives_until_last_waiter_is_cancelled():
+    started = 0
+
+    async def work():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    assert asyncio.run(run()) == ("result", True)
+    assert started == 1
+
+
+def test_duplicate_images_share_one_request(tmp_path):
+    image = make_image(tmp_path / "shirt.jpg")
+    copy = str(tmp_path / "copy.jpg")
+    shutil.copy(image, copy)
+
+    async def run():
+        async with mock_classifier(MOCK_LATENCY=0.05) as classifier:
+            results = await classifier.classify_batch([image, copy])
+            return classifier, results
+
+    classifier, results = asyncio.run(run())
+
+    assert [result["image_path"] for result in results] == [image, copy]
+    assert results[0]["color"] == results[1]["color"]
+    assert classifier.metrics.counters["requests"] == 1
+    assert classifier.metrics.counters["coalesced"] == 1
@@ -0,0 +1,64 @@
+import asyncio
+
+from helpers import COLORS, mock_classifier
+
+
+def test_window_limits_images_in_flight(image_dir):
+    async def run():
+        async with mock_classifier(MOCK_LATENCY=0.02) as classifier:
+            in_flight = peak = 0
+            classify_single = classifier.classify_single
+
+            async def tracked(image_path):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    return await classify_single(image_path)
+                finally:
+                    in_flight -= 1
+
+            classifier.classify_single = tracked
+            results = [item async for item in classifier.classify_stream(str(image_dir), 3)]
+            return results, peak
+
+    results, peak = asyncio.run(run())
+
+    assert peak == 3
+    assert sorted(index for index, _ in results) == list(range(len(COLORS)))
+
+
+def test_batch_keeps_input_order_and_reports_failures(image_dir):
+    paths = [str(image_dir / "1.jpg"), str(image_dir / "missing.jpg"), str(image_dir / "0.jpg")]
+
+    async def run():
+        async with mock_classifier(MOCK_LATENCY=0.01) as classifier:
+            return await classifier.classify_batch(paths)
+
+    results = asyncio.run(run())
+
+    assert [result["image_path"] for result in results] == paths
+    assert "error" in results[1]
+    assert "error" not in results[0] and "error" not in results[2]
+
+
+def test_generator_input_is_consumed_lazily(image_dir):
+    consumed = []
+
+    def paths():
+        for path in sorted(image_dir.iterdir()):
+            consumed.append(path)
+            yield str(path)
+
+    async def run():
+        async with mock_classifier(MOCK_LATENCY=0.01) as classifier:
+            stream = classifier.classify_stream(paths(), 2)
+            first = await stream.__anext__()
+            seen = len(consumed)
+            await stream.aclose()
+            return first, seen
+
+    first, seen = asyncio.run(run())
+
+    assert "error" not in first[1]
+    assert seen < len(COLORS)
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+from click.testing import CliRunner
+
+from outfitai.cli import cli
+from outfitai.utils.writers import CSVWriter, create_writer
+
+from helpers import make_image
+
+RESULT = {
+    "image_path": "a.jpg", "color": "red", "category": "tops",
+    "dress_code": "casual wear", "season": ["spring", "summer"],
+    "local_color": "red", "local_color_confidence": 0.9,
+}
+
+
+def test_csv_writes_default_columns():
+    stream = io.StringIO()
+    with CSVWriter(stream) as writer:
+        writer.write(RESULT)
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert list(rows[0]) == CSVWriter.FIELDS
+    assert rows[0]["season"] == "spring;summer"
+
+
+def test_csv_writes_given_columns():
+    stream = io.StringIO()
+    fields = CSVWriter.FIELDS + ["local_color", "local_color_confidence"]
+    with CSVWriter(stream, fields=fields) as writer:
+        writer.write(RESULT)
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert rows[0]["local_color_confidence"] == "0.9"
+
+
+def test_failed_run_keeps_existing_output(tmp_path):
+    output = tmp_path / "results.json"
+    output.write_text("previous")
+
+    try:
+        with create_writer("json", str(output)):
+            raise RuntimeError("failed before any result")
+    except RuntimeError:
+        pass
+
+    assert output.read_text() == "previous"
+
+
+def test_json_results_keep_input_order(tmp_path):
+    output = tmp_path / "results.json"
+    with create_writer("json", str(output)) as writer:
+        writer.write({"image_path": "b.jpg"}, index=1)
+        writer.write({"image_path": "a.jpg"}, index=0)
+
+    assert [result["image_path"] for result in json.loads(output.read_text())] == ["a.jpg", "b.jpg"]
+
+
+def test_color_command_writes_confidence_to_csv(tmp_path):
+    make_image(tmp_path / "red.png", "red")
+    output = tmp_path / "colors.csv"
+
+    result = CliRunner().invoke(cli, ["color", str(tmp_path), "-f", "csv", "-o", str(output)])
+
+    assert result.exit_code == 0, result.output
+    rows = list(csv.DictReader(output.open()))
+    assert rows[0]["color"] == "red"
+    assert float(rows[0]["confidence"]) > 0.5
+
+
+def test_ndjson_writes_each_result_as_it_arrives(tmp_path):
+    output = tmp_path / "results.ndjson"
+    with create_writer("ndjson", str(output)) as writer:
+        writer.write({"image_path": "a.jpg", "color": "red"})
+        assert json.loads(output.read_text()) == {"image_path": "a.jpg", "color": "red"}
+        writer.write({"image_path": "b.jpg", "error": "Failed"})
+
+    assert len(output.read_text().splitlines()) == 2